@@ -5,7 +5,8 @@ import pandas as pd
 from sqlmodel import Session, select
 
 from ..db.base import get_session
-from ..db.models import Result, File
+from ..db.models import File, FILE_STATUS_DELETED
+from ..services.frame_loader import load_frame
 
 router = APIRouter()
 
@@ -20,32 +21,13 @@ async def analyze_coorde(file_id: str, top_n: int = 50, session: Session = Depen
     """
     try:
         # Vérifier que le fichier existe
-        file_stmt = select(File).where(File.file_id == file_id)
+        file_stmt = select(File).where(File.file_id == file_id, File.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         if not file_record:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Charger les données avec SQLModel
-        results_stmt = (
-            select(Result)
-            .where(Result.file_id == file_id)
-            .order_by(Result.numorden, Result.date)
-        )
-        results = session.exec(results_stmt).all()
-        
-        if not results:
-            raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
-        
-        # Convertir en DataFrame
-        data_list = []
-        for result in results:
-            data_list.append({
-                "numorden": result.numorden,
-                "nombre": result.nombre,
-                "nombre2": result.nombre2,
-                "date": result.date.isoformat() if result.date else None
-            })
-        df = pd.DataFrame(data_list)
+        # Charger les colonnes analysées (requête DuckDB projetée)
+        df = load_frame(session, file_id, ['numorden', 'nombre', 'nombre2', 'date'], order_by=['numorden', 'date'])
         
         if len(df) == 0:
             raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
@@ -78,27 +60,13 @@ async def get_coorde_matrix(file_id: str, tests: str = None, session: Session =
     """
     try:
         # Vérifier que le fichier existe
-        file_stmt = select(File).where(File.file_id == file_id)
+        file_stmt = select(File).where(File.file_id == file_id, File.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         if not file_record:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Charger les données avec SQLModel
-        results_stmt = select(Result).where(Result.file_id == file_id)
-        results = session.exec(results_stmt).all()
-        
-        if not results:
-            raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
-        
-        # Convertir en DataFrame
-        data_list = []
-        for result in results:
-            data_list.append({
-                "numorden": result.numorden,
-                "nombre": result.nombre,
-                "date": result.date.isoformat() if result.date else None
-            })
-        df = pd.DataFrame(data_list)
+        # Charger les colonnes analysées (requête DuckDB projetée)
+        df = load_frame(session, file_id, ['numorden', 'nombre', 'date'])
         
         if len(df) == 0:
             raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
@@ -128,32 +96,16 @@ async def get_coorde_by_service(file_id: str, service_name: str, session: Sessio
     """
     try:
         # Vérifier que le fichier existe
-        file_stmt = select(File).where(File.file_id == file_id)
+        file_stmt = select(File).where(File.file_id == file_id, File.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         if not file_record:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Charger les données avec SQLModel
-        results_stmt = (
-            select(Result)
-            .where(Result.file_id == file_id)
-            .where(Result.nombre2 == service_name)
-            .order_by(Result.numorden, Result.date)
+        # Charger les résultats du service (requête DuckDB projetée)
+        df = load_frame(
+            session, file_id, ['numorden', 'nombre', 'date'],
+            equals={"nombre2": service_name}, order_by=['numorden', 'date']
         )
-        results = session.exec(results_stmt).all()
-        
-        if not results:
-            raise HTTPException(status_code=404, detail="Service non trouvé")
-        
-        # Convertir en DataFrame
-        data_list = []
-        for result in results:
-            data_list.append({
-                "numorden": result.numorden,
-                "nombre": result.nombre,
-                "date": result.date.isoformat() if result.date else None
-            })
-        df = pd.DataFrame(data_list)
         
         if len(df) == 0:
             raise HTTPException(status_code=404, detail="Service non trouvé")
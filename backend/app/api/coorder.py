@@ -1,11 +1,14 @@
 # backend/app/api/coorder.py
 from fastapi import APIRouter, HTTPException, Depends
 from typing import Dict, Any, Optional
+import numpy as np
 import pandas as pd
-from sqlmodel import Session, select, and_
+from sqlmodel import Session, select
 
 from ..db.base import get_session
-from ..db.models import Result, File
+from ..db.models import File, FILE_STATUS_DELETED
+from ..services.dimensions import load_coded_frame, category_codes
+from ..services.frame_loader import load_frame
 
 router = APIRouter()
 
@@ -20,32 +23,13 @@ async def analyze_coorder(file_id: str, top_n: int = 50, session: Session = Depe
     """
     try:
         # Vérifier que le fichier existe
-        file_stmt = select(File).where(File.file_id == file_id)
+        file_stmt = select(File).where(File.file_id == file_id, File.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         if not file_record:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Charger les données avec SQLModel
-        results_stmt = (
-            select(Result)
-            .where(Result.file_id == file_id)
-            .order_by(Result.numorden, Result.date)
-        )
-        results = session.exec(results_stmt).all()
-        
-        if not results:
-            raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
-        
-        # Convertir en DataFrame
-        data_list = []
-        for result in results:
-            data_list.append({
-                "numorden": result.numorden,
-                "nombre": result.nombre,
-                "nombre2": result.nombre2,
-                "date": result.date.isoformat() if result.date else None
-            })
-        df = pd.DataFrame(data_list)
+        # Charger les colonnes codées par entiers depuis fact_results
+        df = load_coded_frame(session, file_id, ['numorden', 'nombre', 'nombre2', 'date'])
         
         if len(df) == 0:
             raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
@@ -86,89 +70,20 @@ async def get_coorder_matrix(
         import json
         
         # Vérifier que le fichier existe
-        file_stmt = select(File).where(File.file_id == file_id)
+        file_stmt = select(File).where(File.file_id == file_id, File.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         if not file_record:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Construire la requête de base
-        results_stmt = select(Result).where(Result.file_id == file_id)
-        
-        # Appliquer les filtres si fournis
+        # Filtres manuels appliqués dans la requête DuckDB
+        filter_list = []
         if filters:
             try:
                 filter_list = json.loads(filters)
-                filter_conditions = []
-                
-                for filter_cond in filter_list:
-                    if not filter_cond.get('value'):
-                        continue
-                    
-                    column_name = filter_cond['column']
-                    operator = filter_cond['operator']
-                    value = filter_cond['value']
-                    
-                    column_attr = getattr(Result, column_name, None)
-                    if column_attr is None:
-                        continue
-                    
-                    # Construire la condition selon l'opérateur (même logique que subset_manual)
-                    if operator == 'LIKE':
-                        filter_conditions.append(column_attr.like(f"%{value}%"))
-                    elif operator == 'IN':
-                        values_list = [v.strip() for v in value.split(',')]
-                        filter_conditions.append(column_attr.in_(values_list))
-                    elif operator == '=':
-                        if column_name == 'edad':
-                            filter_conditions.append(column_attr == int(value))
-                        else:
-                            filter_conditions.append(column_attr == value)
-                    elif operator == '!=':
-                        if column_name == 'edad':
-                            filter_conditions.append(column_attr != int(value))
-                        else:
-                            filter_conditions.append(column_attr != value)
-                    elif operator == '>':
-                        if column_name == 'edad':
-                            filter_conditions.append(column_attr > int(value))
-                        else:
-                            filter_conditions.append(column_attr > value)
-                    elif operator == '<':
-                        if column_name == 'edad':
-                            filter_conditions.append(column_attr < int(value))
-                        else:
-                            filter_conditions.append(column_attr < value)
-                    elif operator == '>=':
-                        if column_name == 'edad':
-                            filter_conditions.append(column_attr >= int(value))
-                        else:
-                            filter_conditions.append(column_attr >= value)
-                    elif operator == '<=':
-                        if column_name == 'edad':
-                            filter_conditions.append(column_attr <= int(value))
-                        else:
-                            filter_conditions.append(column_attr <= value)
-                
-                if filter_conditions:
-                    results_stmt = results_stmt.where(and_(*filter_conditions))
             except json.JSONDecodeError:
                 raise HTTPException(status_code=400, detail="Format de filtres invalide (JSON attendu)")
         
-        # Exécuter la requête
-        results = session.exec(results_stmt).all()
-        
-        if not results:
-            raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
-        
-        # Convertir en DataFrame
-        data_list = []
-        for result in results:
-            data_list.append({
-                "numorden": result.numorden,
-                "nombre": result.nombre,
-                "date": result.date.isoformat() if result.date else None
-            })
-        df = pd.DataFrame(data_list)
+        df = load_frame(session, file_id, ['numorden', 'nombre', 'date'], filters=filter_list)
         
         if len(df) == 0:
             raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
@@ -198,32 +113,13 @@ async def get_coorder_by_service(file_id: str, service_name: str, session: Sessi
     """
     try:
         # Vérifier que le fichier existe
-        file_stmt = select(File).where(File.file_id == file_id)
+        file_stmt = select(File).where(File.file_id == file_id, File.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         if not file_record:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Charger les données avec SQLModel
-        results_stmt = (
-            select(Result)
-            .where(Result.file_id == file_id)
-            .where(Result.nombre2 == service_name)
-            .order_by(Result.numorden, Result.date)
-        )
-        results = session.exec(results_stmt).all()
-        
-        if not results:
-            raise HTTPException(status_code=404, detail="Service non trouvé")
-        
-        # Convertir en DataFrame
-        data_list = []
-        for result in results:
-            data_list.append({
-                "numorden": result.numorden,
-                "nombre": result.nombre,
-                "date": result.date.isoformat() if result.date else None
-            })
-        df = pd.DataFrame(data_list)
+        # Charger les colonnes codées par entiers depuis fact_results
+        df = load_coded_frame(session, file_id, ['numorden', 'nombre', 'date'], equals={"nombre2": service_name})
         
         if len(df) == 0:
             raise HTTPException(status_code=404, detail="Service non trouvé")
@@ -246,32 +142,40 @@ async def get_coorder_by_service(file_id: str, service_name: str, session: Sessi
 def _compute_test_pairs(df: pd.DataFrame, top_n: int = 50):
     """
     Calculer les paires de tests co-ordonnés le même jour
+    (paires des tests triés de chaque patient-jour, comptées sur les codes entiers)
     """
-    from itertools import combinations
-    from collections import Counter
+    if len(df) == 0:
+        return []
     
-    # Grouper par patient et date
-    grouped = df.groupby(['numorden', 'date'])['nombre'].apply(list)
+    # Grouper par patient et date, tests triés dans chaque groupe
+    group_ids = df.groupby(['numorden', 'date'], observed=True).ngroup().to_numpy()
+    codes, labels = category_codes(df['nombre'])
+    order = np.lexsort((codes, group_ids))
+    tests = pd.DataFrame({'group': group_ids[order], 'position': np.arange(len(order)), 'test': codes[order]})
     
-    # Compter les paires
-    pair_counter = Counter()
+    # Seuls les jours avec plusieurs tests forment des paires
+    tests = tests[np.bincount(tests['group'])[tests['group']] > 1]
     
-    for tests in grouped:
-        if len(tests) > 1:
-            # Générer toutes les paires de tests pour ce jour
-            for pair in combinations(sorted(tests), 2):
-                pair_counter[pair] += 1
+    # Toutes les paires (i < j) de chaque groupe, dans l'ordre de combinations()
+    pairs = tests.merge(tests, on='group', suffixes=('_1', '_2'))
+    pairs = pairs[pairs['position_1'] < pairs['position_2']].sort_values(['position_1', 'position_2'])
+    if len(pairs) == 0:
+        return []
     
-    # Obtenir les top N paires
-    top_pairs = pair_counter.most_common(top_n)
+    # Compter les paires; à égalité, ordre de première apparition (comme Counter.most_common)
+    pair_keys = pairs['test_1'].to_numpy(dtype=np.int64) * len(labels) + pairs['test_2'].to_numpy(dtype=np.int64)
+    pair_index, unique_keys = pd.factorize(pair_keys)
+    counts = np.bincount(pair_index)
+    top_pairs = np.argsort(-counts, kind='stable')[:top_n]
     
     # Formater
     result = []
-    for (test1, test2), count in top_pairs:
+    for i in top_pairs:
+        test1, test2 = divmod(int(unique_keys[i]), len(labels))
         result.append({
-            "test1": str(test1),
-            "test2": str(test2),
-            "count": int(count)
+            "test1": str(labels[test1]),
+            "test2": str(labels[test2]),
+            "count": int(counts[i])
         })
     
     return result
@@ -286,12 +190,12 @@ def _compute_coorder_by_service(df: pd.DataFrame):
     
     service_stats = []
     
-    for service, group in df.groupby('nombre2'):
+    for service, group in df.groupby('nombre2', observed=True):
         # Calculer les paires pour ce service
         top_pairs = _compute_test_pairs(group, 10)
         
         # Compter le nombre total de co-ordonnancements
-        grouped = group.groupby(['numorden', 'date']).size()
+        grouped = group.groupby(['numorden', 'date'], observed=True).size()
         multi_test_days = (grouped > 1).sum()
         
         service_stats.append({
@@ -312,7 +216,7 @@ def _create_cooccurrence_matrix(df: pd.DataFrame):
     Créer une matrice de co-occurrence pour tous les tests
     """
     # Grouper par patient et date
-    grouped = df.groupby(['numorden', 'date'])['nombre'].apply(list)
+    grouped = df.groupby(['numorden', 'date'], observed=True)['nombre'].apply(list)
     
     # Obtenir tous les tests uniques
     all_tests = sorted(df['nombre'].unique())
@@ -1,23 +1,118 @@
 # backend/app/api/ingest.py
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
 from fastapi.responses import JSONResponse
-from typing import List, Dict, Any, Optional
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
-import io
-from datetime import datetime, date
-from pathlib import Path
-import uuid
-from sqlmodel import Session, select, func
+import tempfile
+import hashlib
+from sqlmodel import Session, select
 
-from ..services.validator import DataValidator
+from ..services.ingest_pipeline import IngestPipeline, IngestError
+from ..services.ingest_jobs import ingest_jobs
+from ..services.file_deletion import file_deletions
+from ..services.file_metadata import FileMetadataService, list_cache_file_ids
 from ..core.config import settings
 from ..db.base import get_session
-from ..db.models import Result, File as FileModel
+from ..db.models import Result, File as FileModel, FILE_STATUS_DELETED
 
 router = APIRouter()
 
-REQUIRED_COLUMNS = ['numorden', 'sexo', 'edad', 'nombre', 'textores', 'nombre2', 'Date']
-MAX_FILE_SIZE = 50 * 1024 * 1024  # 50 MB
+
+async def _spool_upload(file: UploadFile) -> Optional[Tuple[tempfile.SpooledTemporaryFile, str]]:
+    """
+    Copier l'upload par blocs dans un fichier temporaire qui bascule sur disque
+    au-delà de UPLOAD_SPOOL_MAX_SIZE, en calculant son empreinte SHA-256 au passage.
+    Retourne (fichier, empreinte) ou None si MAX_FILE_SIZE est dépassé.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.UPLOAD_SPOOL_MAX_SIZE)
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        block = await file.read(settings.UPLOAD_CHUNK_SIZE)
+        if not block:
+            break
+        size += len(block)
+        if size > settings.MAX_FILE_SIZE:
+            spool.close()
+            return None
+        digest.update(block)
+        spool.write(block)
+    spool.seek(0)
+    return spool, digest.hexdigest()
+
+
+def _unsupported_format_response(file_extension: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=400,
+        content={
+            "success": False,
+            "message": "Format de fichier non supporté",
+            "errors": [{"message": f"Extension .{file_extension} non acceptée"}]
+        }
+    )
+
+
+def _file_too_large_response() -> JSONResponse:
+    return JSONResponse(
+        status_code=400,
+        content={
+            "success": False,
+            "message": "Fichier trop volumineux",
+            "errors": [{"message": f"Taille maximale: {settings.MAX_FILE_SIZE // 1_000_000} MB"}]
+        }
+    )
+
+
+def _error_content(e: IngestError) -> Dict[str, Any]:
+    content = {
+        "success": False,
+        "message": e.message,
+        "errors": e.errors
+    }
+    if e.row_count is not None:
+        content["row_count"] = e.row_count
+    return content
+
+
+def _success_content(ingest_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Construire la réponse de succès (avec l'aperçu des 5 premières lignes)
+    """
+    row_count = ingest_result["row_count"]
+    preview_df = ingest_result["preview_df"].copy()
+    
+    # Convertir les Timestamps et types pandas en types JSON-serialisables
+    for col in preview_df.columns:
+        if pd.api.types.is_datetime64_any_dtype(preview_df[col]):
+            preview_df[col] = preview_df[col].dt.strftime('%Y-%m-%d').fillna('')
+        elif pd.api.types.is_integer_dtype(preview_df[col]):
+            preview_df[col] = preview_df[col].apply(lambda x: int(x) if pd.notna(x) else None)
+        elif preview_df[col].dtype == 'object':
+            preview_df[col] = preview_df[col].fillna('')
+    
+    preview = preview_df.to_dict(orient='records')
+    for record in preview:
+        for key, value in record.items():
+            if pd.isna(value) if hasattr(pd, 'isna') else (value is pd.NA or str(value) == '<NA>'):
+                record[key] = None
+    
+    if ingest_result.get("reused"):
+        message = f"Fichier déjà ingéré! {row_count} lignes disponibles."
+    else:
+        message = f"Fichier validé avec succès! {row_count} lignes traitées."
+    
+    return {
+        "success": True,
+        "message": message,
+        "file_id": ingest_result["file_id"],
+        "row_count": row_count,
+        "encoding": ingest_result["encoding"],
+        "preview": preview,
+        "warnings": ingest_result["warnings"],
+        "reused": ingest_result.get("reused", False)
+    }
+
 
 @router.post("/ingest")
 async def ingest_file(file: UploadFile = File(...), session: Session = Depends(get_session)):
@@ -28,224 +123,27 @@ async def ingest_file(file: UploadFile = File(...), session: Session = Depends(g
         # 1. Vérifier le type de fichier
         file_extension = file.filename.split('.')[-1].lower()
         if file_extension not in ['csv', 'xlsx', 'xls']:
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "success": False,
-                    "message": "Format de fichier non supporté",
-                    "errors": [{"message": f"Extension .{file_extension} non acceptée"}]
-                }
-            )
+            return _unsupported_format_response(file_extension)
         
-        # 2. Lire le fichier
-        contents = await file.read()
+        # 2. Copier l'upload par blocs dans un fichier temporaire (mémoire → disque)
+        upload = await _spool_upload(file)
+        if upload is None:
+            return _file_too_large_response()
+        spool, content_hash = upload
         
-        # Vérifier la taille
-        if len(contents) > MAX_FILE_SIZE:
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "success": False,
-                    "message": "Fichier trop volumineux",
-                    "errors": [{"message": f"Taille maximale: 50 MB"}]
-                }
-            )
-        
-        # 3. Parser selon le type
-        try:
-            if file_extension == 'csv':
-                # Essayer plusieurs encodages pour les fichiers CSV
-                encodings_to_try = [
-                    ("utf-8", {}),
-                    ("utf-8-sig", {}),
-                    ("latin1", {}),
-                    ("cp1252", {}),
-                    ("latin1", {"errors": "replace"}),
-                ]
-                df = None
-                last_err = None
-                
-                for enc, extra_kwargs in encodings_to_try:
-                    try:
-                        df = pd.read_csv(
-                            io.BytesIO(contents), 
-                            encoding=enc, 
-                            dtype=str,
-                            sep=",",
-                            **extra_kwargs
-                        )
-                        break  # Succès, sortir de la boucle
-                    except UnicodeDecodeError as e:
-                        last_err = e
-                        continue
-                    except Exception as e:
-                        # Autres erreurs (format CSV invalide, etc.)
-                        last_err = e
-                        continue
-                
-                if df is None:
-                    return JSONResponse(
-                        status_code=400,
-                        content={
-                            "success": False,
-                            "message": "Erreur de lecture du fichier",
-                            "errors": [{"message": f"Impossible de décoder le fichier avec les encodages essayés. Dernière erreur: {str(last_err)}"}]
-                        }
-                    )
-            else:
-                df = pd.read_excel(io.BytesIO(contents), dtype=str)
-        except Exception as e:
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "success": False,
-                    "message": "Erreur de lecture du fichier",
-                    "errors": [{"message": str(e)}]
-                }
-            )
-        
-        # 4. Validation du schéma
-        validator = DataValidator(df, REQUIRED_COLUMNS)
-        validation_result = validator.validate_all()
-        
-        if not validation_result['valid']:
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "success": False,
-                    "message": "Schéma invalide",
-                    "errors": validation_result['errors'],
-                    "row_count": len(df)
-                }
-            )
-        
-        # 5. Nettoyage et transformation
-        cleaned_df = validator.clean_data()
-        
-        # 6. Gérer les doublons
-        duplicates = cleaned_df.duplicated(subset=['numorden', 'nombre', 'Date'])
-        warnings = []
-        if duplicates.any():
-            num_duplicates = duplicates.sum()
-            cleaned_df = cleaned_df.drop_duplicates(subset=['numorden', 'nombre', 'Date'], keep='first')
-            warnings.append({"message": f"{num_duplicates} doublons détectés et supprimés"})
-        
-        # 7. Générer un file_id unique
-        file_id = str(uuid.uuid4())
-        
-        # 8. Sauvegarder en Parquet
-        cache_dir = settings.PARQUET_CACHE_DIR
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        
-        output_path = cache_dir / f"{file_id}.parquet"
-        cleaned_df.to_parquet(output_path, index=False)
-        
-        # 9. Sauvegarder dans la base de données avec SQLModel ORM
+        # 3-9. Parser, valider, nettoyer, dédoublonner, écrire en Parquet et en base par lots
+        # (dans un thread: la boucle d'événements reste libre pour les autres requêtes)
         try:
-            # Enregistrer les métadonnées du fichier
-            file_record = FileModel(
-                file_id=file_id,
-                original_filename=file.filename,
-                row_count=len(cleaned_df),
-                status='completed'
-            )
-            session.add(file_record)
-            
-            # Préparer les données pour l'insertion
-            cleaned_df_db = cleaned_df.copy()
-            cleaned_df_db['file_id'] = file_id
-            
-            # Renommer la colonne Date en date (lowercase pour cohérence)
-            if 'Date' in cleaned_df_db.columns:
-                cleaned_df_db = cleaned_df_db.rename(columns={'Date': 'date'})
-            
-            # Convertir les dates en format date Python
-            if 'date' in cleaned_df_db.columns:
-                cleaned_df_db['date'] = pd.to_datetime(cleaned_df_db['date']).dt.date
-            
-            # Générer les IDs automatiquement (DuckDB ne supporte pas AUTO_INCREMENT)
-            # Récupérer le max ID actuel pour générer les IDs séquentiels
-            max_id_stmt = select(func.max(Result.id))
-            max_id_result = session.exec(max_id_stmt).one_or_none()
-            max_id = max_id_result if max_id_result is not None else 0
-            
-            # Créer les objets Result à partir du DataFrame
-            results_to_insert = []
-            for idx, row in cleaned_df_db.iterrows():
-                # Gérer les valeurs manquantes/NaN
-                edad_value = row['edad']
-                if pd.isna(edad_value):
-                    edad_value = 0  # Valeur par défaut pour les âges manquants
-                else:
-                    try:
-                        edad_value = int(float(edad_value))
-                    except (ValueError, TypeError):
-                        edad_value = 0
-                
-                # Gérer la date
-                date_value = row['date']
-                if pd.isna(date_value):
-                    date_value = date.today()  # Date par défaut
-                elif not isinstance(date_value, date):
-                    try:
-                        date_value = pd.to_datetime(date_value).date()
-                    except:
-                        date_value = date.today()
-                
-                result = Result(
-                    id=max_id + idx + 1,
-                    file_id=str(row['file_id']),
-                    numorden=str(row['numorden']) if pd.notna(row['numorden']) else '',
-                    sexo=str(row['sexo']) if pd.notna(row['sexo']) else '',
-                    edad=edad_value,
-                    nombre=str(row['nombre']) if pd.notna(row['nombre']) else '',
-                    textores=str(row['textores']) if pd.notna(row['textores']) else '',
-                    nombre2=str(row['nombre2']) if pd.notna(row['nombre2']) else '',
-                    date=date_value,
-                    created_at=datetime.utcnow()
-                )
-                results_to_insert.append(result)
-            
-            # Insérer en batch avec SQLModel
-            session.add_all(results_to_insert)
-            session.commit()
-            warnings.append({"message": f"✅ {len(cleaned_df)} lignes insérées dans la base de données"})
-        except Exception as e:
-            # On continue même si la DB échoue car on a le Parquet
-            session.rollback()
-            warnings.append({"message": f"⚠️ Erreur base de données: {str(e)}"})
-            print(f"⚠️ Erreur lors de l'insertion dans la base de données: {str(e)}")
+            # (un contenu déjà ingéré renvoie directement le file_id existant)
+            pipeline = IngestPipeline(session, spool, file_extension, file.filename, content_hash=content_hash)
+            ingest_result = await run_in_threadpool(pipeline.run)
+        except IngestError as e:
+            return JSONResponse(status_code=e.status_code, content=_error_content(e))
+        finally:
+            spool.close()
         
-        # 10. Créer un aperçu (5 premières lignes)
-        preview_df = cleaned_df.head(5).copy()
-        
-        # Convertir les Timestamps et types pandas en types JSON-serialisables
-        for col in preview_df.columns:
-            if pd.api.types.is_datetime64_any_dtype(preview_df[col]):
-                preview_df[col] = preview_df[col].dt.strftime('%Y-%m-%d').fillna('')
-            elif pd.api.types.is_integer_dtype(preview_df[col]):
-                preview_df[col] = preview_df[col].apply(lambda x: int(x) if pd.notna(x) else None)
-            elif preview_df[col].dtype == 'object':
-                preview_df[col] = preview_df[col].fillna('')
-        
-        preview = preview_df.to_dict(orient='records')
-        for record in preview:
-            for key, value in record.items():
-                if pd.isna(value) if hasattr(pd, 'isna') else (value is pd.NA or str(value) == '<NA>'):
-                    record[key] = None
-        
-        # 11. Retourner le succès
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "message": f"Fichier validé avec succès! {len(cleaned_df)} lignes traitées.",
-                "file_id": file_id,
-                "row_count": len(cleaned_df),
-                "preview": preview,
-                "warnings": warnings
-            }
-        )
+        # 10-11. Retourner le succès avec l'aperçu
+        return JSONResponse(status_code=200, content=_success_content(ingest_result))
         
     except Exception as e:
         return JSONResponse(
@@ -258,21 +156,66 @@ async def ingest_file(file: UploadFile = File(...), session: Session = Depends(g
         )
 
 
+@router.post("/ingest/jobs")
+async def submit_ingest_job(file: UploadFile = File(...)):
+    """
+    Ingestion asynchrone: copier l'upload puis retourner immédiatement un job_id
+    Le pipeline s'exécute dans le pool de workers, suivi via GET /ingest/jobs/{job_id}
+    """
+    file_extension = file.filename.split('.')[-1].lower()
+    if file_extension not in ['csv', 'xlsx', 'xls']:
+        return _unsupported_format_response(file_extension)
+    
+    upload = await _spool_upload(file)
+    if upload is None:
+        return _file_too_large_response()
+    spool, content_hash = upload
+    
+    job = ingest_jobs.submit(spool, file_extension, file.filename, content_hash)
+    
+    return JSONResponse(
+        status_code=202,
+        content={
+            "success": True,
+            "message": "Ingestion mise en file d'attente",
+            **job.to_dict()
+        }
+    )
+
+
+@router.get("/ingest/jobs/{job_id}")
+async def get_ingest_job(job_id: str):
+    """
+    Suivre un job d'ingestion: étape, lignes traitées, débit et résultat final
+    """
+    job = ingest_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job non trouvé")
+    
+    content = job.to_dict()
+    if job.status == "completed":
+        content["result"] = _success_content(job.result)
+    elif job.status == "failed":
+        content["result"] = _error_content(job.error)
+    
+    return content
+
+
 @router.get("/files/{file_id}")
-async def get_file_info(file_id: str):
+async def get_file_info(file_id: str, session: Session = Depends(get_session)):
     """
     Récupérer les informations d'un fichier ingéré depuis Parquet
+    (footers uniquement, aperçu lu dans le premier row group)
     """
-    cache_dir = settings.PARQUET_CACHE_DIR
-    file_path = cache_dir / f"{file_id}.parquet"
-    
-    if not file_path.exists():
+    # Un fichier en cours de suppression garde son cache jusqu'à la purge
+    deleted_stmt = select(FileModel).where(FileModel.file_id == file_id, FileModel.status == FILE_STATUS_DELETED)
+    metadata = FileMetadataService(file_id)
+    if not metadata.exists() or session.exec(deleted_stmt).first():
         raise HTTPException(status_code=404, detail="Fichier non trouvé")
     
     try:
-        df = pd.read_parquet(file_path)
-        
-        preview_df = df.head(10).copy()
+        summary = metadata.summary()
+        preview_df = metadata.preview(limit=10).to_pandas()
         
         for col in preview_df.columns:
             if pd.api.types.is_datetime64_any_dtype(preview_df[col]):
@@ -290,8 +233,13 @@ async def get_file_info(file_id: str):
         
         return {
             "file_id": file_id,
-            "row_count": len(df),
-            "columns": list(df.columns),
+            "row_count": summary["row_count"],
+            "columns": summary["columns"],
+            "null_counts": summary["null_counts"],
+            "date_min": summary["date_min"],
+            "date_max": summary["date_max"],
+            "num_row_groups": summary["num_row_groups"],
+            "size_bytes": summary["size_bytes"],
             "preview": preview
         }
     except Exception as e:
@@ -315,7 +263,7 @@ async def get_file_data_from_duckdb(
             limit = MAX_LIMIT
         
         # Vérifier si le fichier existe
-        file_stmt = select(FileModel).where(FileModel.file_id == file_id)
+        file_stmt = select(FileModel).where(FileModel.file_id == file_id, FileModel.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         
         if not file_record:
@@ -372,7 +320,11 @@ async def list_uploaded_files(session: Session = Depends(get_session)):
     """
     try:
         # Récupérer tous les fichiers depuis la base de données
-        files_stmt = select(FileModel).order_by(FileModel.upload_timestamp.desc())
+        files_stmt = (
+            select(FileModel)
+            .where(FileModel.status != FILE_STATUS_DELETED)
+            .order_by(FileModel.upload_timestamp.desc())
+        )
         files = session.exec(files_stmt).all()
         
         # Convertir en format JSON-friendly
@@ -394,16 +346,13 @@ async def list_uploaded_files(session: Session = Depends(get_session)):
         # Fallback: lister depuis le cache Parquet si la DB échoue
         try:
             cache_dir = settings.PARQUET_CACHE_DIR
-            parquet_files = list(cache_dir.glob("*.parquet"))
             
             files_list = []
-            for file_path in parquet_files:
-                file_id = file_path.stem
-                df = pd.read_parquet(file_path)
+            for file_id in list_cache_file_ids(cache_dir):
                 files_list.append({
                     "file_id": file_id,
                     "original_filename": "Unknown",
-                    "row_count": len(df),
+                    "row_count": FileMetadataService(file_id).row_count(),
                     "status": "completed"
                 })
             
@@ -416,42 +365,30 @@ async def list_uploaded_files(session: Session = Depends(get_session)):
             raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.delete("/files/{file_id}")
+@router.delete("/files/{file_id}", status_code=202)
 async def delete_file(file_id: str, session: Session = Depends(get_session)):
     """
     Supprimer un fichier (Parquet + Base de données)
+    Le fichier est exclu immédiatement de toutes les requêtes; ses résultats et
+    son cache Parquet sont purgés en arrière-plan
     """
     try:
-        # Vérifier que le fichier existe
-        file_stmt = select(FileModel).where(FileModel.file_id == file_id)
+        # Vérifier que le fichier existe (et n'est pas déjà en cours de suppression)
+        file_stmt = select(FileModel).where(FileModel.file_id == file_id, FileModel.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         
         if not file_record:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Supprimer tous les résultats associés
-        results_stmt = select(Result).where(Result.file_id == file_id)
-        results = session.exec(results_stmt).all()
-        for result in results:
-            session.delete(result)
-        
-        # Supprimer le fichier
-        session.delete(file_record)
-        session.commit()
-        
-        # Supprimer le fichier Parquet
-        cache_dir = settings.PARQUET_CACHE_DIR
-        file_path = cache_dir / f"{file_id}.parquet"
-        
-        if file_path.exists():
-            file_path.unlink()
+        file_deletions.tombstone(session, file_record)
         
         return {
             "success": True,
-            "message": f"Fichier {file_id} supprimé avec succès"
+            "message": f"Fichier {file_id} supprimé (purge des données en cours)",
+            "status": FILE_STATUS_DELETED
         }
     except HTTPException:
         raise
     except Exception as e:
         session.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,12 +1,13 @@
 # backend/app/api/panels.py
 from fastapi import APIRouter, HTTPException, Depends
 from typing import Dict, Any, List
-import pandas as pd
 from sqlmodel import Session, select
 
 from ..db.base import get_session
-from ..db.models import Result, File
+from ..db.models import File, FILE_STATUS_DELETED
 from ..services.panel_engine import PanelEngine
+from ..services.dimensions import load_coded_frame
+from ..services.frame_loader import load_frame
 
 router = APIRouter()
 
@@ -21,32 +22,17 @@ async def analyze_panels(file_id: str, session: Session = Depends(get_session)):
     """
     try:
         # Vérifier que le fichier existe
-        file_stmt = select(File).where(File.file_id == file_id)
+        file_stmt = select(File).where(File.file_id == file_id, File.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         if not file_record:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Charger les données avec SQLModel
-        results_stmt = (
-            select(Result)
-            .where(Result.file_id == file_id)
-            .order_by(Result.numorden, Result.date)
-        )
-        results = session.exec(results_stmt).all()
+        # Charger les colonnes codées par entiers depuis fact_results
+        df = load_coded_frame(session, file_id, ['numorden', 'nombre', 'date'])
         
-        if not results:
+        if len(df) == 0:
             raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
         
-        # Convertir en DataFrame
-        data_list = []
-        for result in results:
-            data_list.append({
-                "numorden": result.numorden,
-                "nombre": result.nombre,
-                "date": result.date.isoformat() if result.date else None
-            })
-        df = pd.DataFrame(data_list)
-        
         # Utiliser le service d'analyse de panels
         panel_engine = PanelEngine(df)
         analysis = panel_engine.analyze_panels()
@@ -68,27 +54,17 @@ async def get_patient_panels(file_id: str, numorden: str, session: Session = Dep
     Obtenir l'historique des panels pour un patient spécifique
     """
     try:
-        # Charger les données avec SQLModel
-        results_stmt = (
-            select(Result)
-            .where(Result.file_id == file_id)
-            .where(Result.numorden == numorden)
-            .order_by(Result.date, Result.nombre)
-        )
-        results = session.exec(results_stmt).all()
-        
-        if not results:
-            raise HTTPException(status_code=404, detail="Patient non trouvé")
+        # Vérifier que le fichier existe
+        file_stmt = select(File).where(File.file_id == file_id, File.status != FILE_STATUS_DELETED)
+        file_record = session.exec(file_stmt).first()
+        if not file_record:
+            raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Convertir en DataFrame
-        data_list = []
-        for result in results:
-            data_list.append({
-                "date": result.date.isoformat() if result.date else None,
-                "nombre": result.nombre,
-                "textores": result.textores
-            })
-        df = pd.DataFrame(data_list)
+        # Charger les résultats du patient (requête DuckDB projetée)
+        df = load_frame(
+            session, file_id, ['date', 'nombre', 'textores'],
+            equals={"numorden": numorden}, order_by=['date', 'nombre']
+        )
         
         if len(df) == 0:
             raise HTTPException(status_code=404, detail="Patient non trouvé")
@@ -113,6 +89,8 @@ async def get_patient_panels(file_id: str, numorden: str, session: Session = Dep
             "panels": panels_by_date
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -124,41 +102,19 @@ async def get_top_panels(file_id: str, limit: int = 10, session: Session = Depen
     """
     try:
         # Vérifier que le fichier existe
-        file_stmt = select(File).where(File.file_id == file_id)
+        file_stmt = select(File).where(File.file_id == file_id, File.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         if not file_record:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Charger les données avec SQLModel
-        results_stmt = (
-            select(Result)
-            .where(Result.file_id == file_id)
-            .order_by(Result.numorden, Result.date)
-        )
-        results = session.exec(results_stmt).all()
-        
-        if not results:
-            raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
-        
-        # Convertir en DataFrame
-        data_list = []
-        for result in results:
-            data_list.append({
-                "numorden": result.numorden,
-                "date": result.date.isoformat() if result.date else None,
-                "nombre": result.nombre
-            })
-        df = pd.DataFrame(data_list)
+        # Charger les colonnes codées par entiers depuis fact_results
+        df = load_coded_frame(session, file_id, ['numorden', 'date', 'nombre'])
         
         if len(df) == 0:
             raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
         
-        # Grouper par patient + date pour identifier les panels
-        panels = df.groupby(['numorden', 'date'])['nombre'].apply(lambda x: tuple(sorted(x))).reset_index()
-        panels.columns = ['numorden', 'date', 'panel']
-        
-        # Compter les occurrences de chaque panel
-        panel_counts = panels['panel'].value_counts().head(limit)
+        # Compter les occurrences de chaque panel (tests d'un même patient + date)
+        panel_counts = PanelEngine(df).panel_counts().head(limit)
         
         # Formater le résultat
         top_panels = []
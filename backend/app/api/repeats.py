@@ -4,8 +4,10 @@ import pandas as pd
 from sqlmodel import Session, select
 
 from ..db.base import get_session
-from ..db.models import Result, File
+from ..db.models import File, FILE_STATUS_DELETED
 from ..services.repeat_engine import RepeatEngine
+from ..services.dimensions import load_coded_frame
+from ..services.frame_loader import load_frame
 
 router = APIRouter()
 
@@ -21,32 +23,14 @@ async def analyze_repeats(file_id: str, session: Session = Depends(get_session))
     """
     try:
         # Vérifier que le fichier existe
-        file_stmt = select(File).where(File.file_id == file_id)
+        file_stmt = select(File).where(File.file_id == file_id, File.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         if not file_record:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Charger les données avec SQLModel
-        results_stmt = (
-            select(Result)
-            .where(Result.file_id == file_id)
-            .order_by(Result.numorden, Result.nombre, Result.date)
-        )
-        results = session.exec(results_stmt).all()
-        
-        if not results:
-            raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
-        
-        # Convertir en DataFrame
-        data_list = []
-        for result in results:
-            data_list.append({
-                "numorden": result.numorden,
-                "nombre": result.nombre,
-                "date": result.date.isoformat() if result.date else None,
-                "textores": result.textores
-            })
-        df = pd.DataFrame(data_list)
+        # Charger les colonnes codées par entiers depuis fact_results
+        # (RepeatEngine n'utilise pas textores)
+        df = load_coded_frame(session, file_id, ['numorden', 'nombre', 'date'])
         
         if len(df) == 0:
             raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
@@ -72,27 +56,17 @@ async def get_test_repeat_history(file_id: str, test_name: str, session: Session
     Obtenir l'historique de répétition pour un test spécifique
     """
     try:
-        # Charger les données avec SQLModel
-        results_stmt = (
-            select(Result)
-            .where(Result.file_id == file_id)
-            .where(Result.nombre == test_name)
-            .order_by(Result.numorden, Result.date)
-        )
-        results = session.exec(results_stmt).all()
-        
-        if not results:
-            raise HTTPException(status_code=404, detail="Test non trouvé")
+        # Vérifier que le fichier existe
+        file_stmt = select(File).where(File.file_id == file_id, File.status != FILE_STATUS_DELETED)
+        file_record = session.exec(file_stmt).first()
+        if not file_record:
+            raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Convertir en DataFrame
-        data_list = []
-        for result in results:
-            data_list.append({
-                "numorden": result.numorden,
-                "date": result.date.isoformat() if result.date else None,
-                "textores": result.textores
-            })
-        df = pd.DataFrame(data_list)
+        # Charger les résultats du test (requête DuckDB projetée)
+        df = load_frame(
+            session, file_id, ['numorden', 'date', 'textores'],
+            equals={"nombre": test_name}, order_by=['numorden', 'date']
+        )
         
         if len(df) == 0:
             raise HTTPException(status_code=404, detail="Test non trouvé")
@@ -129,6 +103,8 @@ async def get_test_repeat_history(file_id: str, test_name: str, session: Session
             "repeat_history": repeat_history[:50]  # Limiter à 50 patients
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -139,27 +115,17 @@ async def get_patient_repeats(file_id: str, numorden: str, session: Session = De
     Obtenir tous les tests répétés pour un patient spécifique
     """
     try:
-        # Charger les données avec SQLModel
-        results_stmt = (
-            select(Result)
-            .where(Result.file_id == file_id)
-            .where(Result.numorden == numorden)
-            .order_by(Result.nombre, Result.date)
-        )
-        results = session.exec(results_stmt).all()
-        
-        if not results:
-            raise HTTPException(status_code=404, detail="Patient non trouvé")
+        # Vérifier que le fichier existe
+        file_stmt = select(File).where(File.file_id == file_id, File.status != FILE_STATUS_DELETED)
+        file_record = session.exec(file_stmt).first()
+        if not file_record:
+            raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Convertir en DataFrame
-        data_list = []
-        for result in results:
-            data_list.append({
-                "nombre": result.nombre,
-                "date": result.date.isoformat() if result.date else None,
-                "textores": result.textores
-            })
-        df = pd.DataFrame(data_list)
+        # Charger les résultats du patient (requête DuckDB projetée)
+        df = load_frame(
+            session, file_id, ['nombre', 'date', 'textores'],
+            equals={"numorden": numorden}, order_by=['nombre', 'date']
+        )
         
         if len(df) == 0:
             raise HTTPException(status_code=404, detail="Patient non trouvé")
@@ -196,6 +162,8 @@ async def get_patient_repeats(file_id: str, numorden: str, session: Session = De
             "repeated_tests": repeated_tests
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1,14 +1,27 @@
 # backend/app/api/stats.py
 from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
 import pandas as pd
 import numpy as np
-from sqlmodel import Session, select, and_
+from sqlmodel import Session, select
 
 from ..db.base import get_session
-from ..db.models import Result, File
-from ..services.stats_engine import StatsEngine, convert_numpy_types
+from ..core.config import settings
+from ..db.models import File, FILE_STATUS_DELETED
+from ..services.stats_engine import (
+    ACCURACY_APPROXIMATE, ACCURACY_EXACT, COLUMN_HISTOGRAM_BINS, MISSING_COLUMNS, SUMMARY_COLUMNS,
+    SqlStatsEngine, StatsEngine, convert_numpy_types, missing_summary
+)
+from ..services.column_catalog import LOGICAL_NUMERIC, column_catalog, is_column
+from ..services.frame_loader import RESULT_COLUMNS, load_frame
+from ..services.file_metadata import FileMetadataService
+from ..services.daily_rollups import rollup_timeseries
+from ..services.file_profiles import (
+    file_profiles, profile_column_stats, profile_has_rollup, profile_sketches,
+    profile_summary
+)
+from ..services.stats_sketches import SketchStatsEngine, merge_sketches
 
 router = APIRouter()
 
@@ -16,6 +29,111 @@ router = APIRouter()
 class StatsRequest(BaseModel):
     file_id: str
     columns: list = None  # Si None, calculer pour toutes les colonnes
+    accuracy: str = ACCURACY_EXACT  # "exact" ou "approximate" (estimations, backend sql)
+
+
+class MergedStatsRequest(BaseModel):
+    file_ids: List[str]
+    service: Optional[str] = None  # Si renseigné, uniquement les lignes de ce service (nombre2)
+    columns: list = None  # Si None, calculer pour toutes les colonnes
+
+
+def _compute_column_stats(column_data: pd.Series) -> Dict[str, Any]:
+    """
+    Statistiques détaillées d'une colonne chargée dans pandas (STATS_BACKEND="pandas")
+    """
+    # Déterminer le type de colonne
+    is_numeric = pd.api.types.is_numeric_dtype(column_data)
+    
+    if is_numeric:
+        # Statistiques numériques
+        stats = {
+            "type": "numeric",
+            "count": int(column_data.count()),
+            "missing": int(column_data.isna().sum()),
+            "missing_pct": float(column_data.isna().sum() / len(column_data) * 100),
+            "mean": float(column_data.mean()) if column_data.count() > 0 else None,
+            "std": float(column_data.std()) if column_data.count() > 0 else None,
+            "min": float(column_data.min()) if column_data.count() > 0 else None,
+            "max": float(column_data.max()) if column_data.count() > 0 else None,
+            "median": float(column_data.median()) if column_data.count() > 0 else None,
+            "q25": float(column_data.quantile(0.25)) if column_data.count() > 0 else None,
+            "q75": float(column_data.quantile(0.75)) if column_data.count() > 0 else None,
+            "distribution": column_data.value_counts().head(20).to_dict(),
+            "histogram": None
+        }
+        if column_data.count() > 0:
+            counts, bin_edges = np.histogram(column_data.dropna().astype(float), bins=COLUMN_HISTOGRAM_BINS)
+            stats["histogram"] = {"bin_edges": bin_edges.tolist(), "counts": counts.tolist()}
+    else:
+        # Statistiques catégorielles
+        value_counts = column_data.value_counts()
+        stats = {
+            "type": "categorical",
+            "count": int(column_data.count()),
+            "missing": int(column_data.isna().sum()),
+            "missing_pct": float(column_data.isna().sum() / len(column_data) * 100),
+            "unique": int(column_data.nunique()),
+            "top": str(value_counts.index[0]) if len(value_counts) > 0 else None,
+            "freq": int(value_counts.iloc[0]) if len(value_counts) > 0 else 0,
+            "distribution": value_counts.head(20).to_dict()
+        }
+    
+    # Convertir tous les types numpy en types Python natifs
+    return convert_numpy_types(stats)
+
+
+def _frame_timeseries(session: Session, file_id: str, column: str, group_by: str,
+                      filter_list: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """
+    Série temporelle calculée sur les lignes du fichier
+    (profil pas encore calculé, ou filtre sur une colonne absente du cube journalier)
+    """
+    # Colonne agrégée et date uniquement
+    columns = ['date'] if column in ('nombre', 'date') else ['date', column]
+    df = load_frame(session, file_id, columns, filters=filter_list)
+
+    if len(df) == 0:
+        raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
+
+    # Filtrer les dates valides
+    df = df[df['date'].notna()]
+    if len(df) == 0:
+        raise HTTPException(status_code=404, detail="Aucune date valide trouvée")
+
+    # Convertir en datetime
+    df['date'] = pd.to_datetime(df['date'])
+
+    # Grouper selon la période demandée
+    if group_by == "day":
+        df['period'] = df['date'].dt.date
+    elif group_by == "week":
+        df['period'] = df['date'].dt.to_period('W').dt.start_time.dt.date
+    else:
+        df['period'] = df['date'].dt.to_period('M').dt.start_time.dt.date
+
+    # Agréger selon la colonne demandée
+    if column == "nombre":
+        # Nombre de tests par période
+        timeseries = df.groupby('period').size().reset_index(name='count')
+    elif column == "numorden":
+        # Nombre de patients uniques par période
+        timeseries = df.groupby('period')['numorden'].nunique().reset_index(name='count')
+    elif column == "edad":
+        # Moyenne d'âge par période
+        timeseries = df.groupby('period')['edad'].mean().reset_index(name='count')
+    else:
+        # Compter les occurrences de la colonne
+        timeseries = df.groupby(['period', column]).size().reset_index(name='count')
+        timeseries = timeseries.groupby('period')['count'].sum().reset_index(name='count')
+    timeseries['period'] = timeseries['period'].astype(str)
+
+    # Trier par période
+    timeseries = timeseries.sort_values('period')
+    return {
+        "x": timeseries['period'].tolist(),
+        "y": timeseries['count'].tolist()
+    }
 
 
 @router.post("/stats/summary")
@@ -26,44 +144,56 @@ async def compute_summary_stats(request: StatsRequest, session: Session = Depend
     Retourne:
     - Statistiques numériques: mean, std, min, max, quantiles
     - Statistiques catégorielles: unique counts, mode, distribution
-    - Missingness par colonne
+    - Missingness par colonne (valeurs manquantes du fichier téléversé)
+    
+    accuracy="approximate": quantiles, cardinalités et distributions estimés
+    (fichiers de plus de STATS_SAMPLE_SIZE lignes); "accuracy" et
+    "approximate_fields" de la réponse indiquent les valeurs estimées
     """
     try:
+        if request.accuracy not in (ACCURACY_EXACT, ACCURACY_APPROXIMATE):
+            raise HTTPException(status_code=400, detail="accuracy doit être 'exact' ou 'approximate'")
+        
         # Vérifier que le fichier existe
-        file_stmt = select(File).where(File.file_id == request.file_id)
+        file_stmt = select(File).where(File.file_id == request.file_id, File.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         if not file_record:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Charger les données avec SQLModel
-        results_stmt = select(Result).where(Result.file_id == request.file_id)
-        results = session.exec(results_stmt).all()
-        
-        if not results:
+        # Profil calculé après l'ingestion (exact), sinon calcul à la demande
+        profile = file_profiles.get(session, file_record)
+        summary = profile_summary(profile, request.columns) if profile is not None else None
+        approximate_fields = {}
+        if summary is None:
+            if settings.STATS_BACKEND == "sql":
+                # Une requête d'agrégation DuckDB, sans charger les lignes
+                # Petit fichier: le calcul exact est aussi rapide que l'échantillon
+                accuracy = request.accuracy
+                if file_record.row_count <= settings.STATS_SAMPLE_SIZE:
+                    accuracy = ACCURACY_EXACT
+                stats_engine = SqlStatsEngine(session, request.file_id, SUMMARY_COLUMNS, accuracy)
+                approximate_fields = stats_engine.approximate_fields(request.columns)
+            else:
+                # Charger uniquement les colonnes analysées (requête DuckDB projetée)
+                stats_engine = StatsEngine(load_frame(session, request.file_id, SUMMARY_COLUMNS))
+            summary = stats_engine.compute_full_summary(request.columns)
+        total_rows = summary["overview"]["total_rows"]
+        
+        # Valeurs manquantes du fichier téléversé, comme /stats/{file_id}/missing
+        # (results les remplace par des valeurs par défaut)
+        upload_missing = FileMetadataService(request.file_id).upload_missing_counts(MISSING_COLUMNS)
+        if upload_missing is not None:
+            summary["missing_summary"] = missing_summary(*upload_missing)
+        
+        if total_rows == 0:
             raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
         
-        # Convertir en DataFrame pour le service de statistiques
-        data_list = []
-        for result in results:
-            data_list.append({
-                "numorden": result.numorden,
-                "sexo": result.sexo,
-                "edad": result.edad,
-                "nombre": result.nombre,
-                "textores": result.textores,
-                "nombre2": result.nombre2,
-                "date": result.date.isoformat() if result.date else None
-            })
-        df = pd.DataFrame(data_list)
-        
-        # Utiliser le service de statistiques
-        stats_engine = StatsEngine(df)
-        summary = stats_engine.compute_full_summary(request.columns)
-        
         return {
             "success": True,
             "file_id": request.file_id,
-            "total_rows": len(df),
+            "total_rows": total_rows,
+            "accuracy": ACCURACY_APPROXIMATE if approximate_fields else ACCURACY_EXACT,
+            "approximate_fields": approximate_fields,
             "summary": summary
         }
         
@@ -73,6 +203,77 @@ async def compute_summary_stats(request: StatsRequest, session: Session = Depend
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/stats/merged")
+async def compute_merged_stats(request: MergedStatsRequest, session: Session = Depends(get_session)):
+    """
+    Statistiques descriptives de plusieurs fichiers (et éventuellement d'un service)
+    
+    Fusion des esquisses calculées après l'ingestion de chaque fichier, sans
+    relire leurs lignes: même résumé que /stats/summary, avec les champs estimés
+    dans "approximate_fields" (quantiles, distributions tronquées)
+    """
+    try:
+        file_ids = list(dict.fromkeys(request.file_ids))
+        if not file_ids:
+            raise HTTPException(status_code=400, detail="file_ids ne peut pas être vide")
+        
+        file_stmt = select(File).where(File.file_id.in_(file_ids), File.status != FILE_STATUS_DELETED)
+        file_records = {record.file_id: record for record in session.exec(file_stmt).all()}
+        missing_files = [file_id for file_id in file_ids if file_id not in file_records]
+        if missing_files:
+            raise HTTPException(status_code=404, detail=f"Fichiers non trouvés: {', '.join(missing_files)}")
+        
+        sketches = []
+        for file_id in file_ids:
+            # Esquisses du profil, sinon calculées à la demande (le profil est planifié)
+            profile = file_profiles.get(session, file_records[file_id])
+            file_sketches = profile_sketches(profile) if profile is not None else None
+            if file_sketches is None:
+                file_sketches = SqlStatsEngine(session, file_id, SUMMARY_COLUMNS).compute_sketches()
+            if request.service is None:
+                sketch = file_sketches["all"]
+            else:
+                sketch = file_sketches["services"].get(request.service)
+            if sketch is not None:
+                sketches.append(sketch)
+        
+        merged = merge_sketches(sketches)
+        if merged is None or merged["total_rows"] == 0:
+            raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
+        
+        stats_engine = SketchStatsEngine(merged)
+        approximate_fields = stats_engine.approximate_fields(request.columns)
+        return {
+            "success": True,
+            "file_ids": file_ids,
+            "service": request.service,
+            "total_rows": merged["total_rows"],
+            "accuracy": ACCURACY_APPROXIMATE if approximate_fields else ACCURACY_EXACT,
+            "approximate_fields": approximate_fields,
+            "summary": stats_engine.compute_full_summary(request.columns)
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stats/columns")
+async def get_column_catalog(session: Session = Depends(get_session)):
+    """
+    Catalogue des colonnes de results: nom, type logique (numeric, temporal,
+    categorical) et type de stockage DuckDB
+    """
+    try:
+        return {
+            "success": True,
+            "columns": column_catalog(session)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/stats/{file_id}/column/{column_name}")
 async def get_column_stats(file_id: str, column_name: str, session: Session = Depends(get_session)):
     """
@@ -80,67 +281,30 @@ async def get_column_stats(file_id: str, column_name: str, session: Session = De
     """
     try:
         # Vérifier que le fichier existe
-        file_stmt = select(File).where(File.file_id == file_id)
+        file_stmt = select(File).where(File.file_id == file_id, File.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         if not file_record:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Charger les données avec SQLModel
-        results_stmt = select(Result).where(Result.file_id == file_id)
-        results = session.exec(results_stmt).all()
-        
-        if not results:
-            raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
-        
-        # Convertir en DataFrame
-        data_list = []
-        for result in results:
-            data_list.append({
-                column_name: getattr(result, column_name, None)
-            })
-        df = pd.DataFrame(data_list)
-        
-        if len(df) == 0:
+        if not is_column(column_name):
+            raise HTTPException(status_code=404, detail="Colonne non trouvée")
+        
+        # Profil calculé après l'ingestion, sinon calcul à la demande
+        profile = file_profiles.get(session, file_record)
+        stats = profile_column_stats(profile, column_name) if profile is not None else None
+        if stats is not None and stats["type"] == LOGICAL_NUMERIC and "histogram" not in stats:
+            # Profil calculé avant l'ajout des histogrammes
+            file_profiles.schedule(file_id)
+            stats = None
+        if stats is None:
+            if settings.STATS_BACKEND == "sql":
+                stats = SqlStatsEngine(session, file_id, RESULT_COLUMNS).compute_column_stats([column_name])[column_name]
+            else:
+                stats = _compute_column_stats(load_frame(session, file_id, [column_name])[column_name])
+        
+        if stats["count"] + stats["missing"] == 0:
             raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
         
-        column_data = df[column_name]
-        
-        # Déterminer le type de colonne
-        is_numeric = pd.api.types.is_numeric_dtype(column_data)
-        
-        if is_numeric:
-            # Statistiques numériques
-            stats = {
-                "type": "numeric",
-                "count": int(column_data.count()),
-                "missing": int(column_data.isna().sum()),
-                "missing_pct": float(column_data.isna().sum() / len(column_data) * 100),
-                "mean": float(column_data.mean()) if column_data.count() > 0 else None,
-                "std": float(column_data.std()) if column_data.count() > 0 else None,
-                "min": float(column_data.min()) if column_data.count() > 0 else None,
-                "max": float(column_data.max()) if column_data.count() > 0 else None,
-                "median": float(column_data.median()) if column_data.count() > 0 else None,
-                "q25": float(column_data.quantile(0.25)) if column_data.count() > 0 else None,
-                "q75": float(column_data.quantile(0.75)) if column_data.count() > 0 else None,
-                "distribution": column_data.value_counts().head(20).to_dict()
-            }
-        else:
-            # Statistiques catégorielles
-            value_counts = column_data.value_counts()
-            stats = {
-                "type": "categorical",
-                "count": int(column_data.count()),
-                "missing": int(column_data.isna().sum()),
-                "missing_pct": float(column_data.isna().sum() / len(column_data) * 100),
-                "unique": int(column_data.nunique()),
-                "top": str(value_counts.index[0]) if len(value_counts) > 0 else None,
-                "freq": int(value_counts.iloc[0]) if len(value_counts) > 0 else 0,
-                "distribution": value_counts.head(20).to_dict()
-            }
-        
-        # Convertir tous les types numpy en types Python natifs
-        stats = convert_numpy_types(stats)
-        
         return {
             "success": True,
             "column": column_name,
@@ -148,6 +312,8 @@ async def get_column_stats(file_id: str, column_name: str, session: Session = De
             "stats": stats
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -156,51 +322,34 @@ async def get_column_stats(file_id: str, column_name: str, session: Session = De
 async def get_missing_summary(file_id: str, session: Session = Depends(get_session)):
     """
     Obtenir un résumé des valeurs manquantes par colonne
+    
+    Valeurs manquantes du fichier téléversé (results les remplace par des
+    valeurs par défaut), lues dans les statistiques des footers Parquet écrites
+    à l'ingestion, ou dans les colonnes du cache si ses footers n'en ont pas
     """
     try:
         # Vérifier que le fichier existe
-        file_stmt = select(File).where(File.file_id == file_id)
+        file_stmt = select(File).where(File.file_id == file_id, File.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         if not file_record:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Charger les données avec SQLModel
-        results_stmt = select(Result).where(Result.file_id == file_id)
-        results = session.exec(results_stmt).all()
-        
-        if not results:
-            raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
-        
-        # Convertir en DataFrame
-        data_list = []
-        for result in results:
-            data_list.append({
-                "numorden": result.numorden,
-                "sexo": result.sexo,
-                "edad": result.edad,
-                "nombre": result.nombre,
-                "textores": result.textores,
-                "nombre2": result.nombre2,
-                "date": result.date.isoformat() if result.date else None
-            })
-        df = pd.DataFrame(data_list)
+        upload_missing = FileMetadataService(file_id).upload_missing_counts(MISSING_COLUMNS)
+        if upload_missing is None:
+            raise HTTPException(status_code=404, detail="Cache Parquet du fichier introuvable")
+        total_rows, missing_counts = upload_missing
         
-        if len(df) == 0:
+        if total_rows == 0:
             raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
         
-        # Calculer les valeurs manquantes
         missing_stats = []
-        for col in df.columns:
-            if col not in ['id', 'file_id', 'created_at']:
-                missing_count = df[col].isna().sum()
-                missing_pct = (missing_count / len(df)) * 100
-                
-                missing_stats.append({
-                    "column": col,
-                    "missing_count": int(missing_count),
-                    "missing_pct": float(missing_pct),
-                    "present_count": int(len(df) - missing_count)
-                })
+        for col, missing_count in missing_counts.items():
+            missing_stats.append({
+                "column": col,
+                "missing_count": missing_count,
+                "missing_pct": float(missing_count / total_rows * 100),
+                "present_count": total_rows - missing_count
+            })
         
         # Trier par pourcentage de valeurs manquantes
         missing_stats.sort(key=lambda x: x['missing_pct'], reverse=True)
@@ -208,10 +357,12 @@ async def get_missing_summary(file_id: str, session: Session = Depends(get_sessi
         return {
             "success": True,
             "file_id": file_id,
-            "total_rows": len(df),
+            "total_rows": total_rows,
             "missing_summary": missing_stats
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -222,6 +373,7 @@ async def get_timeseries_data(
     column: str = "nombre",  # Colonne à agréger (par défaut: nombre de tests)
     group_by: str = "day",  # day, week, month
     filters: Optional[str] = None,  # JSON string of filters
+    accuracy: str = ACCURACY_EXACT,  # "approximate": patients distincts estimés dans le cube journalier
     session: Session = Depends(get_session)
 ):
     """
@@ -232,152 +384,61 @@ async def get_timeseries_data(
         column: Colonne à agréger ('nombre', 'numorden', etc.)
         group_by: Période de groupement ('day', 'week', 'month')
         filters: JSON string représentant une liste de FilterCondition (optionnel)
+        accuracy: "exact" (défaut) ou "approximate"
     
     Returns:
         Données formatées pour graphique de série temporelle
+    
+    Lue dans le cube journalier du profil si les filtres portent sur date,
+    nombre2, nombre, sexo ou edad (bornes multiples de ROLLUP_AGE_BAND_YEARS):
+    numorden n'y est qu'une estimation HyperLogLog, lue seulement avec
+    accuracy="approximate" (sinon comptée sur les lignes du fichier)
     """
     try:
         import json
         
         # Vérifier que le fichier existe
-        file_stmt = select(File).where(File.file_id == file_id)
+        file_stmt = select(File).where(File.file_id == file_id, File.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         if not file_record:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Construire la requête de base
-        results_stmt = select(Result).where(Result.file_id == file_id)
-        
-        # Appliquer les filtres si fournis
+        # Filtres manuels appliqués dans la requête DuckDB
+        filter_list = []
         if filters:
             try:
                 filter_list = json.loads(filters)
-                filter_conditions = []
-                
-                for filter_cond in filter_list:
-                    if not filter_cond.get('value'):
-                        continue
-                    
-                    column_name = filter_cond['column']
-                    operator = filter_cond['operator']
-                    value = filter_cond['value']
-                    
-                    column_attr = getattr(Result, column_name, None)
-                    if column_attr is None:
-                        continue
-                    
-                    # Construire la condition selon l'opérateur (même logique que subset_manual)
-                    if operator == 'LIKE':
-                        filter_conditions.append(column_attr.like(f"%{value}%"))
-                    elif operator == 'IN':
-                        values_list = [v.strip() for v in value.split(',')]
-                        filter_conditions.append(column_attr.in_(values_list))
-                    elif operator == '=':
-                        if column_name == 'edad':
-                            filter_conditions.append(column_attr == int(value))
-                        else:
-                            filter_conditions.append(column_attr == value)
-                    elif operator == '!=':
-                        if column_name == 'edad':
-                            filter_conditions.append(column_attr != int(value))
-                        else:
-                            filter_conditions.append(column_attr != value)
-                    elif operator == '>':
-                        if column_name == 'edad':
-                            filter_conditions.append(column_attr > int(value))
-                        else:
-                            filter_conditions.append(column_attr > value)
-                    elif operator == '<':
-                        if column_name == 'edad':
-                            filter_conditions.append(column_attr < int(value))
-                        else:
-                            filter_conditions.append(column_attr < value)
-                    elif operator == '>=':
-                        if column_name == 'edad':
-                            filter_conditions.append(column_attr >= int(value))
-                        else:
-                            filter_conditions.append(column_attr >= value)
-                    elif operator == '<=':
-                        if column_name == 'edad':
-                            filter_conditions.append(column_attr <= int(value))
-                        else:
-                            filter_conditions.append(column_attr <= value)
-                
-                if filter_conditions:
-                    results_stmt = results_stmt.where(and_(*filter_conditions))
             except json.JSONDecodeError:
                 raise HTTPException(status_code=400, detail="Format de filtres invalide (JSON attendu)")
         
-        # Exécuter la requête
-        results = session.exec(results_stmt).all()
-        
-        if not results:
-            raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
-        
-        # Convertir en DataFrame
-        data_list = []
-        for result in results:
-            data_list.append({
-                "date": result.date.isoformat() if result.date else None,
-                "nombre": result.nombre,
-                "numorden": result.numorden,
-                "edad": result.edad,
-                "sexo": result.sexo
-            })
-        df = pd.DataFrame(data_list)
-        
-        # Filtrer les dates valides
-        df = df[df['date'].notna()]
-        if len(df) == 0:
-            raise HTTPException(status_code=404, detail="Aucune date valide trouvée")
-        
-        # Convertir en datetime
-        df['date'] = pd.to_datetime(df['date'])
-        
-        # Grouper selon la période demandée
-        if group_by == "day":
-            df['period'] = df['date'].dt.date
-            period_format = "%Y-%m-%d"
-        elif group_by == "week":
-            df['period'] = df['date'].dt.to_period('W').dt.start_time.dt.date
-            period_format = "%Y-%m-%d"
-        elif group_by == "month":
-            df['period'] = df['date'].dt.to_period('M').dt.start_time.dt.date
-            period_format = "%Y-%m"
-        else:
+        # Colonne agrégée et période
+        if column not in RESULT_COLUMNS:
+            raise HTTPException(status_code=400, detail=f"Colonne inconnue: {column}")
+        if group_by not in ("day", "week", "month"):
             raise HTTPException(status_code=400, detail="group_by doit être 'day', 'week' ou 'month'")
-        
-        # Agréger selon la colonne demandée
-        if column == "nombre":
-            # Nombre de tests par période
-            timeseries = df.groupby('period').size().reset_index(name='count')
-            timeseries['period'] = timeseries['period'].astype(str)
-        elif column == "numorden":
-            # Nombre de patients uniques par période
-            timeseries = df.groupby('period')['numorden'].nunique().reset_index(name='count')
-            timeseries['period'] = timeseries['period'].astype(str)
-        elif column == "edad":
-            # Moyenne d'âge par période
-            timeseries = df.groupby('period')['edad'].mean().reset_index(name='count')
-            timeseries['period'] = timeseries['period'].astype(str)
-        else:
-            # Compter les occurrences de la colonne
-            timeseries = df.groupby(['period', column]).size().reset_index(name='count')
-            timeseries = timeseries.groupby('period')['count'].sum().reset_index(name='count')
-            timeseries['period'] = timeseries['period'].astype(str)
-        
-        # Trier par période
-        timeseries = timeseries.sort_values('period')
+        if accuracy not in (ACCURACY_EXACT, ACCURACY_APPROXIMATE):
+            raise HTTPException(status_code=400, detail="accuracy doit être 'exact' ou 'approximate'")
+        
+        # Cube journalier du profil si les filtres portent sur ses colonnes,
+        # sinon agrégation des lignes du fichier
+        series = None
+        profile = file_profiles.get(session, file_record)
+        use_rollup = column != 'numorden' or accuracy == ACCURACY_APPROXIMATE
+        if use_rollup and profile is not None and profile_has_rollup(profile):
+            series = rollup_timeseries(session, file_id, column, group_by, filter_list)
+        approximate = series is not None and column == 'numorden'
+        if series is None:
+            series = _frame_timeseries(session, file_id, column, group_by, filter_list)
+        if len(series["x"]) == 0:
+            raise HTTPException(status_code=404, detail="Aucune donnée trouvée")
         
         return {
             "success": True,
             "file_id": file_id,
             "column": column,
             "group_by": group_by,
-            "data": {
-                "x": timeseries['period'].tolist(),
-                "y": timeseries['count'].tolist()
-            }
+            "accuracy": ACCURACY_APPROXIMATE if approximate else ACCURACY_EXACT,
+            "data": series
         }
         
     except HTTPException:
@@ -10,7 +10,7 @@ from sqlmodel import Session, select, or_, and_, text
 from sqlalchemy import text as sql_text
 
 from ..db.base import get_session
-from ..db.models import Result, File
+from ..db.models import Result, File, FILE_STATUS_DELETED
 from ..core.config import settings
 
 router = APIRouter()
@@ -39,7 +39,7 @@ async def subset_manual(request: ManualFilterRequest, session: Session = Depends
     """
     try:
         # Vérifier que le fichier existe
-        file_stmt = select(File).where(File.file_id == request.file_id)
+        file_stmt = select(File).where(File.file_id == request.file_id, File.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         if not file_record:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
@@ -159,7 +159,7 @@ async def subset_sql(request: SQLFilterRequest, session: Session = Depends(get_s
             )
         
         # Vérifier que le file_id existe avec SQLModel
-        file_stmt = select(File).where(File.file_id == file_id_clean)
+        file_stmt = select(File).where(File.file_id == file_id_clean, File.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         
         if not file_record:
@@ -421,7 +421,7 @@ async def export_filtered_data(
         import json
         
         # Vérifier que le fichier existe
-        file_stmt = select(File).where(File.file_id == file_id)
+        file_stmt = select(File).where(File.file_id == file_id, File.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         if not file_record:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
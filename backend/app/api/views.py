@@ -8,10 +8,14 @@ from datetime import datetime
 from sqlmodel import Session, select
 
 from ..db.base import get_session
-from ..db.models import View, File, Result
+from ..db.models import View, File, FILE_STATUS_DELETED
+from ..services.frame_loader import load_table
 
 router = APIRouter()
 
+# Colonnes retournées par l'application d'une vue
+VIEW_COLUMNS = ['id', 'file_id', 'numorden', 'sexo', 'edad', 'nombre', 'textores', 'nombre2', 'date', 'created_at']
+
 
 def ensure_views_table_exists():
     """
@@ -72,7 +76,7 @@ async def create_view(request: CreateViewRequest, session: Session = Depends(get
         ensure_views_table_exists()
         
         # Vérifier que le fichier existe
-        file_stmt = select(File).where(File.file_id == request.file_id)
+        file_stmt = select(File).where(File.file_id == request.file_id, File.status != FILE_STATUS_DELETED)
         file_record = session.exec(file_stmt).first()
         if not file_record:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
@@ -276,83 +280,21 @@ async def apply_view(view_id: str, session: Session = Depends(get_session)):
         if not view:
             raise HTTPException(status_code=404, detail="Vue non trouvée")
         
-        filters = json.loads(view.filters) if view.filters else []
+        # Le fichier de la vue ne doit pas être en cours de suppression
+        file_stmt = select(File).where(File.file_id == view.file_id, File.status != FILE_STATUS_DELETED)
+        if not session.exec(file_stmt).first():
+            raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
-        # Construire la requête avec SQLModel
-        query = select(Result).where(Result.file_id == view.file_id)
+        filters = json.loads(view.filters) if view.filters else []
         
-        # Appliquer les filtres (similaire à subset_manual)
-        from sqlmodel import and_, or_
-
-        if filters:
-            conditions = []
-            for filter_cond in filters:
-                col = filter_cond['column']
-                op = filter_cond['operator']
-                val = filter_cond['value']
-                
-                if not val:
-                    continue
-                
-                column_attr = getattr(Result, col, None)
-                if column_attr is None:
-                    continue
-                
-                if op == 'LIKE':
-                    conditions.append(column_attr.like(f'%{val}%'))
-                elif op == 'IN':
-                    values = [v.strip() for v in val.split(',')]
-                    conditions.append(column_attr.in_(values))
-                elif op == '=':
-                    if col == 'edad':
-                        conditions.append(column_attr == int(val))
-                    else:
-                        conditions.append(column_attr == val)
-                elif op == '!=':
-                    if col == 'edad':
-                        conditions.append(column_attr != int(val))
-                    else:
-                        conditions.append(column_attr != val)
-                elif op == '>':
-                    if col == 'edad':
-                        conditions.append(column_attr > int(val))
-                    else:
-                        conditions.append(column_attr > val)
-                elif op == '<':
-                    if col == 'edad':
-                        conditions.append(column_attr < int(val))
-                    else:
-                        conditions.append(column_attr < val)
-                elif op == '>=':
-                    if col == 'edad':
-                        conditions.append(column_attr >= int(val))
-                    else:
-                        conditions.append(column_attr >= val)
-                elif op == '<=':
-                    if col == 'edad':
-                        conditions.append(column_attr <= int(val))
-                    else:
-                        conditions.append(column_attr <= val)
-            
-            query = query.where(and_(*conditions))
-        
-        results = session.exec(query).all()
+        # Filtres de la vue appliqués dans la requête DuckDB (même logique que subset_manual)
+        table = load_table(session, view.file_id, VIEW_COLUMNS, filters=filters, order_by=['id'])
         
         # Convertir en format JSON-friendly
-        data = []
-        for result in results:
-            data.append({
-                "id": result.id,
-                "file_id": result.file_id,
-                "numorden": result.numorden,
-                "sexo": result.sexo,
-                "edad": result.edad,
-                "nombre": result.nombre,
-                "textores": result.textores,
-                "nombre2": result.nombre2,
-                "date": result.date.isoformat() if result.date else None,
-                "created_at": result.created_at.isoformat() if result.created_at else None
-            })
+        data = table.to_pylist()
+        for record in data:
+            record["date"] = record["date"].isoformat() if record["date"] else None
+            record["created_at"] = record["created_at"].isoformat() if record["created_at"] else None
         
         return {
             "success": True,
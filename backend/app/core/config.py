@@ -11,6 +11,7 @@ class Settings(BaseSettings):
     BASE_DIR: Path = Path(__file__).resolve().parents[2]
     DATA_DIR: Path = BASE_DIR / "data"
     PARQUET_CACHE_DIR: Path = DATA_DIR / "parquet_cache"
+    ARROW_CACHE_DIR: Path = DATA_DIR / "arrow_cache"
     DUCKDB_PATH: Path = DATA_DIR / "lablens.duckdb"
     
     # API
@@ -37,7 +38,43 @@ class Settings(BaseSettings):
     model: str | None = None  # Support legacy env var name
 
     # ========== Téléversement ==========
-    MAX_FILE_SIZE: int = 50_000_000  # 50 MB par défaut
+    MAX_FILE_SIZE: int = 10_000_000_000  # 10 GB (upload copié en streaming sur disque)
+    UPLOAD_CHUNK_SIZE: int = 1_048_576  # Taille des blocs lus depuis la requête (1 MB)
+    UPLOAD_SPOOL_MAX_SIZE: int = 16_777_216  # Au-delà de 16 MB, le fichier temporaire bascule sur disque
+
+    # ========== Ingestion ==========
+    INGEST_CHUNK_ROWS: int = 200_000  # Lignes par lot (parsing, validation, écriture)
+    ENCODING_SNIFF_BYTES: int = 1_048_576  # Échantillon utilisé pour détecter l'encodage des CSV
+    INGEST_READER: str = "arrow"  # Lecteur CSV: "arrow" (pyarrow.csv multi-thread) ou "pandas" (read_csv)
+    INGEST_QUEUE_DEPTH: int = 2  # Lots en attente entre deux étages du pipeline (lecture → validation → écriture)
+    VALIDATOR_BACKEND: str = "arrow"  # "arrow" (ColumnarValidator) ou "pandas" (DataValidator)
+
+    # ========== Stockage ==========
+    # "table": lignes copiées dans la table results (et dans le cache Parquet)
+    # "parquet": le cache Parquet est la source de vérité, results est une vue DuckDB dessus
+    STORAGE_MODE: str = "table"
+
+    # ========== Statistiques ==========
+    STATS_BACKEND: str = "sql"  # "sql" (SqlStatsEngine, agrégation DuckDB) ou "pandas" (StatsEngine)
+    STATS_SAMPLE_SIZE: int = 100_000  # Lignes échantillonnées en mode accuracy="approximate" (fichiers plus grands)
+    STATS_EXACT_CARDINALITY: int = 10_000  # Mode approximate: distributions exactes jusqu'à ce nombre de valeurs distinctes
+    STATS_HLL_PRECISION: int = 14  # Mode approximate: registres HyperLogLog des cardinalités, 2^p (erreur ~1.04/sqrt(2^p))
+    SKETCH_RELATIVE_ACCURACY: float = 0.01  # Erreur relative des quantiles des esquisses (fusion multi-fichiers)
+    SKETCH_TOP_K: int = 100  # Valeurs les plus fréquentes conservées par colonne catégorielle dans une esquisse
+    SKETCH_HLL_PRECISION: int = 12  # Registres HyperLogLog des colonnes catégorielles d'une esquisse: 2^p (erreur ~1.04/sqrt(2^p))
+    ROLLUP_AGE_BAND_YEARS: int = 5  # Largeur des tranches d'âge du cube journalier (séries temporelles)
+    ROLLUP_HLL_PRECISION: int = 14  # Registres HyperLogLog des patients du cube: 2^p (erreur ~1.04/sqrt(2^p))
+
+    # ========== Cache Parquet ==========
+    PARQUET_COMPRESSION: str = "zstd"
+    PARQUET_ROW_GROUP_SIZE: int = 122_880  # Lignes par row group (statistiques min/max par groupe)
+    PARQUET_PARTITION_BY: str = ""  # "" (un fichier), "month" ou "nombre2" (partitionnement hive)
+    INGEST_WORKERS: int = 2  # Workers des jobs d'ingestion en arrière-plan
+    INGEST_JOB_TTL_SECONDS: int = 3600  # Durée de conservation de l'état d'un job terminé
+
+    # ========== Cache mémoire des analyses ==========
+    TABLE_CACHE_MAX_BYTES: int = 536_870_912  # Budget des tables Arrow gardées en mémoire (512 MB, 0 = désactivé)
+    ARROW_CACHE_ENABLED: bool = True  # Tables Arrow IPC projetées en mémoire (partagées entre workers)
 
     class Config:
         env_file = ".env"
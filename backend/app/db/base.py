@@ -6,6 +6,9 @@ from sqlmodel import SQLModel, Session, create_engine
 from pathlib import Path
 
 from ..core.config import settings
+from .id_allocator import ensure_results_id_sequence
+from .models.schema_migration import SchemaMigration
+from .results_view import parquet_storage_enabled, results_is_table, refresh_results_view
 
 # Créer le répertoire de la base de données si nécessaire
 settings.DUCKDB_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -28,15 +31,32 @@ def init_db():
     # Importer tous les modèles pour que SQLModel les enregistre
     from .models import Result, File, View
     
+    # Mode "parquet": results est une vue sur le cache Parquet, pas une table
+    parquet_mode = parquet_storage_enabled()
+    tables = None
+    
+    if parquet_mode:
+        with engine.begin() as connection:
+            if results_is_table(connection):
+                raise RuntimeError(
+                    "STORAGE_MODE=parquet impossible: la base contient déjà une table results (mode table)"
+                )
+        tables = [table for table in SQLModel.metadata.sorted_tables if table.name != 'results']
+    else:
+        # Séquence des IDs de results, avant create_all: sur une base existante
+        # elle doit démarrer après le plus grand id déjà présent
+        with engine.begin() as connection:
+            ensure_results_id_sequence(connection)
+    
     # Créer toutes les tables (checkfirst=True par défaut, crée seulement si n'existent pas)
-    SQLModel.metadata.create_all(engine, checkfirst=True)
+    SQLModel.metadata.create_all(engine, tables=tables, checkfirst=True)
     
     # Vérifier explicitement que toutes les tables existent
     from sqlalchemy import inspect
     inspector = inspect(engine)
     existing_tables = inspector.get_table_names()
     
-    required_tables = ['results', 'files', 'views']
+    required_tables = ['files', 'views'] if parquet_mode else ['results', 'files', 'views']
     missing_tables = [t for t in required_tables if t not in existing_tables]
     
     if missing_tables:
@@ -51,9 +71,75 @@ def init_db():
                 Result.__table__.create(engine, checkfirst=True)
         print(f"✅ Tables manquantes créées: {missing_tables}")
     
+    # Ajouter les colonnes introduites après la création des tables
+    _migrate_columns(parquet_mode)
+    
+    if parquet_mode:
+        try:
+            refresh_results_view(engine)
+            print("✅ Vue results créée sur le cache Parquet")
+        except Exception as e:
+            # Caches écrits avant les colonnes textores: la vue est recréée par
+            # backfill_textores_columns au démarrage (voir main.py)
+            print(f"⚠️ Vue results non créée: {e}")
+    
     print("✅ Tables créées avec succès")
 
 
+def _migrate_columns(parquet_mode: bool):
+    """
+    create_all ne modifie pas les tables existantes: ajouter les colonnes et
+    index manquants
+    """
+    migrations = [
+        "ALTER TABLE files ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)",
+        "ALTER TABLE files ADD COLUMN IF NOT EXISTS data_version INTEGER DEFAULT 1",
+        "ALTER TABLE file_profiles ADD COLUMN IF NOT EXISTS sketches TEXT",
+        "ALTER TABLE file_profiles ADD COLUMN IF NOT EXISTS rollup_layout VARCHAR(50)",
+        "ALTER TABLE fact_results ADD COLUMN IF NOT EXISTS textores_num DOUBLE",
+        "ALTER TABLE fact_results ADD COLUMN IF NOT EXISTS textores_cmp VARCHAR(2)",
+        "ALTER TABLE fact_results ADD COLUMN IF NOT EXISTS textores_kind VARCHAR(10)",
+        # Libellés des dimensions uniques (cible de ON CONFLICT DO NOTHING)
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_dim_tests_nombre ON dim_tests (nombre)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_dim_services_nombre2 ON dim_services (nombre2)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_dim_patients_numorden ON dim_patients (numorden)",
+    ]
+    if not parquet_mode:
+        migrations += [
+            "ALTER TABLE results ADD COLUMN IF NOT EXISTS textores_num DOUBLE",
+            "ALTER TABLE results ADD COLUMN IF NOT EXISTS textores_cmp VARCHAR(2)",
+            "ALTER TABLE results ADD COLUMN IF NOT EXISTS textores_kind VARCHAR(10)",
+        ]
+    with engine.begin() as connection:
+        for statement in migrations:
+            connection.exec_driver_sql(statement)
+
+
+def migration_applied(name: str) -> bool:
+    """
+    La migration de données ponctuelle name a-t-elle déjà été exécutée ?
+    """
+    with Session(engine) as session:
+        return session.get(SchemaMigration, name) is not None
+
+
+def record_migration(name: str):
+    """
+    Enregistrer l'exécution d'une migration de données ponctuelle
+    """
+    with Session(engine) as session:
+        session.merge(SchemaMigration(name=name))
+        session.commit()
+
+
+def get_duckdb_connection(session: Session):
+    """
+    Retourner la connexion DuckDB native sous-jacente à une session SQLModel
+    Permet d'utiliser les API columnar de DuckDB (register, arrow) dans la même transaction
+    """
+    return session.connection().connection.dbapi_connection
+
+
 def get_session():
     """
     Dependency pour FastAPI - retourne une session de base de données
@@ -0,0 +1,32 @@
+# backend/app/db/id_allocator.py
+"""
+Allocation des identifiants de la table results par séquence DuckDB
+"""
+from sqlalchemy import Sequence
+from sqlalchemy.engine import Connection
+
+# Séquence partagée par toutes les ingestions: nextval() est atomique, plusieurs
+# jobs peuvent insérer en parallèle sans collision ni SELECT max(id)
+RESULTS_ID_SEQUENCE = Sequence("results_id_seq")
+
+# Expression SQL à utiliser dans les INSERT ... SELECT en masse
+RESULTS_NEXT_ID_SQL = f"nextval('{RESULTS_ID_SEQUENCE.name}')"
+
+
+def ensure_results_id_sequence(connection: Connection):
+    """
+    Créer la séquence si elle n'existe pas encore
+    Sur une base existante, elle démarre après le plus grand id déjà présent
+    (seul parcours de la table, une fois, à la création de la séquence)
+    """
+    dialect = connection.dialect
+    if dialect.has_sequence(connection, RESULTS_ID_SEQUENCE.name):
+        return
+
+    start = 1
+    if dialect.has_table(connection, "results"):
+        max_id = connection.exec_driver_sql("SELECT max(id) FROM results").scalar()
+        start = (max_id or 0) + 1
+
+    connection.exec_driver_sql(f"CREATE SEQUENCE {RESULTS_ID_SEQUENCE.name} START {start}")
+    print(f"✅ Séquence {RESULTS_ID_SEQUENCE.name} créée (départ: {start})")
@@ -3,8 +3,16 @@
 Modèles SQLModel pour LabLens
 """
 from .result import Result
-from .file import File
+from .file import File, FILE_STATUS_DELETED
 from .view import View
+from .dimensions import LabTest, Service, Patient
+from .result_fact import ResultFact
+from .file_profile import FileProfile
+from .daily_rollup import DailyRollup, DailyRollupRegister
+from .schema_migration import SchemaMigration
 
-__all__ = ["Result", "File", "View"]
+__all__ = [
+    "Result", "File", "View", "LabTest", "Service", "Patient", "ResultFact", "FileProfile",
+    "DailyRollup", "DailyRollupRegister", "SchemaMigration", "FILE_STATUS_DELETED"
+]
 
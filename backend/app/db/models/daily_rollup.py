@@ -0,0 +1,47 @@
+# backend/app/db/models/daily_rollup.py
+from sqlmodel import SQLModel, Field, Column
+from datetime import date as date_type
+from sqlalchemy import Date
+
+
+class DailyRollup(SQLModel, table=True):
+    """
+    Modèle SQLModel pour la table daily_rollups
+    Cube journalier d'un fichier (voir services/daily_rollups.py): une ligne
+    par jour × service × test × sexe × tranche d'âge
+    """
+    __tablename__ = "daily_rollups"
+
+    file_id: str = Field(max_length=100)
+    date: date_type = Field(sa_column=Column(Date))
+    nombre2: str = Field(max_length=200)
+    nombre: str = Field(max_length=200)
+    sexo: str = Field(max_length=10)
+    age_band: int  # borne basse de la tranche (ROLLUP_AGE_BAND_YEARS ans)
+    tests: int  # nombre de résultats
+    edad_sum: int  # somme des âges (moyenne d'une période = somme / tests)
+
+    # Clé primaire côté ORM uniquement, comme fact_results
+    __mapper_args__ = {"primary_key": ["file_id", "date", "nombre2", "nombre", "sexo", "age_band"]}
+
+
+class DailyRollupRegister(SQLModel, table=True):
+    """
+    Modèle SQLModel pour la table daily_rollup_registers
+    Esquisse HyperLogLog des patients (numorden) de chaque cellule du cube,
+    stockée creuse: un registre non vide par ligne
+    """
+    __tablename__ = "daily_rollup_registers"
+
+    file_id: str = Field(max_length=100)
+    date: date_type = Field(sa_column=Column(Date))
+    nombre2: str = Field(max_length=200)
+    nombre: str = Field(max_length=200)
+    sexo: str = Field(max_length=10)
+    age_band: int
+    bucket: int  # registre: bits de poids faible du hash de numorden
+    rank: int  # position du premier bit à 1 du reste du hash (maximum de la cellule)
+
+    __mapper_args__ = {
+        "primary_key": ["file_id", "date", "nombre2", "nombre", "sexo", "age_band", "bucket"]
+    }
@@ -0,0 +1,57 @@
+# backend/app/db/models/dimensions.py
+from sqlmodel import SQLModel, Field, Column
+from typing import Optional
+from sqlalchemy import Index, Integer, Sequence
+
+# Identifiants des dimensions: petits entiers alloués par séquence
+# Libellés uniques (index UNIQUE, créé par migration sur une base existante):
+# l'encodeur de services/dimensions.py insère avec ON CONFLICT DO NOTHING
+TEST_ID_SEQUENCE = Sequence("dim_tests_id_seq")
+SERVICE_ID_SEQUENCE = Sequence("dim_services_id_seq")
+PATIENT_ID_SEQUENCE = Sequence("dim_patients_id_seq")
+
+
+def _id_column(sequence: Sequence) -> Column:
+    return Column(Integer, sequence, primary_key=True, server_default=sequence.next_value())
+
+
+class LabTest(SQLModel, table=True):
+    """
+    Dictionnaire des tests (nombre) -> test_id
+    """
+    __tablename__ = "dim_tests"
+    
+    test_id: Optional[int] = Field(default=None, sa_column=_id_column(TEST_ID_SEQUENCE))
+    nombre: str = Field(max_length=200)
+
+    __table_args__ = (
+        Index("uq_dim_tests_nombre", "nombre", unique=True),
+    )
+
+
+class Service(SQLModel, table=True):
+    """
+    Dictionnaire des services (nombre2) -> service_id
+    """
+    __tablename__ = "dim_services"
+    
+    service_id: Optional[int] = Field(default=None, sa_column=_id_column(SERVICE_ID_SEQUENCE))
+    nombre2: str = Field(max_length=200)
+
+    __table_args__ = (
+        Index("uq_dim_services_nombre2", "nombre2", unique=True),
+    )
+
+
+class Patient(SQLModel, table=True):
+    """
+    Dictionnaire des patients (numorden) -> patient_id
+    """
+    __tablename__ = "dim_patients"
+    
+    patient_id: Optional[int] = Field(default=None, sa_column=_id_column(PATIENT_ID_SEQUENCE))
+    numorden: str = Field(max_length=100)
+
+    __table_args__ = (
+        Index("uq_dim_patients_numorden", "numorden", unique=True),
+    )
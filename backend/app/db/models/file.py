@@ -3,6 +3,10 @@ from sqlmodel import SQLModel, Field, Index
 from typing import Optional
 from datetime import datetime
 
+# Statut d'un fichier supprimé dont les données sont en cours de purge:
+# il est exclu de toutes les requêtes dès la suppression
+FILE_STATUS_DELETED = "deleted"
+
 
 class File(SQLModel, table=True):
     """
@@ -15,7 +19,9 @@ class File(SQLModel, table=True):
     original_filename: str = Field(max_length=500)
     row_count: int
     upload_timestamp: datetime = Field(default_factory=datetime.utcnow)
-    status: str = Field(default="completed", max_length=50)
+    status: str = Field(default="completed", max_length=50)  # completed | deleted
+    content_hash: Optional[str] = Field(default=None, max_length=64, index=True)  # SHA-256 du fichier téléversé
+    data_version: int = Field(default=1)  # Incrémentée quand les données du fichier sont réécrites
     
     __table_args__ = (
         Index("idx_file_id", "file_id"),
@@ -0,0 +1,25 @@
+# backend/app/db/models/file_profile.py
+from sqlmodel import SQLModel, Field, Column
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import Text
+
+
+class FileProfile(SQLModel, table=True):
+    """
+    Modèle SQLModel pour la table file_profiles
+    Statistiques d'un fichier calculées une fois après l'ingestion
+    (voir services/file_profiles.py), valables pour une version de ses données
+    """
+    __tablename__ = "file_profiles"
+    
+    file_id: str = Field(primary_key=True, max_length=100)
+    data_version: int  # files.data_version au moment du calcul
+    total_rows: int
+    summary: str = Field(sa_column=Column(Text))  # JSON: résumé de toutes les colonnes de SUMMARY_COLUMNS
+    column_stats: str = Field(sa_column=Column(Text))  # JSON: {colonne: statistiques détaillées}
+    # JSON: esquisses fusionnables du fichier et de chaque service (voir services/stats_sketches.py)
+    sketches: Optional[str] = Field(default=None, sa_column=Column(Text))
+    # Paramètres du cube journalier à son calcul (voir services/daily_rollups.py), None: cube non calculé
+    rollup_layout: Optional[str] = Field(default=None, max_length=50)
+    computed_at: datetime = Field(default_factory=datetime.utcnow)
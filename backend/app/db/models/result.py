@@ -2,7 +2,9 @@
 from sqlmodel import SQLModel, Field, Index, Column
 from typing import Optional
 from datetime import date as date_type, datetime
-from sqlalchemy import Date
+from sqlalchemy import Date, BigInteger, Double
+
+from ..id_allocator import RESULTS_ID_SEQUENCE
 
 
 class Result(SQLModel, table=True):
@@ -12,23 +14,37 @@ class Result(SQLModel, table=True):
     """
     __tablename__ = "results"
     
-    id: Optional[int] = Field(default=None, primary_key=True)
+    # Identifiant alloué par la séquence results_id_seq (voir db/id_allocator.py)
+    id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(
+            BigInteger,
+            RESULTS_ID_SEQUENCE,
+            primary_key=True,
+            server_default=RESULTS_ID_SEQUENCE.next_value()
+        )
+    )
     file_id: str = Field(index=True, max_length=100)
     numorden: str = Field(index=True, max_length=100)
     sexo: str = Field(max_length=10)
     edad: int
     nombre: str = Field(index=True, max_length=200)
     textores: str = Field(max_length=500)
+    # Valeur typée extraite de textores à l'ingestion (voir services/textores_parser.py)
+    textores_num: Optional[float] = Field(default=None, sa_column=Column(Double))
+    textores_cmp: Optional[str] = Field(default=None, max_length=2)
+    textores_kind: Optional[str] = Field(default=None, max_length=10)
     nombre2: str = Field(index=True, max_length=200)
     date: date_type = Field(sa_column=Column(Date, index=True))
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
     # Index composites pour améliorer les performances
+    # (les noms d'index sont globaux dans DuckDB: préfixés par la table)
     __table_args__ = (
-        Index("idx_numorden", "numorden"),
-        Index("idx_nombre", "nombre"),
-        Index("idx_nombre2", "nombre2"),
-        Index("idx_date", "date"),
-        Index("idx_file_id", "file_id"),
+        Index("idx_results_numorden", "numorden"),
+        Index("idx_results_nombre", "nombre"),
+        Index("idx_results_nombre2", "nombre2"),
+        Index("idx_results_date", "date"),
+        Index("idx_results_file_id", "file_id"),
     )
 
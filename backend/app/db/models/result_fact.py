@@ -0,0 +1,30 @@
+# backend/app/db/models/result_fact.py
+from sqlmodel import SQLModel, Field, Column
+from typing import Optional
+from datetime import date as date_type
+from sqlalchemy import Date, Double
+
+
+class ResultFact(SQLModel, table=True):
+    """
+    Modèle SQLModel pour la table fact_results
+    Un résultat de laboratoire codé par entiers (voir dimensions.py):
+    les moteurs d'analyse groupent et joignent sur ces codes plutôt que sur les chaînes
+    """
+    __tablename__ = "fact_results"
+    
+    file_id: str = Field(max_length=100)
+    row_number: int  # position de la ligne dans le fichier ingéré (après dédoublonnage)
+    patient_id: int
+    test_id: int
+    service_id: int
+    sexo: str = Field(max_length=10)
+    edad: int
+    textores_num: Optional[float] = Field(default=None, sa_column=Column(Double))
+    textores_cmp: Optional[str] = Field(default=None, max_length=2)
+    textores_kind: Optional[str] = Field(default=None, max_length=10)
+    date: date_type = Field(sa_column=Column(Date))
+    
+    # Clé primaire côté ORM uniquement: pas d'index ART à maintenir à l'ingestion,
+    # les lignes d'un fichier sont contiguës et les zonemaps suffisent pour file_id
+    __mapper_args__ = {"primary_key": ["file_id", "row_number"]}
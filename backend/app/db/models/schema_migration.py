@@ -0,0 +1,15 @@
+# backend/app/db/models/schema_migration.py
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+
+class SchemaMigration(SQLModel, table=True):
+    """
+    Modèle SQLModel pour la table schema_migrations
+    Migrations de données ponctuelles déjà exécutées (une ligne par migration):
+    le démarrage ne les relance pas
+    """
+    __tablename__ = "schema_migrations"
+
+    name: str = Field(primary_key=True, max_length=100)
+    applied_at: datetime = Field(default_factory=datetime.utcnow)
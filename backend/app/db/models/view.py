@@ -22,6 +22,6 @@ class View(SQLModel, table=True):
     
     __table_args__ = (
         Index("idx_view_id", "view_id"),
-        Index("idx_file_id", "file_id"),
+        Index("idx_views_file_id", "file_id"),
     )
 
@@ -0,0 +1,107 @@
+# backend/app/db/results_view.py
+"""
+Mode de stockage "parquet": la table results est remplacée par une vue DuckDB
+sur les fichiers du cache Parquet (source de vérité unique, aucune copie en base)
+"""
+import threading
+from sqlalchemy.engine import Connection, Engine
+
+from ..core.config import settings
+from ..services.parquet_cache import cache_path
+
+# Les reconstructions concurrentes de la vue (fin d'ingestion, suppression) sont sérialisées
+_refresh_lock = threading.Lock()
+
+# Colonnes de la vue, identiques à celles de la table results
+# - id: stable par fichier physique (empreinte du chemin + numéro de ligne)
+# - file_id: nom du fichier de cache ({file_id}.parquet, éventuellement un répertoire hive)
+# - valeurs manquantes remplacées comme le fait BulkLoader en mode table
+RESULTS_VIEW_COLUMNS = """
+    CAST((hash(p.filename) % 2147483648) * 4294967296 + p.file_row_number AS BIGINT) AS id,
+    regexp_extract(p.filename, '([^/\\\\]+)\\.parquet', 1) AS file_id,
+    COALESCE(p.numorden, '') AS numorden,
+    COALESCE(p.sexo, '') AS sexo,
+    CAST(COALESCE(p.edad, 0) AS INTEGER) AS edad,
+    COALESCE(p.nombre, '') AS nombre,
+    COALESCE(p.textores, '') AS textores,
+    p.textores_num,
+    p.textores_cmp,
+    p.textores_kind,
+    COALESCE(p.nombre2, '') AS nombre2,
+    COALESCE(CAST(p."Date" AS DATE), current_date) AS date,
+    f.upload_timestamp AS created_at
+"""
+
+EMPTY_RESULTS_VIEW = """
+    SELECT
+        CAST(NULL AS BIGINT) AS id,
+        CAST(NULL AS VARCHAR) AS file_id,
+        CAST(NULL AS VARCHAR) AS numorden,
+        CAST(NULL AS VARCHAR) AS sexo,
+        CAST(NULL AS INTEGER) AS edad,
+        CAST(NULL AS VARCHAR) AS nombre,
+        CAST(NULL AS VARCHAR) AS textores,
+        CAST(NULL AS DOUBLE) AS textores_num,
+        CAST(NULL AS VARCHAR) AS textores_cmp,
+        CAST(NULL AS VARCHAR) AS textores_kind,
+        CAST(NULL AS VARCHAR) AS nombre2,
+        CAST(NULL AS DATE) AS date,
+        CAST(NULL AS TIMESTAMP) AS created_at
+    WHERE false
+"""
+
+
+def parquet_storage_enabled() -> bool:
+    return settings.STORAGE_MODE == "parquet"
+
+
+def results_is_table(connection: Connection) -> bool:
+    row = connection.exec_driver_sql(
+        "SELECT table_type FROM information_schema.tables WHERE table_name = 'results'"
+    ).fetchone()
+    return row is not None and row[0] == 'BASE TABLE'
+
+
+def refresh_results_view(engine: Engine):
+    """
+    (Re)créer la vue results sur les fichiers enregistrés dans files
+    A appeler après chaque ajout ou suppression de fichier (validé)
+    La vue est remplacée dans sa propre transaction, sous verrou: deux
+    remplacements concurrents entreraient en conflit dans le catalogue DuckDB
+    """
+    with _refresh_lock, engine.begin() as connection:
+        file_ids = [
+            row[0] for row in connection.exec_driver_sql(
+                "SELECT file_id FROM files WHERE status = 'completed' ORDER BY upload_timestamp"
+            ).fetchall()
+        ]
+
+        sources = []
+        for file_id in file_ids:
+            path = cache_path(file_id)
+            if path.is_dir():
+                sources.append(_sql_literal(f"{path}/**/*.parquet"))
+            elif path.exists():
+                sources.append(_sql_literal(str(path)))
+
+        if sources:
+            query = f"""
+                SELECT {RESULTS_VIEW_COLUMNS}
+                FROM read_parquet(
+                    [{', '.join(sources)}],
+                    filename = true,
+                    file_row_number = true,
+                    hive_partitioning = true,
+                    union_by_name = true
+                ) AS p
+                LEFT JOIN files AS f
+                    ON f.file_id = regexp_extract(p.filename, '([^/\\\\]+)\\.parquet', 1)
+            """
+        else:
+            query = EMPTY_RESULTS_VIEW
+
+        connection.exec_driver_sql(f"CREATE OR REPLACE VIEW results AS {query}")
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
@@ -5,8 +5,15 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 
 from .api import ingest, subset, stats, panels, repeats, coorder, views, llm
-from .db.base import init_db
+from .db.base import engine, init_db
 from .core.config import settings
+from .services.ingest_jobs import ingest_jobs
+from .services.file_deletion import file_deletions
+from .services.dimensions import backfill_fact_tables
+from .services.file_profiles import file_profiles
+from .services.textores_parser import backfill_textores_columns
+from .services.arrow_cache import arrow_cache
+from .services.table_cache import table_cache
 
 
 @asynccontextmanager
@@ -27,6 +34,14 @@ async def lifespan(app: FastAPI):
     try:
         init_db()
         print("✅ Base de données initialisée et prête")
+        # Colonnes textores des fichiers ingérés avant leur ajout (migration unique)
+        backfill_textores_columns(engine)
+        # Coder les fichiers ingérés avant l'ajout de fact_results
+        backfill_fact_tables()
+        # Reprendre les purges de fichiers supprimés non terminées
+        file_deletions.resume()
+        # Profils statistiques manquants ou périmés
+        file_profiles.resume()
     except Exception as e:
         print(f"⚠️ Erreur base de données: {e}")
     
@@ -37,6 +52,11 @@ async def lifespan(app: FastAPI):
     # ========== SHUTDOWN ==========
     print("\n🛑 Arrêt de LabLens API...")
     
+    # Arrêter le pool des jobs d'ingestion (les jobs en attente sont annulés)
+    ingest_jobs.shutdown()
+    file_deletions.shutdown()
+    file_profiles.shutdown()
+    
     # Fermer proprement la connexion à la base de données
     try:
         # SQLModel/SQLAlchemy gère automatiquement la fermeture
@@ -94,6 +114,8 @@ async def root():
         "endpoints": {
             # Ingestion
             "upload": "POST /api/ingest",
+            "upload_async": "POST /api/ingest/jobs",
+            "ingest_job": "GET /api/ingest/jobs/{job_id}",
             "get_file": "GET /api/files/{file_id}",
             "get_file_data": "GET /api/files/{file_id}/data",
             "list_files": "GET /api/files",
@@ -107,7 +129,9 @@ async def root():
             
             # Statistics
             "stats_summary": "POST /api/stats/summary",
+            "stats_merged": "POST /api/stats/merged",
             "column_stats": "GET /api/stats/{file_id}/column/{column_name}",
+            "column_catalog": "GET /api/stats/columns",
             "missing_summary": "GET /api/stats/{file_id}/missing",
             
             # Panels
@@ -183,6 +207,18 @@ async def health_check():
         }
         health_status["status"] = "degraded"
     
+    # Cache mémoire des tables Arrow (analyses)
+    health_status["components"]["table_cache"] = table_cache.stats()
+
+    # Cache Arrow IPC (tables projetées en mémoire, partagées entre workers)
+    try:
+        health_status["components"]["arrow_cache"] = arrow_cache.stats()
+    except Exception as e:
+        health_status["components"]["arrow_cache"] = {
+            "status": "error",
+            "error": str(e)
+        }
+    
     # Vérifier le cache Parquet
     try:
         parquet_files = list(settings.PARQUET_CACHE_DIR.glob("*.parquet"))
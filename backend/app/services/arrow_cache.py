@@ -0,0 +1,78 @@
+# ============================================================
+# backend/app/services/arrow_cache.py
+# ============================================================
+
+import os
+import uuid
+import pyarrow as pa
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from ..core.config import settings
+
+
+class ArrowIpcCache:
+    """
+    Cache disque des tables Arrow d'un fichier (Arrow IPC / Feather v2, non compressé)
+    Les tables sont ouvertes par memory mapping: les workers uvicorn d'une même
+    machine partagent les pages du fichier via le cache de pages du système,
+    et un chargement à froid ne relit plus DuckDB après le premier
+    - un fichier par (source, file_id): ARROW_CACHE_DIR/<file_id>.<source>.arrow
+    - écrit au premier chargement, publié atomiquement (fichier .tmp puis os.replace)
+    - supprimé avec le fichier (purge) ou quand ses données sont recodées
+    """
+
+    def __init__(self, directory: Path, enabled: bool):
+        self.directory = directory
+        self.enabled = enabled
+
+    def path(self, source: str, file_id: str) -> Path:
+        return self.directory / f"{file_id}.{source}.arrow"
+
+    def load(self, source: str, file_id: str, loader: Callable[[], pa.Table]) -> pa.Table:
+        """
+        Table projetée en mémoire depuis le cache, écrite par loader() si absente
+        """
+        if not self.enabled:
+            return loader()
+
+        path = self.path(source, file_id)
+        if not path.exists():
+            self._write(path, loader())
+        # Les buffers de la table restent valides après la fermeture du fichier
+        # (et après sa suppression: la projection est conservée par le système)
+        with pa.memory_map(str(path)) as source_file:
+            return pa.ipc.open_file(source_file).read_all()
+
+    def delete(self, file_id: str, source: Optional[str] = None):
+        """
+        Supprimer les tables d'un fichier (toutes, ou celle d'une source)
+        """
+        pattern = f"{file_id}.{source}.arrow" if source else f"{file_id}.*.arrow"
+        for path in self.directory.glob(pattern):
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        paths = list(self.directory.glob("*.arrow")) if self.directory.exists() else []
+        return {
+            "enabled": self.enabled,
+            "path": str(self.directory),
+            "files_count": len(paths),
+            "size_bytes": sum(path.stat().st_size for path in paths),
+        }
+
+    def _write(self, path: Path, table: pa.Table):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Nom de travail propre à l'écrivain: deux workers peuvent écrire la même table
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with pa.OSFile(str(tmp_path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp_path, path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+
+# Instance unique partagée par les chargements, les ingestions et les suppressions
+arrow_cache = ArrowIpcCache(settings.ARROW_CACHE_DIR, settings.ARROW_CACHE_ENABLED)
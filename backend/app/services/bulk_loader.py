@@ -0,0 +1,106 @@
+# ============================================================
+# backend/app/services/bulk_loader.py
+# ============================================================
+
+import uuid
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Union
+from datetime import date, datetime
+from sqlmodel import Session
+
+from ..db.base import get_duckdb_connection
+from ..db.id_allocator import RESULTS_NEXT_ID_SQL
+from .textores_parser import TEXTORES_COLUMNS, parse_textores
+
+
+# Colonnes texte de la table results (les valeurs manquantes deviennent '')
+STRING_COLUMNS = ['numorden', 'sexo', 'nombre', 'textores', 'nombre2']
+
+
+class BulkLoader:
+    """
+    Service de chargement en masse des résultats dans la table results
+    Remplace la création d'un objet Result par ligne par un INSERT columnar unique
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def prepare_table(self, data: Union[pd.DataFrame, pa.Table]) -> pa.Table:
+        """
+        Convertir les données nettoyées en table Arrow au schéma de results
+        Toutes les coercitions (edad, Date, valeurs manquantes) sont vectorisées
+        """
+        if isinstance(data, pd.DataFrame):
+            data = self._from_pandas(data)
+
+        # Âge manquant -> 0
+        edad = pc.cast(pc.fill_null(data['edad'], 0), pa.int32())
+
+        # Date manquante -> date du jour
+        date_column = 'Date' if 'Date' in data.column_names else 'date'
+        dates = pc.cast(data[date_column], pa.date32(), safe=False)
+        dates = pc.fill_null(dates, pa.scalar(date.today(), pa.date32()))
+
+        columns = {}
+        for col in STRING_COLUMNS:
+            columns[col] = pc.fill_null(pc.cast(data[col], pa.string()), '')
+        columns["edad"] = edad
+        columns["date"] = dates
+
+        # Colonnes dérivées de textores: reprises du lot si l'ingestion les a déjà calculées
+        if all(name in data.column_names for name in TEXTORES_COLUMNS):
+            columns.update({name: data[name] for name in TEXTORES_COLUMNS})
+        else:
+            columns.update(parse_textores(columns['textores']))
+
+        return pa.table(columns)
+
+    @staticmethod
+    def _from_pandas(df: pd.DataFrame) -> pa.Table:
+        # Âge non numérique -> manquant (troncature comme int(float(x)))
+        edad = pd.to_numeric(df['edad'], errors='coerce').astype('float64')
+        edad = pa.array(edad.to_numpy(), mask=edad.isna().to_numpy()).cast(pa.int64(), safe=False)
+
+        date_column = 'Date' if 'Date' in df.columns else 'date'
+        dates = pd.to_datetime(df[date_column], errors='coerce')
+
+        columns = {col: pa.array(df[col], type=pa.string(), from_pandas=True) for col in STRING_COLUMNS}
+        columns['edad'] = edad
+        columns[date_column] = pa.array(dates, type=pa.timestamp('ns'), from_pandas=True)
+        return pa.table(columns)
+
+    def load(self, data: Union[pd.DataFrame, pa.Table], file_id: str) -> int:
+        """
+        Insérer les données (DataFrame ou table Arrow) dans results
+        en une seule requête INSERT ... SELECT
+        Retourne le nombre de lignes insérées
+        """
+        if len(data) == 0:
+            return 0
+
+        table = self.prepare_table(data)
+
+        # Exposer la table Arrow à DuckDB sans copie puis l'insérer en bloc
+        # (IDs tirés de la séquence: pas de SELECT max(id), ingestions parallèles possibles)
+        connection = get_duckdb_connection(self.session)
+        view_name = f"_bulk_results_{uuid.uuid4().hex}"
+        connection.register(view_name, table)
+        try:
+            connection.execute(
+                f"""
+                INSERT INTO results
+                    (id, file_id, numorden, sexo, edad, nombre, textores,
+                     textores_num, textores_cmp, textores_kind, nombre2, date, created_at)
+                SELECT {RESULTS_NEXT_ID_SQL}, ?, numorden, sexo, edad, nombre, textores,
+                       textores_num, textores_cmp, textores_kind, nombre2, date, ?
+                FROM {view_name}
+                """,
+                [file_id, datetime.utcnow()]
+            )
+        finally:
+            connection.unregister(view_name)
+
+        return table.num_rows
@@ -0,0 +1,57 @@
+# ============================================================
+# backend/app/services/column_catalog.py
+# ============================================================
+
+from typing import Any, Dict, List
+from sqlalchemy import Date, DateTime, Float, Integer
+from sqlmodel import Session
+
+from ..db.base import get_duckdb_connection
+from ..db.models import Result
+
+# Types logiques des colonnes de results
+# - numeric: statistiques numériques (moments, quantiles, histogramme)
+# - temporal: dates et horodatages, traités comme catégoriels par les statistiques
+# - categorical: chaînes
+LOGICAL_NUMERIC = "numeric"
+LOGICAL_TEMPORAL = "temporal"
+LOGICAL_CATEGORICAL = "categorical"
+
+
+def _logical_type(column) -> str:
+    if isinstance(column.type, (Integer, Float)):
+        return LOGICAL_NUMERIC
+    if isinstance(column.type, (Date, DateTime)):
+        return LOGICAL_TEMPORAL
+    return LOGICAL_CATEGORICAL
+
+
+# Type logique de chaque colonne de results, dans l'ordre du modèle
+LOGICAL_TYPES = {name: _logical_type(column) for name, column in Result.__table__.columns.items()}
+
+
+def is_column(column: str) -> bool:
+    return column in LOGICAL_TYPES
+
+
+def is_numeric(column: str) -> bool:
+    return LOGICAL_TYPES.get(column) == LOGICAL_NUMERIC
+
+
+def column_catalog(session: Session) -> List[Dict[str, Any]]:
+    """
+    Catalogue des colonnes de results: nom, type logique et type de stockage
+    DuckDB (table en mode "table", vue sur le cache Parquet en mode "parquet")
+    """
+    storage_types = dict(get_duckdb_connection(session).execute(
+        "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = 'results'"
+    ).fetchall())
+    return [
+        {
+            "name": name,
+            "logical_type": logical_type,
+            "storage_type": storage_types.get(name),
+            "nullable": bool(Result.__table__.columns[name].nullable),
+        }
+        for name, logical_type in LOGICAL_TYPES.items()
+    ]
@@ -0,0 +1,236 @@
+# ============================================================
+# backend/app/services/columnar_validator.py
+# ============================================================
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import List, Dict, Any, Union
+from datetime import datetime
+
+
+# Valeurs texte considérées comme manquantes dans 'edad'
+EDAD_NULL_TOKENS = ['', 'nan', 'null', 'None', 'N/A', 'n/a', 'NaN', 'NULL']
+
+# Nombre décimal accepté par pd.to_numeric (entier, flottant, notation scientifique)
+NUMERIC_PATTERN = r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$'
+
+# Date au format dd/mm/yyyy
+DATE_PATTERN = r'^(?P<day>\d{1,2})/(?P<month>\d{1,2})/(?P<year>\d{4})$'
+
+VALID_SEXO = ['M', 'F', 'H', 'm', 'f', 'h']
+
+STRING_COLUMNS = ['numorden', 'sexo', 'nombre', 'textores', 'nombre2']
+
+
+class ColumnarValidator:
+    """
+    Validateur columnar (Arrow compute) équivalent à DataValidator
+    Chaque colonne requise est vérifiée et convertie en une seule passe de
+    kernels Arrow, sans copie intermédiaire du DataFrame
+    """
+
+    def __init__(self, data: Union[pd.DataFrame, pa.Table], required_columns: List[str]):
+        if isinstance(data, pd.DataFrame):
+            data = pa.Table.from_pandas(data, preserve_index=False)
+        self.table = data
+        self.required_columns = required_columns
+        self.columns: Dict[str, pa.ChunkedArray] = {}
+        self.errors = []
+        self.warnings = []
+
+    def validate_all(self) -> Dict[str, Any]:
+        """
+        Exécute toutes les validations (même structure de résultat que DataValidator)
+        """
+        self.errors = []
+        self.warnings = []
+        self.columns = {name: self.table.column(name) for name in self.table.column_names}
+
+        # 1. Vérifier les colonnes requises
+        self._validate_columns()
+
+        if not self.errors:
+            for name in STRING_COLUMNS:
+                self.columns[name] = self._as_string(self.columns[name])
+
+            # 2. Valider et convertir les colonnes
+            self._validate_edad()
+            self._validate_dates()
+            self._validate_sexo()
+            self._validate_numorden()
+
+        return {
+            'valid': len(self.errors) == 0,
+            'errors': self.errors,
+            'warnings': self.warnings
+        }
+
+    def _validate_columns(self):
+        """
+        Vérifie que toutes les colonnes requises sont présentes
+        """
+        missing_columns = set(self.required_columns) - set(self.columns)
+
+        if missing_columns:
+            self.errors.append({
+                'column': ', '.join(missing_columns),
+                'message': f"Colonnes manquantes: {', '.join(missing_columns)}"
+            })
+
+        extra_columns = set(self.columns) - set(self.required_columns)
+        if extra_columns:
+            self.warnings.append({
+                'message': f"Colonnes supplémentaires détectées (seront ignorées): {', '.join(extra_columns)}"
+            })
+
+    def _validate_edad(self):
+        """
+        Valide 'edad' et la convertit en int64 nullable
+        """
+        try:
+            original = self._as_string(self.columns['edad'])
+            trimmed = pc.utf8_trim_whitespace(original)
+
+            # Valeurs manquantes: null ou jeton texte équivalent
+            is_missing = pc.or_(pc.is_null(trimmed), pc.is_in(trimmed, value_set=pa.array(EDAD_NULL_TOKENS)))
+            is_numeric = pc.fill_null(pc.match_substring_regex(trimmed, NUMERIC_PATTERN), False)
+
+            invalid_mask = pc.and_(pc.invert(is_missing), pc.invert(is_numeric))
+            invalid_count = pc.sum(invalid_mask).as_py() or 0
+            if invalid_count > 0:
+                invalid_examples = pc.filter(original, invalid_mask).slice(0, 5).to_pylist()
+                self.errors.append({
+                    'column': 'edad',
+                    'message': f"{invalid_count} valeurs non numériques détectées dans la colonne 'edad'. Exemples: {invalid_examples}"
+                })
+
+            # Conversion numérique des seules valeurs valides (les autres deviennent null)
+            values = pc.cast(pc.if_else(is_numeric, trimmed, pa.scalar(None, pa.string())), pa.float64())
+
+            # Comme astype("Int64"): seules les valeurs entières sont acceptées
+            fractional = pc.sum(pc.not_equal(values, pc.floor(values))).as_py() or 0
+            if fractional > 0:
+                self.errors.append({
+                    'column': 'edad',
+                    'message': f"Erreur lors de la validation de 'edad': {fractional} valeurs non entières"
+                })
+                return
+
+            edad = pc.cast(values, pa.int64())
+            self.columns['edad'] = edad
+
+            if pc.any(pc.less(edad, 0)).as_py():
+                self.errors.append({
+                    'column': 'edad',
+                    'message': "Des valeurs négatives ont été détectées dans 'edad'"
+                })
+
+        except Exception as e:
+            self.errors.append({
+                'column': 'edad',
+                'message': f"Erreur lors de la validation de 'edad': {str(e)}"
+            })
+
+    def _validate_dates(self):
+        """
+        Valide le format des dates (dd/mm/yyyy) et les convertit en timestamp
+        Comme DataValidator, seul le format dd/mm/yyyy est accepté: son second
+        passage (dayfirst) s'applique à des dates déjà converties
+        """
+        try:
+            original = self._as_string(self.columns['Date'])
+
+            parsed = pc.strptime(original, format='%d/%m/%Y', unit='ns', error_is_null=True)
+
+            # strptime normalise les dates impossibles (31/02 → 02/03): on les rejette
+            parts = pc.extract_regex(original, DATE_PATTERN)
+            day = pc.cast(pc.struct_field(parts, 'day'), pa.int64())
+            month = pc.cast(pc.struct_field(parts, 'month'), pa.int64())
+            consistent = pc.and_(pc.equal(pc.day(parsed), day), pc.equal(pc.month(parsed), month))
+            parsed = pc.if_else(pc.fill_null(consistent, False), parsed, pa.scalar(None, pa.timestamp('ns')))
+            self.columns['Date'] = parsed
+
+            null_count = parsed.null_count
+            if null_count > 0:
+                self.errors.append({
+                    'column': 'Date',
+                    'message': f"{null_count} dates invalides détectées. Format attendu: dd/mm/yyyy"
+                })
+
+            now = pa.scalar(datetime.now(), pa.timestamp('ns'))
+            future_count = pc.sum(pc.greater(parsed, now)).as_py() or 0
+            if future_count > 0:
+                self.warnings.append({
+                    'column': 'Date',
+                    'message': f"{future_count} dates futures détectées"
+                })
+
+        except Exception as e:
+            self.errors.append({
+                'column': 'Date',
+                'message': f"Erreur lors de la validation des dates: {str(e)}"
+            })
+
+    def _validate_sexo(self):
+        """
+        Signale les valeurs non standard de 'sexo' (les valeurs manquantes incluses)
+        """
+        sexo = self.columns['sexo']
+        is_valid = pc.fill_null(pc.is_in(sexo, value_set=pa.array(VALID_SEXO)), False)
+        invalid_count = len(sexo) - (pc.sum(is_valid).as_py() or 0)
+        if invalid_count > 0:
+            self.warnings.append({
+                'column': 'sexo',
+                'message': f"{invalid_count} valeurs non standard détectées dans 'sexo'"
+            })
+
+    def _validate_numorden(self):
+        """
+        'numorden' ne doit pas être vide
+        """
+        null_count = self.columns['numorden'].null_count
+        if null_count > 0:
+            self.errors.append({
+                'column': 'numorden',
+                'message': f"{null_count} valeurs manquantes dans 'numorden'"
+            })
+
+    def clean_table(self) -> pa.Table:
+        """
+        Nettoie et transforme les données après validation (table Arrow)
+        """
+        columns = {}
+        for name in self.required_columns:
+            columns[name] = self.columns[name]
+
+        # Normaliser 'sexo' (majuscules, H → M) puis supprimer les espaces
+        sexo = pc.utf8_upper(columns['sexo'])
+        columns['sexo'] = pc.if_else(pc.equal(sexo, 'H'), 'M', sexo)
+
+        for name in STRING_COLUMNS:
+            columns[name] = pc.utf8_trim_whitespace(columns[name])
+
+        table = pa.table(columns)
+
+        # Supprimer les lignes avec des valeurs critiques manquantes
+        keep = pc.and_(pc.is_valid(table['numorden']), pc.is_valid(table['nombre']))
+        if pc.all(keep).as_py() is False:
+            table = table.filter(keep)
+
+        return table
+
+    def clean_data(self) -> pd.DataFrame:
+        """
+        Variante DataFrame de clean_table (compatibilité avec DataValidator)
+        """
+        df = self.clean_table().to_pandas()
+        df['edad'] = df['edad'].astype('Int64')
+        return df
+
+    @staticmethod
+    def _as_string(column: pa.ChunkedArray) -> pa.ChunkedArray:
+        # Une colonne entièrement vide est lue comme type null
+        if column.type != pa.string():
+            return pc.cast(column, pa.string())
+        return column
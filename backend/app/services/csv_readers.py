@@ -0,0 +1,120 @@
+# ============================================================
+# backend/app/services/csv_readers.py
+# ============================================================
+
+import io
+import csv
+import codecs
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from typing import BinaryIO, Iterator, Union
+
+# Taille des blocs lus et parsés en parallèle par le lecteur Arrow
+DEFAULT_BLOCK_SIZE = 16_777_216  # 16 MB
+
+
+class Utf8Recoder(io.RawIOBase):
+    """
+    Flux binaire qui transcode une source vers UTF-8 à la volée
+    Le décodage est strict, comme pd.read_csv: un octet invalide lève
+    UnicodeDecodeError (relevée telle quelle par le lecteur Arrow)
+    """
+
+    def __init__(self, source: BinaryIO, encoding: str, read_size: int = 1_048_576):
+        self.source = source
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.read_size = read_size
+        self.buffer = b""
+        self.eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        while not self.buffer and not self.eof:
+            raw = self.source.read(self.read_size)
+            self.eof = not raw
+            self.buffer = self.decoder.decode(raw, final=self.eof).encode("utf-8")
+
+        size = min(len(target), len(self.buffer))
+        target[:size] = self.buffer[:size]
+        self.buffer = self.buffer[size:]
+        return size
+
+
+def iter_pandas_chunks(source: BinaryIO, encoding: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Lecteur pandas (mono-thread): DataFrames de chaînes Python (dtype=str)
+    """
+    source.seek(0)
+    reader = pd.read_csv(
+        source,
+        encoding=encoding,
+        dtype=str,
+        sep=",",
+        chunksize=chunk_rows
+    )
+    with reader:
+        for chunk in reader:
+            yield chunk
+
+
+def iter_arrow_chunks(source: BinaryIO, encoding: str, chunk_rows: int,
+                      block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[pa.Table]:
+    """
+    Lecteur pyarrow.csv (multi-thread): tables Arrow dont toutes les colonnes
+    sont des chaînes, sans passer par des objets Python
+    Les blocs lus sont regroupés en tables d'environ chunk_rows lignes
+    """
+    # L'en-tête est lu une seule fois sur le flux transcodé: ses noms fixent le
+    # type chaîne de chaque colonne (comme dtype=str côté pandas) et le lecteur
+    # Arrow reprend le même flux juste après
+    source.seek(0)
+    stream = io.BufferedReader(Utf8Recoder(source, encoding))
+    column_names = next(csv.reader([stream.readline().decode("utf-8")]), [])
+    if not column_names:
+        raise ValueError("Fichier CSV vide")
+
+    read_options = pacsv.ReadOptions(block_size=block_size, use_threads=True, column_names=column_names)
+    # Retours à la ligne acceptés dans les valeurs entre guillemets, comme pandas
+    parse_options = pacsv.ParseOptions(newlines_in_values=True)
+    convert_options = pacsv.ConvertOptions(
+        column_types={name: pa.string() for name in column_names},
+        strings_can_be_null=True
+    )
+    reader = pacsv.open_csv(
+        stream,
+        read_options=read_options,
+        parse_options=parse_options,
+        convert_options=convert_options
+    )
+
+    batches = []
+    pending_rows = 0
+    for batch in reader:
+        batches.append(batch)
+        pending_rows += batch.num_rows
+        if pending_rows >= chunk_rows:
+            yield from _split_rows(pa.Table.from_batches(batches, reader.schema), chunk_rows)
+            batches = []
+            pending_rows = 0
+
+    if batches:
+        yield pa.Table.from_batches(batches, reader.schema)
+
+
+def _split_rows(table: pa.Table, chunk_rows: int) -> Iterator[pa.Table]:
+    # Découpage sans copie (slice) en tables d'au plus chunk_rows lignes
+    for start in range(0, table.num_rows, chunk_rows):
+        yield table.slice(start, chunk_rows)
+
+
+def iter_csv_chunks(reader: str, source: BinaryIO, encoding: str,
+                    chunk_rows: int) -> Iterator[Union[pd.DataFrame, pa.Table]]:
+    """
+    Itérer sur les lots d'un CSV avec le lecteur demandé ("arrow" ou "pandas")
+    """
+    if reader == "arrow":
+        return iter_arrow_chunks(source, encoding, chunk_rows)
+    return iter_pandas_chunks(source, encoding, chunk_rows)
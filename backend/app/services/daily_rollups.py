@@ -0,0 +1,142 @@
+# ============================================================
+# backend/app/services/daily_rollups.py
+# ============================================================
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from sqlmodel import Session
+
+from ..core.config import settings
+from ..db.base import get_duckdb_connection
+from .frame_loader import filter_condition
+from .hyperloglog import estimate, register_expressions
+from .textores_parser import TEXTORES_COLUMNS
+
+# Cube journalier d'un fichier, calculé avec son profil (voir file_profiles.py):
+# - daily_rollups: une ligne par jour × service × test × sexe × tranche d'âge,
+#   avec le nombre de résultats et la somme des âges
+# - daily_rollup_registers: registres HyperLogLog non vides des patients de
+#   chaque cellule (max se fusionne: les patients distincts d'une semaine, d'un
+#   mois ou d'un sous-ensemble filtré se déduisent des cellules)
+# Les séries temporelles lisent le cube au lieu des lignes du fichier
+
+# Colonnes filtrables telles quelles dans le cube
+ROLLUP_DIMENSIONS = ('date', 'nombre2', 'nombre', 'sexo')
+
+# Début de période de chaque groupement (semaine: lundi, comme to_period('W'))
+PERIOD_EXPRESSIONS = {
+    "day": "date",
+    "week": "CAST(date_trunc('week', date) AS DATE)",
+    "month": "CAST(date_trunc('month', date) AS DATE)",
+}
+
+
+def rollup_layout() -> str:
+    """
+    Paramètres du cube (tranches d'âge, précision HyperLogLog): un cube calculé
+    avec d'autres paramètres n'est plus utilisable
+    """
+    return f"age{settings.ROLLUP_AGE_BAND_YEARS}-hll{settings.ROLLUP_HLL_PRECISION}"
+
+
+def build_daily_rollup(session: Session, file_id: str) -> int:
+    """
+    (Re)calculer le cube d'un fichier dans la transaction de la session
+    Retourne le nombre de cellules
+    """
+    width = settings.ROLLUP_AGE_BAND_YEARS
+    precision = settings.ROLLUP_HLL_PRECISION
+    cells = f"file_id, date, nombre2, nombre, sexo, CAST(floor(edad / {width}) * {width} AS INTEGER) AS age_band"
+
+    connection = get_duckdb_connection(session)
+    connection.execute("DELETE FROM daily_rollups WHERE file_id = ?", [file_id])
+    connection.execute("DELETE FROM daily_rollup_registers WHERE file_id = ?", [file_id])
+
+    cell_count = connection.execute(
+        f"""
+        INSERT INTO daily_rollups (file_id, date, nombre2, nombre, sexo, age_band, tests, edad_sum)
+        SELECT {cells}, count(*), sum(edad) FROM results WHERE file_id = ? GROUP BY ALL
+        """,
+        [file_id]
+    ).fetchone()[0]
+
+    bucket, rank = register_expressions("h", precision)
+    connection.execute(
+        f"""
+        INSERT INTO daily_rollup_registers (file_id, date, nombre2, nombre, sexo, age_band, bucket, rank)
+        WITH hashed AS (
+            SELECT {cells}, hash(numorden) AS h FROM results WHERE file_id = ?
+        )
+        SELECT file_id, date, nombre2, nombre, sexo, age_band, {bucket} AS bucket, max({rank})
+        FROM hashed GROUP BY ALL
+        """,
+        [file_id]
+    )
+    return cell_count
+
+
+def rollup_timeseries(session: Session, file_id: str, column: str, group_by: str,
+                      filters: List[Mapping[str, Any]]) -> Optional[Dict[str, List[Any]]]:
+    """
+    Série temporelle lue dans le cube (même réponse que le calcul sur les lignes):
+    - numorden: patients distincts par période (estimation HyperLogLog)
+    - edad: âge moyen par période
+    - autres colonnes: nombre de résultats par période
+    Retourne None si un filtre porte sur une colonne absente du cube, ou pour les
+    colonnes dérivées de textores (nulles selon son type: le calcul sur les lignes
+    ne compte que leurs valeurs renseignées, que le cube ne conserve pas)
+    """
+    if column in TEXTORES_COLUMNS:
+        return None
+    conditions = _rollup_conditions(filters)
+    if conditions is None:
+        return None
+    where = " AND ".join(["file_id = ?"] + conditions[0])
+    params = [file_id] + conditions[1]
+    period = f"strftime({PERIOD_EXPRESSIONS[group_by]}, '%Y-%m-%d')"
+
+    connection = get_duckdb_connection(session)
+    if column == 'numorden':
+        rows = connection.execute(
+            f"""
+            WITH registers AS (
+                SELECT {period} AS period, bucket, max(rank) AS rank
+                FROM daily_rollup_registers WHERE {where} GROUP BY ALL
+            )
+            SELECT period, count(*), sum(pow(2.0, -rank)) FROM registers GROUP BY period ORDER BY period
+            """,
+            params
+        ).fetchall()
+        precision = settings.ROLLUP_HLL_PRECISION
+        return {"x": [row[0] for row in rows], "y": [estimate(row[1], row[2], precision) for row in rows]}
+
+    value = "sum(edad_sum) / sum(tests)" if column == 'edad' else "sum(tests)"
+    rows = connection.execute(
+        f"SELECT {period} AS period, {value} FROM daily_rollups WHERE {where} GROUP BY period ORDER BY period",
+        params
+    ).fetchall()
+    return {"x": [row[0] for row in rows], "y": [row[1] for row in rows]}
+
+
+def _rollup_conditions(filters: List[Mapping[str, Any]]) -> Optional[Tuple[List[str], List[Any]]]:
+    # Filtres traduits sur les colonnes du cube; edad seulement si la borne
+    # tombe sur une limite de tranche (edad > v ⇔ edad >= v + 1)
+    width = settings.ROLLUP_AGE_BAND_YEARS
+    conditions: List[str] = []
+    params: List[Any] = []
+    for filter_cond in filters:
+        condition = filter_condition(filter_cond)
+        if condition is None:
+            continue
+        column, operator = filter_cond['column'], filter_cond['operator']
+        if column in ROLLUP_DIMENSIONS:
+            conditions.append(condition[0])
+            params.extend(condition[1])
+            continue
+        if column == 'edad' and operator in ('>', '>=', '<', '<='):
+            bound = condition[1][0] + (1 if operator in ('>', '<=') else 0)
+            if bound % width == 0:
+                conditions.append(f"age_band {'>=' if operator in ('>', '>=') else '<'} ?")
+                params.append(bound)
+                continue
+        return None
+    return conditions, params
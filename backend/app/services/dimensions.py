@@ -0,0 +1,344 @@
+# ============================================================
+# backend/app/services/dimensions.py
+# ============================================================
+
+import uuid
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Dict, List, Optional, Tuple, Union
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from .bulk_loader import BulkLoader
+from .textores_parser import TEXTORES_COLUMNS
+from .parquet_cache import PARQUET_SCHEMA, read_cache
+from .arrow_cache import arrow_cache
+from .table_cache import table_cache
+from ..db.base import engine, get_duckdb_connection
+from ..db.results_view import parquet_storage_enabled
+
+# Les ajouts aux dictionnaires sont sérialisés (deux ingestions peuvent
+# rencontrer le même nouveau test en même temps); l'index UNIQUE des libellés
+# et ON CONFLICT DO NOTHING protègent en plus des écritures hors de ce processus
+_dimension_lock = threading.Lock()
+
+
+class Dimension:
+    """
+    Table de dimension: dictionnaire chaîne -> identifiant entier
+    Les identifiants ne changent jamais une fois attribués
+    """
+
+    def __init__(self, table: str, id_column: str, name_column: str):
+        self.table = table
+        self.id_column = id_column
+        self.name_column = name_column
+
+    def encode(self, native, values: pa.ChunkedArray) -> pa.Array:
+        """
+        Identifiants des valeurs (chaînes sans valeur manquante); les valeurs
+        inconnues sont ajoutées au dictionnaire
+        native: connexion DuckDB d'une transaction ouverte sous _dimension_lock
+        """
+        view_name = f"_dim_names_{uuid.uuid4().hex}"
+        native.register(view_name, pa.table({'name': pc.unique(values)}))
+        try:
+            native.execute(f"""
+                INSERT INTO {self.table} ({self.name_column})
+                SELECT name FROM {view_name}
+                ON CONFLICT DO NOTHING
+            """)
+            mapping = native.execute(f"""
+                SELECT d.{self.name_column} AS name, CAST(d.{self.id_column} AS INTEGER) AS id
+                FROM {self.table} AS d
+                JOIN {view_name} AS v ON v.name = d.{self.name_column}
+            """).arrow()
+        finally:
+            native.unregister(view_name)
+        return pc.take(mapping.column('id'), pc.index_in(values, value_set=mapping.column('name')))
+
+    def labels(self, session: Session, ids: np.ndarray) -> pd.Series:
+        """
+        Libellés des identifiants (index: identifiant)
+        """
+        connection = get_duckdb_connection(session)
+        view_name = f"_dim_ids_{uuid.uuid4().hex}"
+        connection.register(view_name, pa.table({'id': pa.array(ids, pa.int32())}))
+        try:
+            rows = connection.execute(f"""
+                SELECT d.{self.id_column} AS id, d.{self.name_column} AS name
+                FROM {self.table} AS d
+                JOIN {view_name} AS v ON v.id = d.{self.id_column}
+            """).arrow()
+        finally:
+            connection.unregister(view_name)
+        return pd.Series(rows.column('name').to_pylist(), index=rows.column('id').to_numpy())
+
+
+# Colonnes de results codées par une dimension dans fact_results
+DIMENSIONS: Dict[str, Dimension] = {
+    'numorden': Dimension('dim_patients', 'patient_id', 'numorden'),
+    'nombre': Dimension('dim_tests', 'test_id', 'nombre'),
+    'nombre2': Dimension('dim_services', 'service_id', 'nombre2'),
+}
+
+
+def encode_dimensions(bind: Engine, table: pa.Table) -> Dict[str, pa.Array]:
+    """
+    Coder les colonnes de dimension d'un lot -> {patient_id, test_id, service_id}
+    Les nouvelles valeurs sont validées dans une transaction séparée de celle
+    de l'ingestion: un dictionnaire ne fait que grandir, une ingestion annulée
+    n'y laisse que des entrées inutilisées
+    """
+    with _dimension_lock, bind.begin() as connection:
+        native = connection.connection.dbapi_connection
+        return {
+            dimension.id_column: dimension.encode(native, table[column])
+            for column, dimension in DIMENSIONS.items()
+        }
+
+
+class FactLoader:
+    """
+    Chargement de la table fact_results (résultats codés par entiers)
+    Les insertions se font dans la transaction de la session, comme BulkLoader
+    Mode "parquet": pas de table de faits, load_coded_frame code le cache Parquet
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def load(self, data: Union[pd.DataFrame, pa.Table], file_id: str, first_row: int = 0) -> int:
+        """
+        Coder et insérer un lot; first_row est la position de sa première ligne dans le fichier
+        Retourne le nombre de lignes insérées
+        """
+        if len(data) == 0:
+            return 0
+
+        table = BulkLoader(self.session).prepare_table(data)
+        bind = self.session.get_bind()
+
+        columns = {'row_number': pa.array(np.arange(first_row, first_row + table.num_rows, dtype=np.int64))}
+        columns.update(encode_dimensions(bind, table))
+        columns['sexo'] = table['sexo']
+        columns['edad'] = table['edad']
+        columns['date'] = table['date']
+        columns.update({name: table[name] for name in TEXTORES_COLUMNS})
+        facts = pa.table(columns)
+
+        connection = get_duckdb_connection(self.session)
+        view_name = f"_bulk_facts_{uuid.uuid4().hex}"
+        connection.register(view_name, facts)
+        try:
+            connection.execute(
+                f"""
+                INSERT INTO fact_results
+                    (file_id, row_number, patient_id, test_id, service_id, sexo, edad,
+                     textores_num, textores_cmp, textores_kind, date)
+                SELECT ?, row_number, patient_id, test_id, service_id, sexo, edad,
+                       textores_num, textores_cmp, textores_kind, date
+                FROM {view_name}
+                """,
+                [file_id]
+            )
+        finally:
+            connection.unregister(view_name)
+
+        return facts.num_rows
+
+
+def load_coded_frame(session: Session, file_id: str, columns: List[str],
+                     equals: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Charger les colonnes d'un fichier depuis fact_results
+    numorden, nombre, nombre2 et date sont des Categorical: les groupby
+    travaillent sur les codes entiers, les libellés (triés comme les chaînes
+    d'origine) ne sont lus qu'une fois par valeur distincte
+    equals: filtres d'égalité sur les colonnes codées (ex: {"nombre2": "URGENCIAS"})
+    Mode "parquet": colonnes codées à partir du cache Parquet (fact_results n'est
+    pas alimentée à l'ingestion)
+    """
+    if parquet_storage_enabled():
+        decoded = table_cache.get("fact_results", file_id, lambda: arrow_cache.load(
+            "fact_results", file_id, lambda: _decoded_cache(session, file_id)
+        ))
+        return _frame_from_decoded(decoded, columns, equals)
+
+    if table_cache.enabled or arrow_cache.enabled:
+        decoded = table_cache.get("fact_results", file_id, lambda: arrow_cache.load(
+            "fact_results", file_id, lambda: _decoded_facts(session, file_id)
+        ))
+        return _frame_from_decoded(decoded, columns, equals)
+
+    select_list = []
+    for column in columns:
+        select_list.append(DIMENSIONS[column].id_column if column in DIMENSIONS else column)
+
+    conditions = []
+    params = []
+    for column, value in (equals or {}).items():
+        dimension = DIMENSIONS[column]
+        conditions.append(
+            f"{dimension.id_column} IN (SELECT {dimension.id_column} FROM {dimension.table} "
+            f"WHERE {dimension.name_column} = ?)"
+        )
+        params.append(value)
+
+    table = get_duckdb_connection(session).execute(
+        f"SELECT {', '.join(select_list)} FROM fact_results WHERE {' AND '.join(['file_id = ?'] + conditions)}",
+        [file_id] + params
+    ).arrow()
+
+    frame = {}
+    for column, source in zip(columns, select_list):
+        values = table.column(source)
+        if column in DIMENSIONS:
+            frame[column] = _categorical(values.to_numpy(), DIMENSIONS[column].labels(session, pc.unique(values).to_numpy()))
+        elif column == 'date':
+            codes, uniques = pd.factorize(values.cast(pa.int32()).to_numpy(zero_copy_only=False), sort=True)
+            frame[column] = pd.Categorical.from_codes(codes, pa.array(uniques, pa.int32()).cast(pa.date32()).to_pylist())
+        else:
+            frame[column] = values.to_pandas()
+    return pd.DataFrame(frame, columns=columns)
+
+
+def _decoded_facts(session: Session, file_id: str) -> pa.Table:
+    """
+    Faits d'un fichier prêts pour le cache mémoire: colonnes de dimension et
+    date en dictionnaires Arrow triés (libellés lus et triés une seule fois),
+    autres colonnes telles quelles
+    """
+    facts = get_duckdb_connection(session).execute(
+        f"""
+        SELECT {', '.join(dimension.id_column for dimension in DIMENSIONS.values())},
+               sexo, edad, date, {', '.join(TEXTORES_COLUMNS)}
+        FROM fact_results WHERE file_id = ?
+        """,
+        [file_id]
+    ).arrow()
+
+    columns = {}
+    for column, dimension in DIMENSIONS.items():
+        ids = facts.column(dimension.id_column).to_numpy()
+        labels = dimension.labels(session, pc.unique(facts.column(dimension.id_column)).to_numpy())
+        categorical = _categorical(ids, labels)
+        columns[column] = pa.DictionaryArray.from_arrays(
+            pa.array(categorical.codes, pa.int32()), pa.array(categorical.categories.to_numpy(), pa.string())
+        )
+    dates = facts.column('date').cast(pa.int32()).to_numpy(zero_copy_only=False)
+    codes, uniques = pd.factorize(dates, sort=True)
+    columns['date'] = pa.DictionaryArray.from_arrays(
+        pa.array(codes, pa.int32()), pa.array(uniques, pa.int32()).cast(pa.date32())
+    )
+    for column in ['sexo', 'edad'] + TEXTORES_COLUMNS:
+        columns[column] = facts.column(column).combine_chunks()
+    return pa.table(columns)
+
+
+def _decoded_cache(session: Session, file_id: str) -> pa.Table:
+    """
+    Même table que _decoded_facts, lue dans le cache Parquet: valeurs manquantes
+    remplacées comme dans results, dictionnaires triés par libellé
+    """
+    table = BulkLoader(session).prepare_table(read_cache(file_id, PARQUET_SCHEMA.names))
+
+    columns = {}
+    for column in list(DIMENSIONS) + ['date']:
+        values = table.column(column)
+        labels = pc.unique(values)
+        labels = labels.take(pc.sort_indices(labels))
+        columns[column] = pa.DictionaryArray.from_arrays(
+            pc.index_in(values, value_set=labels).combine_chunks(), labels
+        )
+    for column in ['sexo', 'edad'] + TEXTORES_COLUMNS:
+        columns[column] = table.column(column).combine_chunks()
+    return pa.table(columns)
+
+
+def _frame_from_decoded(decoded: pa.Table, columns: List[str],
+                        equals: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    # Même résultat que la lecture dans fact_results: un filtre ne garde que
+    # les catégories présentes dans les lignes retenues
+    table = decoded.select(columns + [column for column in (equals or {}) if column not in columns])
+    for column, value in (equals or {}).items():
+        values = table.column(column).combine_chunks()
+        position = pc.index(values.dictionary, value).as_py()
+        table = table.filter(pc.equal(values.indices, position))
+
+    frame = {}
+    for column in columns:
+        values = table.column(column)
+        if pa.types.is_dictionary(values.type):
+            categorical = pd.Categorical(values.to_pandas())
+            frame[column] = categorical.remove_unused_categories() if equals else categorical
+        else:
+            frame[column] = values.to_pandas()
+    return pd.DataFrame(frame, columns=columns)
+
+
+def category_codes(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Codes entiers et libellés d'une colonne: trier les codes revient à trier
+    les libellés (Categorical de load_coded_frame ou colonne de chaînes)
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories.to_numpy()
+    codes, labels = pd.factorize(values, sort=True)
+    return codes, np.asarray(labels)
+
+
+def _categorical(ids: np.ndarray, labels: pd.Series) -> pd.Categorical:
+    # Catégories dans l'ordre des libellés: groupby et tris donnent le même
+    # ordre qu'avec les chaînes
+    labels = labels.sort_values(kind='stable')
+    codes = pd.Index(labels.index).get_indexer(ids)
+    return pd.Categorical.from_codes(codes, labels.to_numpy())
+
+
+def backfill_fact_tables(bind: Engine = engine):
+    """
+    Coder les fichiers ingérés avant l'existence de fact_results, ou recoder
+    ceux codés avant l'ajout des colonnes textores
+    (lecture unique de results pour chaque fichier concerné)
+    Rien à faire en mode "parquet" (pas de table de faits)
+    """
+    if parquet_storage_enabled():
+        return
+
+    with Session(bind) as session:
+        connection = get_duckdb_connection(session)
+        file_ids = [row[0] for row in connection.execute("""
+            SELECT file_id FROM files
+            WHERE status = 'completed'
+              AND file_id NOT IN (
+                  SELECT DISTINCT file_id FROM fact_results WHERE textores_kind IS NOT NULL
+              )
+        """).fetchall()]
+        if not file_ids:
+            return
+
+        connection.execute(
+            "DELETE FROM fact_results WHERE file_id IN (SELECT unnest(?::VARCHAR[]))",
+            [file_ids]
+        )
+
+        loader = FactLoader(session)
+        for file_id in file_ids:
+            table = connection.execute(
+                """
+                SELECT numorden, sexo, edad, nombre, textores, textores_num, textores_cmp,
+                       textores_kind, nombre2, date
+                FROM results WHERE file_id = ?
+                """,
+                [file_id]
+            ).arrow()
+            loader.load(table, file_id)
+            session.commit()
+            table_cache.invalidate(file_id)
+            arrow_cache.delete(file_id, "fact_results")
+            connection = get_duckdb_connection(session)
+        print(f"✅ Table fact_results complétée pour {len(file_ids)} fichier(s)")
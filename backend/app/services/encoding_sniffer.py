@@ -0,0 +1,89 @@
+# ============================================================
+# backend/app/services/encoding_sniffer.py
+# ============================================================
+
+import codecs
+from typing import BinaryIO, Optional
+
+# Taille de l'échantillon lu en tête de fichier
+DEFAULT_SAMPLE_SIZE = 1_048_576  # 1 MB
+
+# Marques d'ordre d'octets, de la plus longue à la plus courte
+BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+# Octets 0x80-0x9F sans caractère associé en cp1252
+CP1252_UNDEFINED = {0x81, 0x8D, 0x8F, 0x90, 0x9D}
+
+
+def detect_encoding(sample: bytes, truncated: bool = False) -> str:
+    """
+    Déterminer l'encodage d'un fichier texte à partir d'un échantillon de ses octets
+
+    Ordre de décision:
+    1. BOM (utf-8-sig, utf-16, utf-32)
+    2. UTF-8 si l'échantillon se décode sans erreur
+    3. Fallback statistique mono-octet: cp1252 (exports Windows) sauf si
+       l'échantillon contient des octets non définis en cp1252 → latin1
+
+    L'échantillon ne garantit rien sur la suite du fichier: les lecteurs
+    décodent strictement et fallback_encoding donne l'encodage de relecture
+
+    Args:
+        sample: premiers octets du fichier
+        truncated: True si l'échantillon coupe le fichier (un caractère
+            multi-octets peut alors être incomplet en fin d'échantillon)
+    """
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    if sample.isascii():
+        return "utf-8"
+
+    try:
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        decoder.decode(sample, final=not truncated)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    return _single_byte_encoding(sample)
+
+
+def fallback_encoding(encoding: str, error: UnicodeDecodeError) -> Optional[str]:
+    """
+    Encodage avec lequel relire un fichier dont le décodage a échoué au-delà
+    de l'échantillon, choisi d'après les octets du bloc fautif
+    utf-8 → cp1252 ou latin1, cp1252 → latin1 (qui décode tous les octets);
+    None si aucune relecture n'a de sens (BOM, latin1)
+    """
+    name = codecs.lookup(encoding).name
+    if name == "utf-8":
+        return _single_byte_encoding(error.object)
+    if name == "cp1252":
+        return "latin1"
+    return None
+
+
+def _single_byte_encoding(data: bytes) -> str:
+    high_bytes = set(data) & set(range(0x80, 0xA0))
+    if high_bytes & CP1252_UNDEFINED:
+        return "latin1"
+    return "cp1252"
+
+
+def sniff_encoding(source: BinaryIO, sample_size: int = DEFAULT_SAMPLE_SIZE) -> str:
+    """
+    Lire un échantillon borné en tête de source, détecter l'encodage
+    puis replacer le curseur à sa position initiale
+    """
+    position = source.tell()
+    sample = source.read(sample_size)
+    source.seek(position)
+    return detect_encoding(sample, truncated=len(sample) == sample_size)
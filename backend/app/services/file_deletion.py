@@ -0,0 +1,113 @@
+# ============================================================
+# backend/app/services/file_deletion.py
+# ============================================================
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from .arrow_cache import arrow_cache
+from .parquet_cache import delete_cache
+from .table_cache import table_cache
+from ..db.base import engine
+from ..db.models import (
+    Result, ResultFact, FileProfile, DailyRollup, DailyRollupRegister, File as FileModel, FILE_STATUS_DELETED
+)
+from ..db.results_view import parquet_storage_enabled, refresh_results_view
+
+
+class FileDeletionManager:
+    """
+    Suppression des fichiers en deux temps
+    1. tombstone(): le fichier passe au statut "deleted" pendant la requête et
+       disparaît aussitôt des listes et des requêtes
+    2. un worker purge ensuite ses résultats et ses faits codés (DELETE
+       ensemblistes), son profil, son enregistrement, son cache Parquet et
+       ses tables Arrow IPC, puis lance un CHECKPOINT DuckDB quand il n'a
+       plus de purge en attente pour récupérer l'espace libéré
+    """
+
+    def __init__(self):
+        # Un seul worker: les purges et les CHECKPOINT ne se concurrencent pas
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-deletion")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def tombstone(self, session: Session, file_record: FileModel):
+        """
+        Marquer le fichier comme supprimé et planifier la purge de ses données
+        """
+        file_record.status = FILE_STATUS_DELETED
+        session.add(file_record)
+        session.commit()
+        table_cache.invalidate(file_record.file_id)
+
+        # En mode parquet, la vue results ne porte que sur les fichiers "completed"
+        if parquet_storage_enabled():
+            refresh_results_view(session.get_bind())
+
+        self.schedule(file_record.file_id)
+
+    def schedule(self, file_id: str):
+        with self._lock:
+            self._pending += 1
+        self._executor.submit(self._run, file_id)
+
+    def resume(self):
+        """
+        Reprendre les purges interrompues par un arrêt du serveur
+        """
+        with Session(engine) as session:
+            statement = select(FileModel.file_id).where(FileModel.status == FILE_STATUS_DELETED)
+            file_ids = session.exec(statement).all()
+        for file_id in file_ids:
+            self.schedule(file_id)
+        if file_ids:
+            print(f"🗑️ {len(file_ids)} suppression(s) de fichier reprise(s)")
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, file_id: str):
+        try:
+            self._purge(file_id)
+        except Exception as e:
+            # Le fichier reste marqué "deleted": la purge sera reprise au prochain démarrage
+            print(f"❌ Erreur lors de la purge du fichier {file_id}: {str(e)}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+                idle = self._pending == 0
+        if idle:
+            self._checkpoint()
+
+    def _purge(self, file_id: str):
+        with Session(engine) as session:
+            if not parquet_storage_enabled():
+                session.exec(delete(Result).where(Result.file_id == file_id))
+            session.exec(delete(ResultFact).where(ResultFact.file_id == file_id))
+            session.exec(delete(FileProfile).where(FileProfile.file_id == file_id))
+            session.exec(delete(DailyRollup).where(DailyRollup.file_id == file_id))
+            session.exec(delete(DailyRollupRegister).where(DailyRollupRegister.file_id == file_id))
+            file_record = session.get(FileModel, file_id)
+            if file_record is not None:
+                session.delete(file_record)
+            session.commit()
+
+        delete_cache(file_id)
+        arrow_cache.delete(file_id)
+        print(f"🗑️ Fichier {file_id} purgé")
+
+    def _checkpoint(self):
+        # Réécrit les row groups touchés par les suppressions et rend leurs blocs réutilisables
+        try:
+            with engine.connect() as connection:
+                connection.exec_driver_sql("CHECKPOINT")
+            print("✅ CHECKPOINT DuckDB effectué")
+        except Exception as e:
+            # Une autre transaction en cours (ex: ingestion): DuckDB fera le suivant
+            print(f"⚠️ CHECKPOINT DuckDB différé: {str(e)}")
+
+
+file_deletions = FileDeletionManager()
@@ -0,0 +1,210 @@
+# ============================================================
+# backend/app/services/file_metadata.py
+# ============================================================
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from functools import lru_cache
+from urllib.parse import unquote
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from .parquet_cache import PARQUET_SCHEMA, SOURCE_SCHEMA, cache_path, read_cache
+
+# Colonnes de results nommées autrement dans le cache
+PARQUET_COLUMN_NAMES = {'date': 'Date'}
+
+
+class FileMetadataService:
+    """
+    Informations sur un fichier du cache lues uniquement dans les footers Parquet
+    (nombre de lignes, colonnes, valeurs manquantes, période couverte) et aperçu
+    limité au premier row group: aucune donnée n'est lue en entier
+    """
+
+    def __init__(self, file_id: str):
+        self.file_id = file_id
+        self.path = cache_path(file_id)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Résumé issu des footers de tous les fichiers physiques du cache
+        """
+        row_count = 0
+        num_row_groups = 0
+        size_bytes = 0
+        null_counts = {name: 0 for name in PARQUET_SCHEMA.names}
+        date_min = None
+        date_max = None
+
+        for part in self._parts():
+            footer = _read_footer(str(part), *_file_signature(part))
+            row_count += footer["row_count"]
+            num_row_groups += footer["num_row_groups"]
+            size_bytes += footer["size_bytes"]
+            for name, count in footer["null_counts"].items():
+                if name in null_counts:
+                    null_counts[name] += count
+            if footer["date_min"] is not None:
+                date_min = footer["date_min"] if date_min is None else min(date_min, footer["date_min"])
+                date_max = footer["date_max"] if date_max is None else max(date_max, footer["date_max"])
+
+        return {
+            "file_id": self.file_id,
+            "row_count": row_count,
+            "columns": PARQUET_SCHEMA.names,
+            "num_row_groups": num_row_groups,
+            "size_bytes": size_bytes,
+            "null_counts": null_counts,
+            "date_min": date_min.date().isoformat() if date_min is not None else None,
+            "date_max": date_max.date().isoformat() if date_max is not None else None,
+        }
+
+    def missing_counts(self, columns: List[str]) -> Optional[Dict[str, int]]:
+        """
+        Valeurs manquantes du fichier d'origine par colonne (noms des colonnes de
+        results), lues dans les footers, ou None si une colonne n'y a pas de
+        null_count (cache absent, colonne absente ou statistiques non écrites)
+        Les valeurs manquantes sont celles du fichier téléversé: results les
+        remplace par des valeurs par défaut (âge 0, date du jour, chaîne vide)
+        """
+        parts = self._parts()
+        if not parts:
+            return None
+
+        missing_counts = {col: 0 for col in columns}
+        for part in parts:
+            footer = _read_footer(str(part), *_file_signature(part))
+            # Colonnes de partitionnement: absentes du fichier, valeur dans le chemin
+            partition_values = _partition_values(part.relative_to(self.path)) if self.path.is_dir() else {}
+            for col in columns:
+                name = PARQUET_COLUMN_NAMES.get(col, col)
+                if name in partition_values:
+                    if partition_values[name] is None:
+                        missing_counts[col] += footer["row_count"]
+                elif name in footer["null_counts"] and name not in footer["null_counts_unknown"]:
+                    missing_counts[col] += footer["null_counts"][name]
+                else:
+                    return None
+        return missing_counts
+
+    def scan_missing_counts(self, columns: List[str]) -> Optional[Tuple[int, Dict[str, int]]]:
+        """
+        Nombre de lignes et valeurs manquantes du fichier d'origine par colonne,
+        lus dans les colonnes du cache quand ses footers n'ont pas de null_count
+        (mêmes valeurs que missing_counts), ou None sans cache
+        """
+        if not self._parts():
+            return None
+        names = {col: PARQUET_COLUMN_NAMES.get(col, col) for col in columns}
+        table = read_cache(self.file_id, list(dict.fromkeys(names.values())))
+        return table.num_rows, {col: table[name].null_count for col, name in names.items()}
+
+    def upload_missing_counts(self, columns: List[str]) -> Optional[Tuple[int, Dict[str, int]]]:
+        """
+        Nombre de lignes et valeurs manquantes du fichier téléversé: footers,
+        sinon lecture des colonnes du cache; None sans cache
+        """
+        missing_counts = self.missing_counts(columns)
+        if missing_counts is not None:
+            return self.row_count(), missing_counts
+        return self.scan_missing_counts(columns)
+
+    def row_count(self) -> int:
+        return sum(_read_footer(str(part), *_file_signature(part))["row_count"] for part in self._parts())
+
+    def preview(self, limit: int = 10) -> pa.Table:
+        """
+        Premières lignes du cache, lues dans le premier row group non vide
+        (colonnes du fichier d'origine uniquement)
+        """
+        for part in self._parts():
+            parquet_file = pq.ParquetFile(part)
+            for index in range(parquet_file.num_row_groups):
+                if parquet_file.metadata.row_group(index).num_rows == 0:
+                    continue
+                columns = [name for name in SOURCE_SCHEMA.names if name in parquet_file.schema_arrow.names]
+                batch = next(parquet_file.iter_batches(batch_size=limit, row_groups=[index], columns=columns))
+                return self._with_partition_values(pa.Table.from_batches([batch]), part)
+        return SOURCE_SCHEMA.empty_table()
+
+    def _parts(self) -> List[Path]:
+        # Fichier unique ou répertoire hive (un fichier par partition)
+        if self.path.is_dir():
+            return sorted(self.path.rglob("*.parquet"))
+        if self.path.exists():
+            return [self.path]
+        return []
+
+    def _with_partition_values(self, table: pa.Table, part: Path) -> pa.Table:
+        # Les colonnes de partitionnement (ex: nombre2=URGENCIAS) ne sont pas dans le fichier
+        partition_values = _partition_values(part.relative_to(self.path)) if self.path.is_dir() else {}
+        columns = {}
+        for field in SOURCE_SCHEMA:
+            if field.name in table.column_names:
+                columns[field.name] = table[field.name].cast(field.type)
+            else:
+                value = partition_values.get(field.name)
+                columns[field.name] = pa.array([value] * table.num_rows, type=field.type)
+        return pa.table(columns)
+
+
+def list_cache_file_ids(cache_dir: Path) -> List[str]:
+    """
+    file_id de tous les fichiers publiés dans le cache (fichiers ou répertoires)
+    """
+    return sorted(path.name[:-len(".parquet")] for path in cache_dir.glob("*.parquet"))
+
+
+def _file_signature(part: Path) -> Tuple[int, int]:
+    # (taille, date de modification): un fichier réécrit invalide le footer en cache
+    stat = part.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+@lru_cache(maxsize=4096)
+def _read_footer(path: str, size_bytes: int, mtime_ns: int) -> Dict[str, Any]:
+    metadata = pq.read_metadata(path)
+    names = [metadata.schema.column(j).name for j in range(metadata.num_columns)]
+
+    null_counts = {name: 0 for name in names}
+    # Colonnes dont un row group n'a pas de null_count
+    null_counts_unknown = set()
+    date_min = None
+    date_max = None
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j, name in enumerate(names):
+            statistics = row_group.column(j).statistics
+            if statistics is None:
+                null_counts_unknown.add(name)
+                continue
+            if statistics.has_null_count:
+                null_counts[name] += statistics.null_count
+            else:
+                null_counts_unknown.add(name)
+            if name == 'Date' and statistics.has_min_max:
+                date_min = statistics.min if date_min is None else min(date_min, statistics.min)
+                date_max = statistics.max if date_max is None else max(date_max, statistics.max)
+
+    return {
+        "row_count": metadata.num_rows,
+        "num_row_groups": metadata.num_row_groups,
+        "size_bytes": size_bytes,
+        "null_counts": null_counts,
+        "null_counts_unknown": frozenset(null_counts_unknown),
+        "date_min": date_min,
+        "date_max": date_max,
+    }
+
+
+def _partition_values(relative_path: Path) -> Dict[str, Optional[str]]:
+    values = {}
+    for segment in relative_path.parts[:-1]:
+        if "=" in segment:
+            key, value = segment.split("=", 1)
+            values[key] = None if value == "NULL" else unquote(value)
+    return values
@@ -0,0 +1,173 @@
+# ============================================================
+# backend/app/services/file_profiles.py
+# ============================================================
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlmodel import Session, select
+
+from .daily_rollups import build_daily_rollup, rollup_layout
+from .stats_engine import EXCLUDED_COLUMNS, SKETCH_FORMAT, SUMMARY_COLUMNS, SqlStatsEngine
+from ..core.config import settings
+from ..db.base import engine
+from ..db.models import File as FileModel, FileProfile
+
+
+class FileProfileManager:
+    """
+    Profil statistique d'un fichier: résumé, statistiques détaillées et
+    valeurs manquantes de chaque colonne de SUMMARY_COLUMNS
+    - calculé par un worker après l'ingestion (SqlStatsEngine, deux requêtes),
+      avec les esquisses fusionnables du fichier et de ses services et son
+      cube journalier (séries temporelles, voir daily_rollups.py)
+    - servi tel quel par les routes de statistiques tant que files.data_version
+      n'a pas changé; un profil absent ou périmé est (re)planifié et la route
+      calcule en attendant les statistiques à la demande
+    """
+
+    def __init__(self):
+        # Un seul worker: les profils sont calculés l'un après l'autre
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-profile")
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def schedule(self, file_id: str):
+        """
+        Planifier le calcul du profil (sans doublon si un calcul est déjà en attente)
+        """
+        with self._lock:
+            if file_id in self._pending:
+                return
+            self._pending.add(file_id)
+        self._executor.submit(self._run, file_id)
+
+    def resume(self):
+        """
+        Planifier les profils manquants ou périmés (fichiers ingérés avant leur
+        ajout ou celui des esquisses et du cube, cube calculé avec d'autres
+        paramètres, ou données réécrites depuis le dernier calcul)
+        """
+        with Session(engine) as session:
+            statement = (
+                select(FileModel.file_id)
+                .outerjoin(FileProfile, FileProfile.file_id == FileModel.file_id)
+                .where(FileModel.status == 'completed')
+                .where(
+                    (FileProfile.file_id == None)  # noqa: E711
+                    | (FileProfile.data_version != FileModel.data_version)
+                    | (FileProfile.sketches == None)  # noqa: E711
+                    | (FileProfile.rollup_layout == None)  # noqa: E711
+                    | (FileProfile.rollup_layout != rollup_layout())
+                )
+            )
+            file_ids = session.exec(statement).all()
+        for file_id in file_ids:
+            self.schedule(file_id)
+        if file_ids:
+            print(f"📊 {len(file_ids)} profil(s) de fichier planifié(s)")
+
+    def get(self, session: Session, file_record: FileModel) -> Optional[FileProfile]:
+        """
+        Profil à jour du fichier, ou None (le calcul est alors planifié)
+        """
+        profile = session.get(FileProfile, file_record.file_id)
+        if profile is not None and profile.data_version == file_record.data_version:
+            return profile
+        self.schedule(file_record.file_id)
+        return None
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, file_id: str):
+        try:
+            self._compute(file_id)
+        except Exception as e:
+            # Les routes continuent de calculer à la demande; nouvel essai au prochain accès
+            print(f"❌ Erreur lors du calcul du profil du fichier {file_id}: {str(e)}")
+        finally:
+            with self._lock:
+                self._pending.discard(file_id)
+
+    def _compute(self, file_id: str):
+        with Session(engine) as session:
+            file_record = session.get(FileModel, file_id)
+            if file_record is None or file_record.status != 'completed':
+                return
+            data_version = file_record.data_version
+
+            stats_engine = SqlStatsEngine(session, file_id, SUMMARY_COLUMNS)
+            summary = stats_engine.compute_full_summary(SUMMARY_COLUMNS)
+            column_stats = stats_engine.compute_column_stats(SUMMARY_COLUMNS)
+            sketches = stats_engine.compute_sketches()
+            build_daily_rollup(session, file_id)
+
+            profile = session.get(FileProfile, file_id) or FileProfile(file_id=file_id)
+            profile.data_version = data_version
+            profile.total_rows = summary["overview"]["total_rows"]
+            profile.summary = json.dumps(summary)
+            profile.column_stats = json.dumps(column_stats)
+            profile.sketches = json.dumps(sketches)
+            profile.rollup_layout = rollup_layout()
+            profile.computed_at = datetime.utcnow()
+            session.add(profile)
+            session.commit()
+        print(f"📊 Profil du fichier {file_id} calculé")
+
+
+def profile_summary(profile: FileProfile, columns: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Résumé d'un profil, restreint aux colonnes demandées (même réponse que
+    compute_full_summary), ou None si une colonne n'est pas dans le profil
+    """
+    summary = json.loads(profile.summary)
+    if columns is None:
+        columns = [col for col in SUMMARY_COLUMNS if col not in EXCLUDED_COLUMNS]
+    stats = {**summary["numeric_stats"], **summary["categorical_stats"]}
+    columns = [col for col in dict.fromkeys(columns) if col in SUMMARY_COLUMNS]
+    if any(col not in stats for col in columns):
+        return None
+
+    return {
+        "overview": summary["overview"],
+        "numeric_stats": {col: stats[col] for col in columns if col in summary["numeric_stats"]},
+        "categorical_stats": {col: stats[col] for col in columns if col in summary["categorical_stats"]},
+        "missing_summary": summary["missing_summary"]
+    }
+
+
+def profile_column_stats(profile: FileProfile, column: str) -> Optional[Dict[str, Any]]:
+    """
+    Statistiques détaillées d'une colonne, ou None si elle n'est pas dans le profil
+    """
+    return json.loads(profile.column_stats).get(column)
+
+
+def profile_sketches(profile: FileProfile) -> Optional[Dict[str, Any]]:
+    """
+    Esquisses du fichier et de ses services, ou None si le profil n'en a pas
+    (profil antérieur aux esquisses ou à leur format actuel, ou précision modifiée depuis le calcul)
+    """
+    if profile.sketches is None:
+        return None
+    sketches = json.loads(profile.sketches)
+    sketch = sketches["all"]
+    if sketch is not None and (sketch["relative_accuracy"] != settings.SKETCH_RELATIVE_ACCURACY
+                               or sketch.get("hll_precision") != settings.SKETCH_HLL_PRECISION
+                               or sketch.get("format") != SKETCH_FORMAT):
+        return None
+    return sketches
+
+
+def profile_has_rollup(profile: FileProfile) -> bool:
+    """
+    Cube journalier du fichier utilisable (calculé avec les paramètres actuels)
+    """
+    return profile.rollup_layout == rollup_layout()
+
+
+# Instance unique partagée par l'ingestion, les routes et le démarrage
+file_profiles = FileProfileManager()
@@ -0,0 +1,120 @@
+# ============================================================
+# backend/app/services/frame_loader.py
+# ============================================================
+
+import uuid
+import pandas as pd
+import pyarrow as pa
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from sqlmodel import Session
+
+from ..db.base import get_duckdb_connection
+from ..db.models import Result, FILE_STATUS_DELETED
+from .arrow_cache import arrow_cache
+from .table_cache import table_cache
+
+# Colonnes de results (table en mode "table", vue sur le cache Parquet en mode "parquet")
+RESULT_COLUMNS = list(Result.__table__.columns.keys())
+
+# Opérateurs des filtres manuels (même logique que subset_manual)
+COMPARISON_OPERATORS = ['=', '!=', '>', '<', '>=', '<=']
+
+
+def load_table(session: Session, file_id: str, columns: List[str],
+               filters: Optional[List[Mapping[str, Any]]] = None,
+               equals: Optional[Dict[str, Any]] = None,
+               order_by: Optional[List[str]] = None) -> pa.Table:
+    """
+    Charger les colonnes demandées d'un fichier en une requête DuckDB projetée
+    (aucun objet ORM: la table Arrow est lue directement dans la transaction de la session)
+    Avec un cache activé, la requête porte sur la table du fichier gardée en
+    mémoire ou projetée depuis le cache Arrow IPC
+    filters: conditions {column, operator, value} des filtres manuels
+    equals: filtres d'égalité (ex: {"nombre2": "URGENCIAS"})
+    order_by: colonnes de tri
+    Fichier supprimé (en attente de purge): table vide, ni ses lignes ni ses
+    tables en cache ne sont lues
+    """
+    for column in columns + list(equals or {}) + list(order_by or []):
+        if column not in RESULT_COLUMNS:
+            raise ValueError(f"Colonne inconnue: {column}")
+
+    connection = get_duckdb_connection(session)
+    status = connection.execute("SELECT status FROM files WHERE file_id = ?", [file_id]).fetchone()
+    if status is not None and status[0] == FILE_STATUS_DELETED:
+        return connection.execute(_select_query("results", columns, ["false"], None)).arrow()
+
+    conditions = []
+    params: List[Any] = []
+    for column, value in (equals or {}).items():
+        conditions.append(f"{column} = ?")
+        params.append(value)
+    for filter_cond in filters or []:
+        condition = filter_condition(filter_cond)
+        if condition is not None:
+            conditions.append(condition[0])
+            params.extend(condition[1])
+
+    if not (table_cache.enabled or arrow_cache.enabled):
+        return connection.execute(
+            _select_query("results", columns, ["file_id = ?"] + conditions, order_by),
+            [file_id] + params
+        ).arrow()
+
+    cached = table_cache.get("results", file_id, lambda: arrow_cache.load("results", file_id, lambda: connection.execute(
+        "SELECT * EXCLUDE (file_id) FROM results WHERE file_id = ?", [file_id]
+    ).arrow()))
+    # file_id n'est pas gardé en mémoire (constant pour la table)
+    select_list = [("? AS file_id" if column == 'file_id' else column) for column in columns]
+    select_params = [file_id] if 'file_id' in columns else []
+
+    view_name = f"_cached_results_{uuid.uuid4().hex}"
+    connection.register(view_name, cached)
+    try:
+        return connection.execute(
+            _select_query(view_name, select_list, conditions, order_by),
+            select_params + params
+        ).arrow()
+    finally:
+        connection.unregister(view_name)
+
+
+def load_frame(session: Session, file_id: str, columns: List[str],
+               filters: Optional[List[Mapping[str, Any]]] = None,
+               equals: Optional[Dict[str, Any]] = None,
+               order_by: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    load_table converti en DataFrame (dates: objets datetime.date)
+    """
+    return load_table(session, file_id, columns, filters, equals, order_by).to_pandas()
+
+
+def _select_query(source: str, select_list: List[str], conditions: List[str],
+                  order_by: Optional[List[str]]) -> str:
+    query = f"SELECT {', '.join(select_list)} FROM {source}"
+    if conditions:
+        query += f" WHERE {' AND '.join(conditions)}"
+    if order_by:
+        query += f" ORDER BY {', '.join(order_by)}"
+    return query
+
+
+def filter_condition(filter_cond: Mapping[str, Any]) -> Optional[Tuple[str, List[Any]]]:
+    """
+    Condition SQL paramétrée d'un filtre manuel {column, operator, value}, ou None
+    """
+    # Filtres vides ou sur une colonne inconnue ignorés, comme dans subset_manual
+    column = filter_cond['column']
+    operator = filter_cond['operator']
+    value = filter_cond.get('value')
+    if not value or column not in RESULT_COLUMNS:
+        return None
+
+    if operator == 'LIKE':
+        return f"{column} LIKE ?", [f"%{value}%"]
+    if operator == 'IN':
+        values = [v.strip() for v in value.split(',')]
+        return f"{column} IN ({', '.join('?' for _ in values)})", values
+    if operator in COMPARISON_OPERATORS:
+        return f"{column} {operator} ?", [int(value) if column == 'edad' else value]
+    return None
@@ -0,0 +1,68 @@
+# ============================================================
+# backend/app/services/hyperloglog.py
+# ============================================================
+
+import math
+from typing import Iterable, Mapping, Tuple
+
+# Esquisses HyperLogLog calculées dans DuckDB (cube journalier, résumé
+# approximate, esquisses fusionnables): 2^precision registres, chacun gardant
+# le rang maximal vu; deux esquisses se fusionnent par max registre à registre
+
+
+def register_expressions(hashed: str, precision: int) -> Tuple[str, str]:
+    """
+    Expressions SQL (registre, rang) d'un hash (colonne hash(valeur)):
+    registre = bits de poids faible du hash, rang = nombre de zéros de poids
+    faible du reste + 1 (rest & -rest isole le bit à 1 le plus bas)
+    """
+    rest = f"CAST({hashed} >> {precision} AS BIGINT)"
+    bucket = f"CAST({hashed} & {(1 << precision) - 1} AS INTEGER)"
+    rank = (f"CASE WHEN {rest} = 0 THEN {64 - precision + 1} "
+            f"ELSE CAST(log2({rest} & -{rest}) AS INTEGER) + 1 END")
+    return bucket, rank
+
+
+def estimate(filled: int, inverse_sum: float, precision: int) -> int:
+    """
+    Cardinalité estimée à partir des registres non vides: leur nombre et la
+    somme des 2^-rang (estimateur amélioré d'Ertl, sans biais sur toute la plage,
+    pas de bascule vers le comptage linéaire: les registres vides passent par sigma)
+    """
+    if filled == 0:
+        return 0
+    registers = 1 << precision
+    denominator = registers * _sigma((registers - filled) / registers) + inverse_sum
+    return int(round(registers * registers / (2 * math.log(2)) / denominator))
+
+
+def estimate_registers(registers: Mapping[int, int], precision: int) -> int:
+    """
+    Cardinalité d'une esquisse {registre: rang} (registres non vides)
+    """
+    return estimate(len(registers), sum(2.0 ** -rank for rank in registers.values()), precision)
+
+
+def merge_registers(sketches: Iterable[Mapping[int, int]]) -> dict:
+    """
+    Union d'esquisses: rang maximal de chaque registre
+    """
+    merged = {}
+    for registers in sketches:
+        for bucket, rank in registers.items():
+            if rank > merged.get(bucket, 0):
+                merged[bucket] = rank
+    return merged
+
+
+def _sigma(x: float) -> float:
+    # sigma(x) = x + somme des x^(2^k) * 2^(k-1), k >= 1 (x < 1: au moins un registre rempli)
+    y = 1.0
+    z = x
+    while True:
+        x *= x
+        previous = z
+        z += x * y
+        y += y
+        if z == previous:
+            return z
@@ -0,0 +1,119 @@
+# ============================================================
+# backend/app/services/ingest_jobs.py
+# ============================================================
+
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, BinaryIO
+from sqlmodel import Session
+
+from .ingest_pipeline import IngestPipeline, IngestError
+from ..core.config import settings
+from ..db.base import engine
+
+
+class IngestJob:
+    """
+    État d'une ingestion exécutée en arrière-plan
+    """
+
+    def __init__(self, original_filename: str):
+        self.job_id = str(uuid.uuid4())
+        self.original_filename = original_filename
+        self.status = "queued"  # queued | running | completed | failed
+        self.stage = "queued"
+        self.rows_processed = 0
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[IngestError] = None
+
+    def update(self, stage: str, rows_processed: int):
+        self.stage = stage
+        self.rows_processed = rows_processed
+
+    def elapsed_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.time()
+        return end - self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = self.elapsed_seconds()
+        return {
+            "job_id": self.job_id,
+            "filename": self.original_filename,
+            "status": self.status,
+            "stage": self.stage,
+            "rows_processed": self.rows_processed,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.rows_processed / elapsed, 1) if elapsed > 0 else 0.0
+        }
+
+
+class IngestJobManager:
+    """
+    Pool de workers exécutant les pipelines d'ingestion hors de la boucle d'événements
+    Les jobs terminés sont conservés INGEST_JOB_TTL_SECONDS pour être consultés
+    """
+
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        self._jobs: Dict[str, IngestJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, source: BinaryIO, file_extension: str, original_filename: str,
+               content_hash: Optional[str] = None) -> IngestJob:
+        """
+        Mettre en file l'ingestion d'un fichier déjà copié sur disque
+        Le job devient propriétaire de source et la ferme à la fin
+        """
+        job = IngestJob(original_filename)
+        with self._lock:
+            self._prune()
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job, source, file_extension, content_hash)
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: IngestJob, source: BinaryIO, file_extension: str, content_hash: Optional[str]):
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            # Chaque job a sa propre session (les sessions ne sont pas partagées entre threads)
+            with Session(engine) as session:
+                pipeline = IngestPipeline(session, source, file_extension, job.original_filename,
+                                          progress=job.update, content_hash=content_hash)
+                job.result = pipeline.run()
+            job.status = "completed"
+            job.stage = "completed"
+        except IngestError as e:
+            job.error = e
+            job.status = "failed"
+        except Exception as e:
+            print(f"❌ Erreur lors du job d'ingestion {job.job_id}: {str(e)}")
+            job.error = IngestError("Erreur serveur lors du traitement", [{"message": str(e)}], status_code=500)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            source.close()
+
+    def _prune(self):
+        # Oublier les jobs terminés depuis plus de INGEST_JOB_TTL_SECONDS
+        limit = time.time() - settings.INGEST_JOB_TTL_SECONDS
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < limit]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+ingest_jobs = IngestJobManager(max_workers=settings.INGEST_WORKERS)
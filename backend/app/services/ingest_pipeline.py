@@ -0,0 +1,488 @@
+# ============================================================
+# backend/app/services/ingest_pipeline.py
+# ============================================================
+
+import uuid
+import queue
+import threading
+from contextlib import closing, contextmanager
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Dict, Any, List, Iterator, BinaryIO, Optional, Callable, Tuple, Union
+from sqlmodel import Session, select
+
+from .validator import DataValidator
+from .columnar_validator import ColumnarValidator
+from .bulk_loader import BulkLoader
+from .dimensions import FactLoader
+from .encoding_sniffer import fallback_encoding, sniff_encoding
+from .csv_readers import iter_csv_chunks
+from .parquet_cache import PARQUET_SCHEMA, SOURCE_SCHEMA, ParquetCacheWriter, cache_exists, delete_cache
+from .textores_parser import with_textores_columns
+from .table_cache import table_cache
+from .file_profiles import file_profiles
+from .file_metadata import FileMetadataService
+from ..core.config import settings
+from ..db.models import File as FileModel
+from ..db.results_view import parquet_storage_enabled, refresh_results_view
+
+
+REQUIRED_COLUMNS = ['numorden', 'sexo', 'edad', 'nombre', 'textores', 'nombre2', 'Date']
+DUPLICATE_KEY = ['numorden', 'nombre', 'Date']
+
+
+# Fin de flux entre deux étages du pipeline
+_END = object()
+
+# Intervalle de vérification de l'arrêt lors d'une attente sur une file pleine/vide
+_QUEUE_POLL_SECONDS = 0.1
+
+
+class _StageFailure:
+    """
+    Erreur d'un étage transmise à l'étage suivant, avec le libellé de l'étage
+    """
+
+    def __init__(self, error: Exception, message: str):
+        self.error = error
+        self.message = message
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    # Attendre une place dans la file sauf si le pipeline est arrêté
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_QUEUE_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            return q.get(timeout=_QUEUE_POLL_SECONDS)
+        except queue.Empty:
+            continue
+    return None
+
+
+class _ParquetWriterThread(threading.Thread):
+    """
+    Dernier étage: écriture des lots dans le fichier Parquet de travail du cache,
+    dans un thread dédié, en parallèle de l'insertion en base faite par le
+    thread appelant (qui détient la session)
+    """
+
+    def __init__(self, path, schema: pa.Schema, depth: int):
+        super().__init__(name="ingest-parquet", daemon=True)
+        self.path = path
+        self.schema = schema
+        self.batches = queue.Queue(maxsize=depth)
+        self.stop = threading.Event()
+        self.error: Optional[Exception] = None
+
+    def run(self):
+        try:
+            # Un fichier vide produit un Parquet vide au bon schéma
+            with pq.ParquetWriter(self.path, self.schema) as writer:
+                while True:
+                    item = _get(self.batches, self.stop)
+                    if item is None or item is _END:
+                        return
+                    writer.write_table(item)
+        except Exception as e:
+            self.error = e
+            self.stop.set()
+
+    def write(self, table: pa.Table):
+        self._raise_if_failed()
+        _put(self.batches, table, self.stop)
+
+    def finish(self):
+        """
+        Attendre l'écriture des lots en file et fermer le fichier
+        """
+        _put(self.batches, _END, self.stop)
+        self.join()
+        self._raise_if_failed()
+
+    def abort(self):
+        self.stop.set()
+        self.join()
+
+    def _raise_if_failed(self):
+        if self.error is not None:
+            raise IngestError("Erreur d'écriture du cache Parquet", [{"message": str(self.error)}],
+                              status_code=500) from self.error
+
+
+class IngestError(Exception):
+    """
+    Erreur d'ingestion à renvoyer telle quelle au client
+    """
+
+    def __init__(self, message: str, errors: List[Dict[str, Any]], status_code: int = 400,
+                 row_count: Optional[int] = None):
+        super().__init__(message)
+        self.message = message
+        self.errors = errors
+        self.status_code = status_code
+        self.row_count = row_count
+
+
+@contextmanager
+def _stage(message: str, status_code: int = 500):
+    """
+    Libeller les erreurs d'une étape de l'ingestion (IngestError et
+    UnicodeDecodeError, qui déclenche une relecture, passent telles quelles)
+    """
+    try:
+        yield
+    except (IngestError, UnicodeDecodeError):
+        raise
+    except Exception as e:
+        raise IngestError(message, [{"message": str(e)}], status_code=status_code) from e
+
+
+def find_ingested_file(session: Session, content_hash: str) -> Optional[FileModel]:
+    """
+    Retrouver un fichier déjà ingéré avec le même contenu (et dont le Parquet existe encore)
+    """
+    statement = select(FileModel).where(
+        FileModel.content_hash == content_hash,
+        FileModel.status == 'completed'
+    )
+    for file_record in session.exec(statement).all():
+        if cache_exists(file_record.file_id):
+            return file_record
+    return None
+
+
+class IngestPipeline:
+    """
+    Pipeline d'ingestion par lots d'un fichier CSV/Excel déjà copié sur disque
+    Chaque lot est parsé, validé, nettoyé et écrit dans le Parquet de travail;
+    les doublons sont ensuite repérés par DuckDB sur ce fichier, puis les lots
+    dédoublonnés sont insérés en base: la mémoire reste bornée par
+    INGEST_CHUNK_ROWS et INGEST_QUEUE_DEPTH. Lecture, validation et écriture
+    se chevauchent.
+    """
+
+    def __init__(self, session: Session, source: BinaryIO, file_extension: str, original_filename: str,
+                 progress: Optional[Callable[[str, int], None]] = None,
+                 content_hash: Optional[str] = None):
+        self.session = session
+        self.source = source
+        self.file_extension = file_extension
+        self.original_filename = original_filename
+        self.chunk_rows = settings.INGEST_CHUNK_ROWS
+        self.encoding = None
+        # Empreinte SHA-256 du contenu téléversé (déduplication des uploads identiques)
+        self.content_hash = content_hash
+        # Rappel optionnel (étape, lignes traitées) pour le suivi des jobs d'ingestion
+        self.progress = progress
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Exécuter l'ingestion complète et retourner le résumé (file_id, preview, warnings...)
+        Lève IngestError si le fichier est illisible ou invalide
+        """
+        # Contenu identique à un fichier déjà ingéré: réutiliser son file_id sans parser
+        if self.content_hash is not None:
+            existing = find_ingested_file(self.session, self.content_hash)
+            if existing is not None:
+                return self._reuse(existing)
+
+        self._report("parsing", 0)
+        if self.file_extension != 'csv':
+            return self._run_once(self._iter_excel_chunks)
+
+        # L'encodage est décidé sur un échantillon et le décodage est strict: un octet
+        # invalide au-delà de l'échantillon relance la lecture complète avec l'encodage
+        # de repli (rien n'est écrit en base avant la fin de la lecture)
+        self.encoding = sniff_encoding(self.source, settings.ENCODING_SNIFF_BYTES)
+        encoding_warnings = []
+        while True:
+            try:
+                result = self._run_once(lambda: self._iter_csv_chunks(self.encoding))
+            except UnicodeDecodeError as e:
+                fallback = fallback_encoding(self.encoding, e)
+                if fallback is None:
+                    raise IngestError("Erreur de lecture du fichier", [{"message": f"Encodage {self.encoding}: {str(e)}"}])
+                print(f"⚠️ Octets invalides en {self.encoding} après l'échantillon: relecture en {fallback}")
+                encoding_warnings.append({
+                    "message": f"⚠️ Octets invalides en {self.encoding} après l'échantillon: fichier relu en {fallback}"
+                })
+                self.encoding = fallback
+                self._report("parsing", 0)
+                continue
+            result["warnings"] = encoding_warnings + result["warnings"]
+            return result
+
+    def _reuse(self, file_record: FileModel) -> Dict[str, Any]:
+        """
+        Résumé d'ingestion d'un fichier existant (aperçu lu dans son cache Parquet)
+        """
+        first_rows = FileMetadataService(file_record.file_id).preview(limit=5)
+        preview_df = first_rows.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+        print(f"♻️ Contenu déjà ingéré: réutilisation du fichier {file_record.file_id}")
+
+        return {
+            "file_id": file_record.file_id,
+            "row_count": file_record.row_count,
+            "encoding": None,
+            "preview_df": preview_df,
+            "warnings": [{
+                "message": f"♻️ Contenu identique à '{file_record.original_filename}' déjà ingéré: fichier existant réutilisé"
+            }],
+            "reused": True
+        }
+
+    def _report(self, stage: str, rows_processed: int):
+        if self.progress is not None:
+            self.progress(stage, rows_processed)
+
+    # ------------------------------------------------------------
+    # Lecture par lots
+    # ------------------------------------------------------------
+
+    def _iter_csv_chunks(self, encoding: str) -> Iterator[Union[pd.DataFrame, pa.Table]]:
+        return iter_csv_chunks(settings.INGEST_READER, self.source, encoding, self.chunk_rows)
+
+    def _iter_excel_chunks(self) -> Iterator[pd.DataFrame]:
+        # openpyxl/xlrd ne lisent pas par morceaux: la feuille est chargée
+        # une fois (≤ 1 048 576 lignes) puis traitée par lots comme un CSV
+        self.source.seek(0)
+        df = pd.read_excel(self.source, dtype=str)
+        for start in range(0, max(len(df), 1), self.chunk_rows):
+            yield df.iloc[start:start + self.chunk_rows]
+
+    # ------------------------------------------------------------
+    # Étapes par lot
+    # ------------------------------------------------------------
+
+    def _validate_chunk(self, chunk: Union[pd.DataFrame, pa.Table], rows_read: int) -> pa.Table:
+        """
+        Valider un lot avec le validateur configuré et retourner la table nettoyée,
+        complétée des colonnes dérivées de textores
+        """
+        if settings.VALIDATOR_BACKEND == "arrow":
+            validator = ColumnarValidator(chunk, REQUIRED_COLUMNS)
+        else:
+            if isinstance(chunk, pa.Table):
+                chunk = chunk.to_pandas()
+            validator = DataValidator(chunk, REQUIRED_COLUMNS)
+
+        validation_result = validator.validate_all()
+        if not validation_result['valid']:
+            raise IngestError(
+                "Schéma invalide",
+                validation_result['errors'],
+                row_count=rows_read
+            )
+
+        if isinstance(validator, ColumnarValidator):
+            table = validator.clean_table().cast(SOURCE_SCHEMA)
+        else:
+            table = pa.Table.from_pandas(validator.clean_data(), schema=SOURCE_SCHEMA, preserve_index=False)
+        return with_textores_columns(table).cast(PARQUET_SCHEMA)
+
+    # ------------------------------------------------------------
+    # Étages parallèles (lecture → validation → écriture)
+    # ------------------------------------------------------------
+
+    def _iter_validated(self, chunk_factory) -> Iterator[Tuple[pa.Table, int]]:
+        """
+        Produire les lots validés et nettoyés (table, lignes lues) dans l'ordre du fichier
+        La lecture et la validation tournent dans deux threads reliés par des files
+        bornées (INGEST_QUEUE_DEPTH): un étage lent bloque les précédents, la mémoire
+        reste bornée. La première erreur d'un étage arrête tout et est relevée ici.
+        """
+        parsed = queue.Queue(maxsize=settings.INGEST_QUEUE_DEPTH)
+        validated = queue.Queue(maxsize=settings.INGEST_QUEUE_DEPTH)
+        stop = threading.Event()
+
+        threads = [
+            threading.Thread(target=self._parse_stage, args=(chunk_factory, parsed, stop),
+                             name="ingest-parse", daemon=True),
+            threading.Thread(target=self._validate_stage, args=(parsed, validated, stop),
+                             name="ingest-validate", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = validated.get()
+                if item is _END:
+                    return
+                if isinstance(item, _StageFailure):
+                    with _stage(item.message, status_code=400):
+                        raise item.error
+                yield item
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    def _parse_stage(self, chunk_factory, output: queue.Queue, stop: threading.Event):
+        rows_read = 0
+        try:
+            chunks = chunk_factory()
+            try:
+                for chunk in chunks:
+                    rows_read += len(chunk)
+                    if not _put(output, (chunk, rows_read), stop):
+                        return
+            finally:
+                chunks.close()
+            _put(output, _END, stop)
+        except Exception as e:
+            _put(output, _StageFailure(e, "Erreur de lecture du fichier"), stop)
+
+    def _validate_stage(self, source: queue.Queue, output: queue.Queue, stop: threading.Event):
+        while True:
+            item = _get(source, stop)
+            if item is None:
+                return
+            if item is _END or isinstance(item, _StageFailure):
+                _put(output, item, stop)
+                return
+            chunk, rows_read = item
+            try:
+                table = self._validate_chunk(chunk, rows_read)
+            except Exception as e:
+                _put(output, _StageFailure(e, "Erreur de validation du fichier"), stop)
+                return
+            if not _put(output, (table, rows_read), stop):
+                return
+
+    # ------------------------------------------------------------
+    # Exécution
+    # ------------------------------------------------------------
+
+    def _run_once(self, chunk_factory) -> Dict[str, Any]:
+        file_id = str(uuid.uuid4())
+        settings.PARQUET_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_writer = ParquetCacheWriter(file_id)
+
+        warnings = []
+        rows_read = 0
+        rows_staged = 0
+        rows_written = 0
+
+        # Mode "parquet": le cache est la source de vérité, aucune insertion dans results
+        # ni dans fact_results (load_coded_frame code directement le cache)
+        parquet_mode = parquet_storage_enabled()
+        loader = BulkLoader(self.session)
+        fact_loader = FactLoader(self.session)
+        db_error = None
+        writer = _ParquetWriterThread(cache_writer.staging_path, PARQUET_SCHEMA, settings.INGEST_QUEUE_DEPTH)
+        writer.start()
+
+        # Toutes les insertions du fichier forment une seule transaction
+        # (celle de la session, validée après l'enregistrement du File)
+        # Chaque étape libelle ses erreurs (_stage): lecture et validation (400, fichier
+        # du client), écriture du cache et dédoublonnage (500); UnicodeDecodeError
+        # remonte telle quelle pour une relecture avec un autre encodage (voir run)
+        try:
+            # 1-2. Lecture, validation et nettoyage dans des threads dédiés:
+            # le lot N+1 est parsé pendant que le lot N est validé et que
+            # le lot N-1 est écrit dans le Parquet de travail
+            with closing(self._iter_validated(chunk_factory)) as batches:
+                for table, rows_read in batches:
+                    self._report("writing", rows_read)
+                    writer.write(table)
+                    rows_staged += table.num_rows
+            writer.finish()
+
+            # 3. Doublons sur les valeurs exactes de la clé, regroupées par DuckDB
+            # sur le fichier de travail (toutes les occurrences après la première)
+            self._report("deduplicating", rows_read)
+            with _stage("Erreur de dédoublonnage"):
+                num_duplicates = cache_writer.find_duplicates(DUPLICATE_KEY)
+                rows_written = rows_staged - num_duplicates
+                preview_df = cache_writer.head(5).select(REQUIRED_COLUMNS).to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+
+            # 4. Mode table: insertion en base des lots dédoublonnés, résultats et table
+            # de faits codée (on continue sans la DB si elle échoue car on a le Parquet)
+            if not parquet_mode:
+                self._report("loading", rows_read)
+                first_row = 0
+                with _stage("Erreur de lecture du cache Parquet"):
+                    for table in cache_writer.iter_batches(self.chunk_rows):
+                        try:
+                            loader.load(table, file_id)
+                            fact_loader.load(table, file_id, first_row)
+                        except Exception as e:
+                            db_error = e
+                            self.session.rollback()
+                            break
+                        first_row += table.num_rows
+
+            # Tri, compression et partitionnement du cache puis publication atomique
+            self._report("publishing", rows_read)
+            with _stage("Erreur d'écriture du cache Parquet"):
+                cache_writer.publish(rows_written)
+        except BaseException:
+            writer.abort()
+            cache_writer.discard()
+            self.session.rollback()
+            raise
+
+        if num_duplicates > 0:
+            warnings.append({"message": f"{num_duplicates} doublons détectés et supprimés"})
+
+        # 5. Enregistrer les métadonnées du fichier et valider la transaction
+        self._report("committing", rows_read)
+        if db_error is None:
+            try:
+                file_record = FileModel(
+                    file_id=file_id,
+                    original_filename=self.original_filename,
+                    row_count=rows_written,
+                    status='completed',
+                    content_hash=self.content_hash
+                )
+                self.session.add(file_record)
+                self.session.commit()
+                # Les données du fichier viennent d'être (ré)écrites
+                table_cache.invalidate(file_id)
+                if parquet_mode:
+                    warnings.append({"message": f"✅ {rows_written} lignes disponibles (vue results sur le cache Parquet)"})
+                else:
+                    warnings.append({"message": f"✅ {rows_written} lignes insérées dans la base de données"})
+            except Exception as e:
+                db_error = e
+                self.session.rollback()
+
+        if parquet_mode and db_error is not None:
+            # Sans enregistrement dans files, le cache ne serait jamais visible
+            delete_cache(file_id)
+            raise IngestError("Erreur base de données", [{"message": str(db_error)}], status_code=500)
+
+        if parquet_mode:
+            try:
+                refresh_results_view(self.session.get_bind())
+            except Exception as e:
+                # Le fichier est enregistré: la prochaine reconstruction de la vue l'inclura
+                warnings.append({"message": f"⚠️ Vue results non rafraîchie: {str(e)}"})
+
+        if db_error is not None:
+            warnings.append({"message": f"⚠️ Erreur base de données: {str(db_error)}"})
+            print(f"⚠️ Erreur lors de l'insertion dans la base de données: {str(db_error)}")
+        else:
+            # Profil statistique calculé en arrière-plan (après la vue results en mode parquet)
+            file_profiles.schedule(file_id)
+
+        return {
+            "file_id": file_id,
+            "row_count": rows_written,
+            "encoding": self.encoding,
+            "preview_df": preview_df,
+            "warnings": warnings,
+            "reused": False
+        }
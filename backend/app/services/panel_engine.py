@@ -2,14 +2,18 @@
 # backend/app/services/panel_engine.py
 # ============================================================
 
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, List
-from collections import Counter
+
+from .dimensions import category_codes
 
 
 class PanelEngine:
     """
     Service pour analyser les panels de tests
+    numorden, nombre, nombre2 et date peuvent être des Categorical (codes
+    entiers, voir dimensions.py): les groupby utilisent observed=True
     """
     
     def __init__(self, df: pd.DataFrame):
@@ -20,7 +24,7 @@ class PanelEngine:
         Analyse complète des panels
         """
         # Grouper par patient et date
-        grouped = self.df.groupby(['numorden', 'date'])
+        grouped = self.df.groupby(['numorden', 'date'], observed=True)
         
         # Nombre de tests par patient-jour
         tests_per_day = grouped.size()
@@ -47,8 +51,7 @@ class PanelEngine:
         ]
         
         # Panels les plus fréquents (combinaisons de tests)
-        panel_combinations = grouped['nombre'].apply(lambda x: tuple(sorted(x)))
-        most_common_panels = panel_combinations.value_counts().head(10)
+        most_common_panels = self.panel_counts().head(10)
         
         panel_stats["most_common_panels"] = [
             {
@@ -70,6 +73,26 @@ class PanelEngine:
         
         return panel_stats
     
+    def panel_counts(self) -> pd.Series:
+        """
+        Occurrences de chaque panel (tuple trié des tests d'un patient-jour),
+        dans l'ordre de value_counts
+        Les tuples sont construits sur les codes entiers des tests (un tri
+        vectorisé, pas d'apply Python par groupe) puis décodés une fois par panel distinct
+        """
+        if len(self.df) == 0:
+            return pd.Series(dtype='int64')
+        
+        group_ids = self.df.groupby(['numorden', 'date'], observed=True).ngroup().to_numpy()
+        codes, labels = category_codes(self.df['nombre'])
+        order = np.lexsort((codes, group_ids))
+        boundaries = np.flatnonzero(np.diff(group_ids[order])) + 1
+        panels = pd.Series([tuple(chunk.tolist()) for chunk in np.split(codes[order], boundaries)])
+        
+        counts = panels.value_counts()
+        counts.index = [tuple(labels[list(panel)].tolist()) for panel in counts.index]
+        return counts
+    
     def _analyze_unique_tests_per_day(self) -> Dict[str, Any]:
         """
         Analyser les tests uniques par jour
@@ -78,7 +101,7 @@ class PanelEngine:
         - Tests uniques par patient-jour
         """
         # Tests uniques globaux par jour (tous patients confondus)
-        unique_tests_by_date = self.df.groupby('date')['nombre'].nunique()
+        unique_tests_by_date = self.df.groupby('date', observed=True)['nombre'].nunique()
         
         # Statistiques sur les tests uniques par jour
         stats = {
@@ -92,7 +115,7 @@ class PanelEngine:
         }
         
         # Tests uniques par patient-jour
-        grouped = self.df.groupby(['numorden', 'date'])
+        grouped = self.df.groupby(['numorden', 'date'], observed=True)
         unique_tests_per_patient_day = grouped['nombre'].nunique()
         
         stats["per_patient_day"] = {
@@ -120,9 +143,9 @@ class PanelEngine:
         """
         service_stats = []
         
-        for service, group in self.df.groupby('nombre2'):
+        for service, group in self.df.groupby('nombre2', observed=True):
             # Grouper par patient et date
-            grouped = group.groupby(['numorden', 'date'])
+            grouped = group.groupby(['numorden', 'date'], observed=True)
             tests_per_day = grouped.size()
             
             service_stats.append({
@@ -142,14 +165,8 @@ class PanelEngine:
         """
         Identifier les "templates" de panels (combinaisons récurrentes)
         """
-        # Grouper par patient et date
-        grouped = self.df.groupby(['numorden', 'date'])
-        
-        # Créer des tuples de tests ordonnés
-        panel_combinations = grouped['nombre'].apply(lambda x: tuple(sorted(x)))
-        
-        # Compter les occurrences
-        panel_counts = panel_combinations.value_counts()
+        # Compter les occurrences des combinaisons de tests par patient-jour
+        panel_counts = self.panel_counts()
         
         # Filtrer par fréquence minimale
         frequent_panels = panel_counts[panel_counts >= min_frequency]
@@ -0,0 +1,239 @@
+# ============================================================
+# backend/app/services/parquet_cache.py
+# ============================================================
+
+import os
+import shutil
+import duckdb
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import Iterator, List
+
+from ..core.config import settings
+from .textores_parser import TEXTORES_FIELDS, with_textores_columns
+
+
+# Colonnes du fichier d'origine
+SOURCE_SCHEMA = pa.schema([
+    ('numorden', pa.string()),
+    ('sexo', pa.string()),
+    ('edad', pa.int64()),
+    ('nombre', pa.string()),
+    ('textores', pa.string()),
+    ('nombre2', pa.string()),
+    ('Date', pa.timestamp('ns')),
+])
+
+# Schéma Parquet explicite: un lot où une colonne est entièrement vide
+# doit produire le même schéma que les autres lots
+# (colonnes d'origine puis colonnes dérivées de textores)
+PARQUET_SCHEMA = pa.schema(list(SOURCE_SCHEMA) + TEXTORES_FIELDS)
+
+# Ordre des lignes dans le cache: les recherches par patient et par période
+# ne lisent que les row groups dont les statistiques min/max correspondent
+SORT_KEY = ['numorden', 'Date']
+
+# Partitionnements hive disponibles (PARQUET_PARTITION_BY)
+PARTITION_COLUMNS = {
+    'month': "strftime(\"Date\", '%Y-%m')",
+    'nombre2': None,  # colonne existante
+}
+
+
+def cache_path(file_id: str) -> Path:
+    """
+    Chemin du cache d'un fichier: un fichier Parquet, ou un répertoire hive si partitionné
+    """
+    return settings.PARQUET_CACHE_DIR / f"{file_id}.parquet"
+
+
+def cache_exists(file_id: str) -> bool:
+    return cache_path(file_id).exists()
+
+
+def delete_cache(file_id: str):
+    _remove(cache_path(file_id))
+
+
+def cache_columns(file_id: str) -> List[str]:
+    """
+    Colonnes écrites dans le cache (schéma du premier fichier physique), [] sans cache
+    """
+    path = cache_path(file_id)
+    parts = sorted(path.rglob("*.parquet")) if path.is_dir() else [path] if path.exists() else []
+    return pq.read_schema(parts[0]).names if parts else []
+
+
+def read_cache(file_id: str, columns: List[str]) -> pa.Table:
+    """
+    Lire des colonnes du cache d'un fichier (partitionné ou non, colonnes de
+    partition hive gardées en chaînes)
+    """
+    path = cache_path(file_id)
+    source = path / "**" / "*.parquet" if path.is_dir() else path
+    select = ", ".join(f'"{name}"' for name in columns)
+    connection = duckdb.connect()
+    try:
+        return connection.execute(f"""
+            SELECT {select}
+            FROM read_parquet({_sql_literal(source)}, hive_partitioning = true, hive_types_autocast = false)
+        """).arrow()
+    finally:
+        connection.close()
+
+
+def upgrade_cache(file_id: str):
+    """
+    Réécrire un cache écrit avant l'ajout des colonnes dérivées (migration unique)
+    """
+    table = read_cache(file_id, SOURCE_SCHEMA.names)
+    writer = ParquetCacheWriter(file_id)
+    try:
+        pq.write_table(with_textores_columns(table.cast(SOURCE_SCHEMA)).cast(PARQUET_SCHEMA), writer.staging_path)
+        writer.publish(table.num_rows)
+    except Exception:
+        writer.discard()
+        raise
+
+
+class ParquetCacheWriter:
+    """
+    Publication d'un fichier dans PARQUET_CACHE_DIR
+    Les lots sont d'abord écrits tels quels dans un fichier de travail, puis
+    DuckDB réécrit l'ensemble trié par (numorden, Date) avec compression,
+    row groups de PARQUET_ROW_GROUP_SIZE lignes (statistiques min/max),
+    chaînes encodées en dictionnaire et partitionnement hive optionnel
+    Les doublons repérés par find_duplicates sont écartés de la lecture
+    (iter_batches) et de la publication
+    """
+
+    def __init__(self, file_id: str):
+        self.file_id = file_id
+        self.output_path = cache_path(file_id)
+        self.staging_path = settings.PARQUET_CACHE_DIR / f"{file_id}.parquet.staging"
+        self.tmp_path = settings.PARQUET_CACHE_DIR / f"{file_id}.parquet.tmp"
+        # Numéros de ligne (dans le fichier de travail) écartés, triés
+        self.excluded_rows = np.empty(0, dtype=np.int64)
+
+    def find_duplicates(self, key: List[str]) -> int:
+        """
+        Écarter les doublons de key (toutes les occurrences sauf la première,
+        dans l'ordre du fichier), comparés sur les valeurs exactes des colonnes
+        Le regroupement est fait par DuckDB, qui déborde sur disque si besoin:
+        seuls les numéros de ligne des doublons restent en mémoire
+        Retourne le nombre de doublons
+        """
+        columns = ", ".join(f'"{column}"' for column in key)
+        # Valeurs manquantes égales entre elles, comme pandas.duplicated
+        same_key = " AND ".join(f'r."{column}" IS NOT DISTINCT FROM g."{column}"' for column in key)
+        connection = duckdb.connect()
+        try:
+            self.excluded_rows = connection.execute(f"""
+                WITH rows AS (
+                    SELECT {columns}, file_row_number
+                    FROM read_parquet({_sql_literal(self.staging_path)}, file_row_number = true)
+                ),
+                groups AS (
+                    SELECT {columns}, min(file_row_number) AS first_row
+                    FROM rows GROUP BY ALL HAVING count(*) > 1
+                )
+                SELECT r.file_row_number
+                FROM rows AS r JOIN groups AS g ON {same_key}
+                WHERE r.file_row_number > g.first_row
+                ORDER BY r.file_row_number
+            """).fetchnumpy()['file_row_number'].astype(np.int64)
+        finally:
+            connection.close()
+        return len(self.excluded_rows)
+
+    def iter_batches(self, batch_rows: int) -> Iterator[pa.Table]:
+        """
+        Lots du fichier de travail dans l'ordre du fichier, doublons écartés
+        """
+        parquet_file = pq.ParquetFile(self.staging_path)
+        first_row = 0
+        for batch in parquet_file.iter_batches(batch_size=batch_rows):
+            table = pa.Table.from_batches([batch])
+            rows = np.arange(first_row, first_row + table.num_rows, dtype=np.int64)
+            first_row += table.num_rows
+            if len(self.excluded_rows) > 0:
+                table = table.filter(pa.array(~np.isin(rows, self.excluded_rows)))
+            if table.num_rows > 0:
+                yield table
+
+    def head(self, limit: int) -> pa.Table:
+        """
+        Premières lignes du fichier de travail, doublons écartés
+        """
+        batches = []
+        rows = 0
+        for table in self.iter_batches(limit):
+            batches.append(table)
+            rows += table.num_rows
+            if rows >= limit:
+                break
+        if not batches:
+            return pq.read_schema(self.staging_path).empty_table()
+        return pa.concat_tables(batches).slice(0, limit)
+
+    def publish(self, row_count: int):
+        """
+        Trier et réécrire le fichier de travail puis le publier atomiquement
+        """
+        partition_by = settings.PARQUET_PARTITION_BY
+        if partition_by and partition_by not in PARTITION_COLUMNS:
+            raise ValueError(f"PARQUET_PARTITION_BY invalide: {partition_by}")
+
+        select = "* EXCLUDE (file_row_number)"
+        options = [
+            "FORMAT PARQUET",
+            f"COMPRESSION {settings.PARQUET_COMPRESSION}",
+            f"ROW_GROUP_SIZE {settings.PARQUET_ROW_GROUP_SIZE}",
+        ]
+        # Un fichier vide reste un fichier Parquet unique (pas de partition à créer)
+        if partition_by and row_count > 0:
+            expression = PARTITION_COLUMNS[partition_by]
+            if expression is not None:
+                select = f"{select}, {expression} AS {partition_by}"
+            options.append(f"PARTITION_BY ({partition_by})")
+
+        order_by = ", ".join(f'"{column}"' for column in SORT_KEY)
+        connection = duckdb.connect()
+        try:
+            connection.register('excluded_rows', pa.table({'file_row_number': self.excluded_rows}))
+            connection.execute(f"""
+                COPY (
+                    SELECT {select}
+                    FROM read_parquet({_sql_literal(self.staging_path)}, file_row_number = true)
+                    WHERE file_row_number NOT IN (SELECT file_row_number FROM excluded_rows)
+                    ORDER BY {order_by}
+                ) TO {_sql_literal(self.tmp_path)} ({', '.join(options)})
+            """)
+        finally:
+            connection.close()
+
+        # Seule une migration (upgrade_cache) remplace un cache existant
+        if self.output_path.is_dir() or self.tmp_path.is_dir():
+            _remove(self.output_path)
+        os.replace(self.tmp_path, self.output_path)
+        _remove(self.staging_path)
+
+    def discard(self):
+        """
+        Supprimer les fichiers de travail après un échec
+        """
+        _remove(self.staging_path)
+        _remove(self.tmp_path)
+
+
+def _sql_literal(path: Path) -> str:
+    return "'" + str(path).replace("'", "''") + "'"
+
+
+def _remove(path: Path):
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
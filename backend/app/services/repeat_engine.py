@@ -6,10 +6,14 @@ import pandas as pd
 from typing import Dict, Any, List
 import numpy as np
 
+from .dimensions import category_codes
+
 
 class RepeatEngine:
     """
     Service pour analyser les tests répétés
+    numorden et nombre peuvent être des Categorical (codes entiers, voir
+    dimensions.py): les groupby utilisent observed=True
     """
     
     def __init__(self, df: pd.DataFrame):
@@ -22,7 +26,7 @@ class RepeatEngine:
         Analyse complète des tests répétés
         """
         # Grouper par patient et test
-        grouped = self.df.groupby(['numorden', 'nombre'])
+        grouped = self.df.groupby(['numorden', 'nombre'], observed=True)
         
         # Compter les occurrences
         repeat_counts = grouped.size()
@@ -39,7 +43,7 @@ class RepeatEngine:
             "patients_with_repeats": int(patients_with_repeats),
             "patients_with_repeats_pct": float(patients_with_repeats / total_patients * 100),
             "total_repeat_instances": int(len(repeated_tests)),
-            "avg_repeats_per_patient": float(repeated_tests.groupby(level=0).size().mean()) if len(repeated_tests) > 0 else 0
+            "avg_repeats_per_patient": float(repeated_tests.groupby(level=0, observed=True).size().mean()) if len(repeated_tests) > 0 else 0
         }
         
         # Tests les plus répétés
@@ -61,11 +65,11 @@ class RepeatEngine:
         Obtenir les tests les plus fréquemment répétés
         """
         # Grouper par test et compter les patients avec répétitions
-        grouped = self.df.groupby(['numorden', 'nombre']).size()
+        grouped = self.df.groupby(['numorden', 'nombre'], observed=True).size()
         repeated = grouped[grouped > 1]
         
         # Compter par test
-        test_repeat_counts = repeated.groupby(level='nombre').size()
+        test_repeat_counts = repeated.groupby(level='nombre', observed=True).size()
         top_repeated = test_repeat_counts.sort_values(ascending=False).head(top_n)
         
         result = []
@@ -88,19 +92,17 @@ class RepeatEngine:
         """
         Analyser les intervalles entre répétitions
         """
-        all_intervals = []
+        # Trier par (patient, test, date) sur les codes entiers: les intervalles
+        # sont les écarts entre dates consécutives d'un même couple patient-test
+        patient_codes, _ = category_codes(self.df['numorden'])
+        test_codes, _ = category_codes(self.df['nombre'])
+        days = self.df['date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        order = np.lexsort((days, test_codes, patient_codes))
         
-        # Pour chaque patient et test
-        for (patient, test), group in self.df.groupby(['numorden', 'nombre']):
-            if len(group) > 1:
-                dates = sorted(group['date'])
-                
-                # Calculer les intervalles
-                for i in range(1, len(dates)):
-                    delta_days = (dates[i] - dates[i-1]).days
-                    all_intervals.append(delta_days)
+        same_pair = (np.diff(patient_codes[order]) == 0) & (np.diff(test_codes[order]) == 0)
+        all_intervals = np.diff(days[order])[same_pair]
         
-        if not all_intervals:
+        if len(all_intervals) == 0:
             return {
                 "total_intervals": 0,
                 "avg_interval_days": None,
@@ -128,7 +130,7 @@ class RepeatEngine:
         """
         patterns = []
         
-        for (patient, test), group in self.df.groupby(['numorden', 'nombre']):
+        for (patient, test), group in self.df.groupby(['numorden', 'nombre'], observed=True):
             if len(group) >= min_repeats:
                 dates = sorted(group['date'])
                 
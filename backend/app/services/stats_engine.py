@@ -2,9 +2,67 @@
 # backend/app/services/stats_engine.py
 # ============================================================
 
+import math
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 from typing import Dict, Any, List, Optional
+from sqlalchemy import DateTime, String
+from sqlmodel import Session
+
+from .column_catalog import is_numeric
+from .textores_parser import TEXTORES_COLUMNS, KIND_CENSORED, KIND_NUMERIC, KIND_TEXT, parse_textores
+from .hyperloglog import estimate, register_expressions
+from ..core.config import settings
+from ..db.base import get_duckdb_connection
+from ..db.models import Result
+
+# Colonnes exclues des statistiques: colonnes système et colonnes dérivées de
+# textores (utilisées uniquement pour ses taux qualitatifs)
+EXCLUDED_COLUMNS = ['id', 'file_id', 'created_at'] + TEXTORES_COLUMNS
+
+# Colonnes analysées par le résumé (textores_num/textores_kind: taux qualitatifs de textores)
+SUMMARY_COLUMNS = ['numorden', 'sexo', 'edad', 'nombre', 'textores', 'textores_num', 'textores_kind', 'nombre2', 'date']
+
+# Colonnes du résumé des valeurs manquantes
+MISSING_COLUMNS = ['numorden', 'sexo', 'edad', 'nombre', 'textores', 'nombre2', 'date']
+
+# Nombre de valeurs des distributions de SqlStatsEngine:
+# value_counts().head(10) dans le résumé, head(20) dans les statistiques d'une colonne
+DISTRIBUTION_SIZE = 10
+COLUMN_DISTRIBUTION_SIZE = 20
+
+# Nombre de classes (de même largeur, entre min et max) de l'histogramme des
+# colonnes numériques dans les statistiques d'une colonne, comme numpy.histogram
+COLUMN_HISTOGRAM_BINS = 20
+
+# Colonne de regroupement des esquisses par service
+SKETCH_SERVICE_COLUMN = 'nombre2'
+
+# Version du format des esquisses: une esquisse d'un autre format n'est plus fusionnable
+SKETCH_FORMAT = 2
+
+# Précision du résumé (StatsRequest.accuracy)
+# - exact: quantiles et distributions calculés sur toutes les lignes
+# - approximate: quantiles estimés par reservoir_quantile; colonnes catégorielles
+#   de plus de STATS_EXACT_CARDINALITY valeurs distinctes: cardinalité estimée par
+#   HyperLogLog sur toutes les lignes (approx_count_distinct), distribution sur un
+#   échantillon de Bernoulli d'environ STATS_SAMPLE_SIZE lignes; les autres
+#   colonnes, compteurs, moyennes et extrêmes restent exacts
+ACCURACY_EXACT = "exact"
+ACCURACY_APPROXIMATE = "approximate"
+
+# Clé de la cardinalité des valeurs textuelles de textores (voir SqlStatsEngine._cardinalities)
+TEXTORES_TEXT_KEY = 'textores_text'
+
+# Champs estimés en mode approximate, par type de colonne
+APPROXIMATE_NUMERIC_FIELDS = ['median', 'q25', 'q75']
+APPROXIMATE_CATEGORICAL_FIELDS = ['unique', 'top_value', 'top_freq', 'top_freq_pct', 'distribution']
+APPROXIMATE_TEXTORES_FIELDS = [
+    'qualitative_rates.numeric_stats.median',
+    'qualitative_rates.text_stats.unique_text_values',
+    'qualitative_rates.text_stats.top_text_values',
+]
 
 
 def convert_numpy_types(obj: Any) -> Any:
@@ -16,9 +74,9 @@ def convert_numpy_types(obj: Any) -> Any:
                         np.int16, np.int32, np.int64, np.uint8, np.uint16,
                         np.uint32, np.uint64)):
         return int(obj)
-    elif isinstance(obj, (np.floating, np.float_, np.float16, np.float32, np.float64)):
+    elif isinstance(obj, (np.floating, np.float16, np.float32, np.float64)):
         return float(obj)
-    elif isinstance(obj, (np.bool_, np.bool)):
+    elif isinstance(obj, np.bool_):
         return bool(obj)
     elif isinstance(obj, np.ndarray):
         return obj.tolist()
@@ -32,6 +90,27 @@ def convert_numpy_types(obj: Any) -> Any:
         return obj
 
 
+def missing_summary(total_rows: int, missing_counts: Dict[str, int]) -> List[Dict[str, Any]]:
+    """
+    Résumé des valeurs manquantes (champ missing_summary de compute_full_summary)
+    à partir des compteurs par colonne
+    """
+    missing_stats = [
+        {
+            "column": col,
+            "missing_count": missing_count,
+            "missing_pct": float(missing_count / total_rows * 100)
+        }
+        for col, missing_count in missing_counts.items()
+        if missing_count > 0  # Ne garder que les colonnes avec des valeurs manquantes
+    ]
+
+    # Trier par pourcentage décroissant
+    missing_stats.sort(key=lambda x: x['missing_pct'], reverse=True)
+
+    return missing_stats
+
+
 class StatsEngine:
     """
     Service pour calculer les statistiques descriptives
@@ -47,7 +126,7 @@ class StatsEngine:
         if columns is None:
             # Exclure les colonnes système
             columns = [col for col in self.df.columns 
-                      if col not in ['id', 'file_id', 'created_at']]
+                      if col not in EXCLUDED_COLUMNS]
         
         summary = {
             "overview": self._compute_overview(),
@@ -74,7 +153,7 @@ class StatsEngine:
         """Vue d'ensemble des données"""
         return {
             "total_rows": len(self.df),
-            "total_columns": len(self.df.columns),
+            "total_columns": len([col for col in self.df.columns if col not in TEXTORES_COLUMNS]),
             "memory_usage_mb": float(self.df.memory_usage(deep=True).sum() / 1024 / 1024)
         }
     
@@ -118,26 +197,40 @@ class StatsEngine:
     
     def _compute_textores_qualitative_rates(self, series: pd.Series) -> Dict[str, Any]:
         """
-        Calculer les taux qualitatifs pour textores (détecter valeurs numériques vs textuelles)
+        Calculer les taux qualitatifs pour textores (valeurs numériques, censurées
+        comme "<5", textuelles) à partir des colonnes typées calculées à l'ingestion
+        Sans ces colonnes dans le DataFrame, textores est analysé à la volée
         """
-        # Détecter les valeurs numériques
-        numeric_mask = series.astype(str).str.strip().str.match(r'^-?\d+\.?\d*$', na=False)
+        if 'textores_kind' in self.df.columns and 'textores_num' in self.df.columns:
+            kinds = self.df['textores_kind']
+            numbers = self.df['textores_num']
+        else:
+            parsed = parse_textores(pa.array(series.to_numpy(dtype=object), type=pa.string(), from_pandas=True))
+            kinds = pd.Series(parsed['textores_kind'].to_numpy(), index=series.index)
+            numbers = pd.Series(parsed['textores_num'].to_numpy(), index=series.index)
+        
+        numeric_mask = kinds == KIND_NUMERIC
+        censored_mask = kinds == KIND_CENSORED
+        text_mask = kinds == KIND_TEXT
         numeric_count = numeric_mask.sum()
-        text_count = (~numeric_mask & series.notna()).sum()
+        censored_count = censored_mask.sum()
+        text_count = text_mask.sum()
         total_valid = series.notna().sum()
         
         rates = {
             "numeric_count": int(numeric_count),
+            "censored_count": int(censored_count),
             "text_count": int(text_count),
             "numeric_rate": float(numeric_count / total_valid * 100) if total_valid > 0 else 0,
+            "censored_rate": float(censored_count / total_valid * 100) if total_valid > 0 else 0,
             "text_rate": float(text_count / total_valid * 100) if total_valid > 0 else 0,
-            "mixed_type": bool(numeric_count > 0 and text_count > 0)  # Convertir explicitement en bool Python
+            "mixed_type": bool(numeric_count + censored_count > 0 and text_count > 0)
         }
         
         # Si valeurs numériques présentes, calculer des stats numériques
+        # (valeurs exactes uniquement: la borne d'un résultat censuré n'est pas sa valeur)
         if numeric_count > 0:
-            numeric_values = pd.to_numeric(series[numeric_mask], errors='coerce')
-            numeric_values = numeric_values.dropna()
+            numeric_values = numbers[numeric_mask].dropna()
             if len(numeric_values) > 0:
                 rates["numeric_stats"] = {
                     "mean": float(numeric_values.mean()),
@@ -149,7 +242,7 @@ class StatsEngine:
         
         # Statistiques sur les valeurs textuelles
         if text_count > 0:
-            text_values = series[~numeric_mask & series.notna()]
+            text_values = series[text_mask]
             text_value_counts = text_values.value_counts()
             rates["text_stats"] = {
                 "unique_text_values": int(text_values.nunique()),
@@ -164,7 +257,7 @@ class StatsEngine:
         missing_stats = []
         
         for col in self.df.columns:
-            if col not in ['id', 'file_id', 'created_at']:
+            if col not in EXCLUDED_COLUMNS:
                 missing_count = self.df[col].isna().sum()
                 missing_pct = (missing_count / len(self.df)) * 100
                 
@@ -178,4 +271,656 @@ class StatsEngine:
         # Trier par pourcentage décroissant
         missing_stats.sort(key=lambda x: x['missing_pct'], reverse=True)
         
-        return missing_stats
\ No newline at end of file
+        return missing_stats
+
+
+class SqlStatsEngine:
+    """
+    Statistiques descriptives calculées dans DuckDB (même réponse que StatsEngine)
+    Une seule requête d'agrégation sur les lignes du fichier: compteurs,
+    moments, quantiles, cardinalités et distributions de toutes les colonnes,
+    sans charger les lignes dans pandas
+    accuracy="approximate": le résumé n'utilise plus ni tri complet ni table
+    de hachage des colonnes à forte cardinalité (voir ACCURACY_APPROXIMATE)
+    """
+
+    def __init__(self, session: Session, file_id: str, columns: List[str],
+                 accuracy: str = ACCURACY_EXACT):
+        # columns: colonnes analysables (équivalent des colonnes du DataFrame de StatsEngine)
+        self.session = session
+        self.file_id = file_id
+        self.columns = columns
+        self.accuracy = accuracy
+        # Mode approximate: nombre de lignes et cardinalités estimées (voir _cardinalities)
+        self._estimates: Optional[Dict[str, int]] = None
+
+    def compute_full_summary(self, columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Calculer un résumé complet des statistiques
+        """
+        if columns is None:
+            # Exclure les colonnes système
+            columns = [col for col in self.columns if col not in EXCLUDED_COLUMNS]
+        columns = [col for col in dict.fromkeys(columns) if col in self.columns]
+
+        row = self._aggregate(columns, DISTRIBUTION_SIZE)
+        total_rows = row["total_rows"]
+
+        summary = {
+            "overview": {
+                "total_rows": total_rows,
+                "total_columns": len([col for col in self.columns if col not in TEXTORES_COLUMNS]),
+                # Taille des colonnes au format Arrow (les lignes ne sont pas chargées dans pandas)
+                "memory_usage_mb": float(row["memory_bytes"] or 0) / 1024 / 1024
+            },
+            "numeric_stats": {},
+            "categorical_stats": {},
+            "missing_summary": self._missing_summary(row, total_rows)
+        }
+
+        for index, col in enumerate(columns):
+            if is_numeric(col):
+                summary["numeric_stats"][col] = self._numeric_stats(row, index, total_rows)
+            else:
+                summary["categorical_stats"][col] = self._categorical_stats(row, index, col, total_rows)
+
+        return convert_numpy_types(summary)
+
+    def approximate_fields(self, columns: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """
+        Champs estimés du résumé de compute_full_summary: {colonne: [champs]}
+        ("overview" pour la vue d'ensemble), vide en mode exact
+        """
+        if self.accuracy != ACCURACY_APPROXIMATE:
+            return {}
+        if columns is None:
+            columns = [col for col in self.columns if col not in EXCLUDED_COLUMNS]
+
+        fields = {"overview": ["memory_usage_mb"]}
+        for col in dict.fromkeys(columns):
+            if col not in self.columns:
+                continue
+            if is_numeric(col):
+                fields[col] = list(APPROXIMATE_NUMERIC_FIELDS)
+                continue
+            fields[col] = [] if self._exact_frequencies(col) else list(APPROXIMATE_CATEGORICAL_FIELDS)
+            if col == 'textores':
+                fields[col] += [
+                    field for field in APPROXIMATE_TEXTORES_FIELDS
+                    if field.endswith('.median') or not self._exact_frequencies(TEXTORES_TEXT_KEY)
+                ]
+            if not fields[col]:
+                del fields[col]
+        return fields
+
+    def _cardinalities(self) -> Dict[str, int]:
+        """
+        Mode approximate: nombre de lignes du fichier ("total_rows") et cardinalité
+        estimée de chaque colonne catégorielle (TEXTORES_TEXT_KEY: valeurs textuelles
+        de textores) par HyperLogLog sur toutes les lignes, en une requête
+        """
+        if self._estimates is None:
+            connection = get_duckdb_connection(self.session)
+            self._estimates = {"total_rows": connection.execute(
+                "SELECT count(*) FROM results WHERE file_id = ?", [self.file_id]
+            ).fetchone()[0]}
+
+            # Une branche par colonne (valeurs non nulles), registres groupés par colonne
+            branches = [(col, f'"{col}"', "") for col in self.columns if not is_numeric(col)]
+            if 'textores' in self.columns:
+                branches.append((TEXTORES_TEXT_KEY, "textores", f" AND textores_kind = '{KIND_TEXT}'"))
+            if branches:
+                precision = settings.STATS_HLL_PRECISION
+                bucket, rank = register_expressions("h", precision)
+                hashed = " UNION ALL ".join(
+                    f"SELECT '{key}' AS key, hash({value}) AS h FROM results "
+                    f"WHERE file_id = ? AND {value} IS NOT NULL{condition}"
+                    for key, value, condition in branches
+                )
+                rows = connection.execute(
+                    f"""
+                    WITH hashed AS ({hashed}),
+                    registers AS (
+                        SELECT key, {bucket} AS bucket, max({rank}) AS rank FROM hashed GROUP BY ALL
+                    )
+                    SELECT key, count(*), sum(pow(2.0, -rank)) FROM registers GROUP BY key
+                    """,
+                    [self.file_id] * len(branches)
+                ).fetchall()
+                estimates = {row[0]: estimate(row[1], row[2], precision) for row in rows}
+                for key, _, _ in branches:
+                    self._estimates[key] = estimates.get(key, 0)
+        return self._estimates
+
+    def _exact_frequencies(self, key: str) -> bool:
+        # Peu de valeurs distinctes: le GROUP BY sur toutes les lignes reste petit
+        return self._cardinalities()[key] <= settings.STATS_EXACT_CARDINALITY
+
+    def compute_column_stats(self, columns: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Statistiques détaillées de plusieurs colonnes (réponse de /stats/{file_id}/column),
+        en une requête: {colonne: stats}
+        """
+        columns = [col for col in dict.fromkeys(columns) if col in self.columns]
+        row = self._aggregate(columns, COLUMN_DISTRIBUTION_SIZE, column_stats=True)
+        total_rows = row["total_rows"]
+
+        stats = {}
+        for index, col in enumerate(columns):
+            count = row[f"count_{index}"]
+            missing = total_rows - count
+            top_values = _top_values(row[f"top_{index}"])
+            column_stats = {
+                "type": "numeric" if is_numeric(col) else "categorical",
+                "count": count,
+                "missing": missing,
+                "missing_pct": float(missing / total_rows * 100) if total_rows else None,
+            }
+            if is_numeric(col):
+                quantiles = row[f"quantiles_{index}"] or [None, None, None]
+                column_stats.update({
+                    "mean": _float(row[f"mean_{index}"]) if count > 0 else None,
+                    "std": _float(row[f"std_{index}"]) if count > 0 else None,
+                    "min": _float(row[f"min_{index}"]) if count > 0 else None,
+                    "max": _float(row[f"max_{index}"]) if count > 0 else None,
+                    "median": _float(quantiles[1]) if count > 0 else None,
+                    "q25": _float(quantiles[0]) if count > 0 else None,
+                    "q75": _float(quantiles[2]) if count > 0 else None,
+                    "distribution": top_values,
+                    "histogram": self._histogram(row, index) if count > 0 else None
+                })
+            else:
+                column_stats.update({
+                    "unique": row[f"unique_{index}"] or 0,
+                    "top": next(iter(top_values), None),
+                    "freq": next(iter(top_values.values()), 0),
+                    "distribution": top_values
+                })
+            stats[col] = column_stats
+
+        return stats
+
+    def compute_sketches(self) -> Dict[str, Any]:
+        """
+        Esquisses fusionnables du fichier (voir services/stats_sketches.py):
+        {"all": esquisse, "services": {service: esquisse}}
+        Trois requêtes groupées par GROUPING SETS (fichier entier et chaque service):
+        - moyennes et moments centrés (écarts à la moyenne du fichier), extrêmes et compteurs
+        - histogrammes logarithmiques des colonnes numériques (quantiles à erreur relative bornée)
+        - SKETCH_TOP_K valeurs les plus fréquentes des colonnes catégorielles
+        Plus une requête pour les registres HyperLogLog des colonnes catégorielles
+        (cardinalité d'une fusion de plusieurs fichiers)
+        """
+        columns = [col for col in self.columns if col not in EXCLUDED_COLUMNS]
+        numeric = [(f"_{index}", f"CAST(\"{col}\" AS DOUBLE)", f"\"{col}\" IS NOT NULL")
+                   for index, col in enumerate(columns) if is_numeric(col)]
+        categorical = [(f"_{index}", f"CAST(\"{col}\" AS VARCHAR)", f"\"{col}\" IS NOT NULL")
+                       for index, col in enumerate(columns) if not is_numeric(col)]
+        aggregates = ["count(*) AS total_rows", f"{self._memory_expression()} AS memory_bytes"]
+        aggregates += [f'count("{col}") AS "present_{col}"' for col in columns]
+        shifts = []
+        for key, value, condition in numeric:
+            aggregates.extend(_moment_aggregates(value, condition, key))
+            shifts.append(_shift_aggregate(value, condition, key))
+        if 'textores' in columns:
+            # Valeurs exactes uniquement, comme pour les taux qualitatifs du résumé
+            numbers = f"textores_kind = '{KIND_NUMERIC}'"
+            numeric.append(("_textores", "textores_num", numbers))
+            categorical.append(("_text", "textores", f"textores_kind = '{KIND_TEXT}'"))
+            aggregates += [
+                f"count_if(textores_kind = '{kind}') AS {kind}_count"
+                for kind in (KIND_NUMERIC, KIND_CENSORED, KIND_TEXT)
+            ]
+            aggregates.extend(_moment_aggregates("textores_num", numbers, "_textores"))
+            shifts.append(_shift_aggregate("textores_num", numbers, "_textores"))
+
+        # Bin logarithmique signé: x > 0 tombe dans "+i" avec i = ceil(log_gamma(x)),
+        # x < 0 dans "-i" avec i = ceil(log_gamma(-x)), 0 dans "0"
+        alpha = settings.SKETCH_RELATIVE_ACCURACY
+        log_gamma = math.log((1 + alpha) / (1 - alpha))
+        service = f'"{SKETCH_SERVICE_COLUMN}"'
+        shift_source = f", (SELECT {', '.join(shifts)} FROM rows)" if shifts else ""
+
+        connection = get_duckdb_connection(self.session)
+        scalars = connection.execute(
+            f"WITH rows AS (SELECT * FROM results WHERE file_id = ?) "
+            f"SELECT grouping({service}) AS grouped, {service} AS service, {', '.join(aggregates)} "
+            f"FROM rows{shift_source} GROUP BY GROUPING SETS ((), ({service}))",
+            [self.file_id]
+        )
+        names = [description[0] for description in scalars.description]
+        rows = [dict(zip(names, values)) for values in scalars.fetchall()]
+
+        bins, tops, registers = [], [], []
+        if numeric:
+            bins = connection.execute(f"""
+                WITH rows AS (SELECT * FROM results WHERE file_id = ?),
+                values AS ({" UNION ALL ".join(
+                    f"SELECT {service} AS service, '{key}' AS key, "
+                    f"CASE WHEN {value} > 0 THEN '+' || CAST(ceil(ln({value}) / {log_gamma!r}) AS BIGINT) "
+                    f"WHEN {value} < 0 THEN '-' || CAST(ceil(ln(-{value}) / {log_gamma!r}) AS BIGINT) "
+                    f"ELSE '0' END AS bin FROM rows WHERE {condition}"
+                    for key, value, condition in numeric
+                )})
+                SELECT grouping(service) AS grouped, service, key, bin, count(*) AS freq
+                FROM values GROUP BY GROUPING SETS ((key, bin), (service, key, bin))
+            """, [self.file_id]).fetchall()
+        if categorical:
+            # Effectifs du fichier entier sommés depuis ceux des services (bien moins
+            # de lignes que les valeurs), puis SKETCH_TOP_K plus fréquents par max_by
+            tops = connection.execute(f"""
+                WITH rows AS (SELECT * FROM results WHERE file_id = ?),
+                values AS ({" UNION ALL ".join(
+                    f"SELECT {service} AS service, '{key}' AS key, {value} AS value FROM rows WHERE {condition}"
+                    for key, value, condition in categorical
+                )}),
+                by_service AS MATERIALIZED (
+                    SELECT service, key, value, count(*) AS freq FROM values GROUP BY service, key, value
+                ),
+                frequencies AS (
+                    SELECT 0 AS grouped, service, key, value, freq FROM by_service
+                    UNION ALL
+                    SELECT 1 AS grouped, NULL AS service, key, value, sum(freq) AS freq FROM by_service GROUP BY key, value
+                )
+                SELECT grouped, service, key, count(*) AS uniq, sum(freq) AS total,
+                       max_by({{'value': value, 'freq': freq}}, freq, {settings.SKETCH_TOP_K}) AS top
+                FROM frequencies
+                GROUP BY grouped, service, key
+            """, [self.file_id]).fetchall()
+            precision = settings.SKETCH_HLL_PRECISION
+            bucket, rank = register_expressions("h", precision)
+            registers = connection.execute(f"""
+                WITH rows AS (SELECT * FROM results WHERE file_id = ?),
+                values AS ({" UNION ALL ".join(
+                    f"SELECT {service} AS service, '{key}' AS key, hash({value}) AS h FROM rows WHERE {condition}"
+                    for key, value, condition in categorical
+                )}),
+                ranked AS (SELECT service, key, {bucket} AS bucket, {rank} AS rank FROM values)
+                SELECT grouping(service) AS grouped, service, key, bucket, max(rank) AS rank
+                FROM ranked GROUP BY GROUPING SETS ((key, bucket), (service, key, bucket))
+            """, [self.file_id]).fetchall()
+
+        # Services: lignes dont le service est renseigné
+        sketches = {}
+        for row in rows:
+            if row["grouped"] == 0 and row["service"] is None:
+                continue
+            sketch = {
+                "relative_accuracy": alpha,
+                "hll_precision": settings.SKETCH_HLL_PRECISION,
+                "format": SKETCH_FORMAT,
+                "total_rows": row["total_rows"],
+                "total_columns": len([col for col in self.columns if col not in TEXTORES_COLUMNS]),
+                "memory_bytes": float(row["memory_bytes"] or 0),
+                "present": {col: row[f"present_{col}"] for col in columns},
+                "numeric": {},
+                "categorical": {},
+            }
+            for key, _, _ in numeric:
+                sketch["numeric"][key] = {
+                    "count": row[f"count{key}"],
+                    **_central_moments(
+                        row[f"count{key}"], row[f"offset{key}"],
+                        [_float(row[f"sum{power}{key}"]) or 0.0 for power in range(1, 5)]
+                    ),
+                    "min": _float(row[f"min{key}"]),
+                    "max": _float(row[f"max{key}"]),
+                    "bins": {},
+                }
+            if 'textores' in columns:
+                sketch["textores_kinds"] = {kind: row[f"{kind}_count"] for kind in (KIND_NUMERIC, KIND_CENSORED, KIND_TEXT)}
+            sketches[(row["grouped"], row["service"])] = sketch
+
+        for grouped, service_name, key, bin_key, freq in bins:
+            sketch = sketches.get((grouped, service_name))
+            if sketch is not None:
+                sketch["numeric"][key]["bins"][bin_key] = freq
+        for grouped, service_name, key, unique, total, top in tops:
+            sketch = sketches.get((grouped, service_name))
+            if sketch is not None:
+                top_values = _top_values(top)
+                sketch["categorical"][key] = {
+                    "unique": unique,
+                    "top": top_values,
+                    # Effectif des valeurs hors de top (0: distribution complète)
+                    "other": int(total) - sum(top_values.values()),
+                    # Registres HyperLogLog non vides {registre: rang} (clés texte, comme en JSON)
+                    "registers": {},
+                }
+        for grouped, service_name, key, bucket_index, bucket_rank in registers:
+            sketch = sketches.get((grouped, service_name))
+            if sketch is not None and key in sketch["categorical"]:
+                sketch["categorical"][key]["registers"][str(bucket_index)] = bucket_rank
+
+        # Clés des colonnes: nom de la colonne (textores_num: valeurs numériques
+        # exactes de textores, textores_text: ses valeurs textuelles)
+        names = {f"_{index}": col for index, col in enumerate(columns)}
+        names.update({"_textores": "textores_num", "_text": "textores_text"})
+        for sketch in sketches.values():
+            sketch["numeric"] = {names[key]: value for key, value in sketch["numeric"].items()}
+            sketch["categorical"] = {names[key]: value for key, value in sketch["categorical"].items()}
+
+        return {
+            "all": sketches.get((1, None)),
+            "services": {service_name: sketch for (grouped, service_name), sketch in sketches.items() if grouped == 0},
+        }
+
+    def _aggregate(self, columns: List[str], distribution_size: int,
+                   column_stats: bool = False) -> Dict[str, Any]:
+        """
+        Requête unique sur les lignes du fichier (CTE rows):
+        - stats: agrégats scalaires (compteurs, moments, quantiles)
+        - frequencies: effectifs par valeur des colonnes catégorielles
+          (et numériques pour column_stats), GROUP BY par colonne rassemblés par UNION ALL
+        - tops: cardinalité et valeurs les plus fréquentes de chaque colonne
+        En mode approximate (résumé uniquement), la taille mémoire et les effectifs
+        des colonnes à forte cardinalité sont calculés sur l'échantillon sampled
+        puis extrapolés, leur cardinalité estimée sur toutes les lignes (HyperLogLog)
+        """
+        approximate = self.accuracy == ACCURACY_APPROXIMATE and not column_stats
+        aggregates = ["count(*) AS total_rows"]
+        # (clé, expression de la valeur, condition) des distributions
+        frequencies = []
+        # Clés des distributions estimées sur l'échantillon -> clé de leur cardinalité
+        estimated = {}
+        # (clé, expression de la valeur) des histogrammes
+        histograms = []
+
+        # Taille et valeurs manquantes de toutes les colonnes: résumé uniquement
+        # (les statistiques d'une colonne ne lisent que cette colonne)
+        if not column_stats:
+            if not approximate:
+                aggregates.append(f"{self._memory_expression()} AS memory_bytes")
+            for col in self.columns:
+                if col not in EXCLUDED_COLUMNS:
+                    aggregates.append(f'count("{col}") AS present_{col}')
+
+        for index, col in enumerate(columns):
+            quoted = f'"{col}"'
+            aggregates.append(f"count({quoted}) AS count_{index}")
+            if is_numeric(col):
+                aggregates.extend(_numeric_aggregates(f"CAST({quoted} AS DOUBLE)", f"_{index}", approximate))
+                if column_stats:
+                    histograms.append((f"_{index}", f"CAST({quoted} AS DOUBLE)"))
+            if column_stats or not is_numeric(col):
+                value = f"CAST({quoted} AS VARCHAR)"
+                if column_stats and isinstance(Result.__table__.columns[col].type, DateTime):
+                    # Clés JSON des horodatages au format ISO, comme pour pandas
+                    value = f"replace({value}, ' ', 'T')"
+                frequencies.append((f"_{index}", value, f"{quoted} IS NOT NULL"))
+                if approximate and not self._exact_frequencies(col):
+                    estimated[f"_{index}"] = col
+            if col == 'textores' and not column_stats:
+                aggregates.extend(self._textores_aggregates(approximate))
+                frequencies.append(("_text", "textores", f"textores_kind = '{KIND_TEXT}'"))
+                if approximate and not self._exact_frequencies(TEXTORES_TEXT_KEY):
+                    estimated["_text"] = TEXTORES_TEXT_KEY
+
+        ctes = [
+            "rows AS (SELECT * FROM results WHERE file_id = ?)",
+            f"stats AS (SELECT {', '.join(aggregates)} FROM rows)",
+        ]
+        projections = ["stats.*"]
+        sources = ["stats"]
+        if approximate:
+            # Échantillon de Bernoulli d'environ STATS_SAMPLE_SIZE lignes: un tirage
+            # par ligne pendant le parcours, sans réservoir à maintenir
+            total_rows = self._cardinalities()["total_rows"]
+            percentage = min(100.0, settings.STATS_SAMPLE_SIZE / max(total_rows, 1) * 100)
+            selected = ", ".join(f'"{col}"' for col in self.columns) or "*"
+            ctes.append(
+                f"sampled AS (SELECT {selected} FROM rows "
+                f"USING SAMPLE bernoulli({percentage:.6f}%) REPEATABLE (42))"
+            )
+            ctes.append(f"sampling AS (SELECT count(*) AS sample_rows, {self._memory_expression()} AS memory_bytes FROM sampled)")
+            projections.append("sampling.*")
+            sources.append("sampling")
+        if frequencies:
+            ctes.append("frequencies AS (" + " UNION ALL ".join(
+                f"SELECT '{key}' AS key, {value} AS value, count(*) AS freq "
+                f"FROM {'sampled' if key in estimated else 'rows'} WHERE {condition} GROUP BY value"
+                for key, value, condition in frequencies
+            ) + ")")
+            # Fréquence décroissante, puis valeur
+            ctes.append(f"""tops AS (
+                SELECT key, count(*) AS uniq,
+                       list({{'value': value, 'freq': freq}} ORDER BY freq DESC, value)
+                           FILTER (WHERE rank <= {distribution_size}) AS top
+                FROM (
+                    SELECT *, row_number() OVER (PARTITION BY key ORDER BY freq DESC, value) AS rank
+                    FROM frequencies
+                )
+                GROUP BY key
+            )""")
+            for key, _, _ in frequencies:
+                projections.append(f"(SELECT uniq FROM tops WHERE key = '{key}') AS unique{key}")
+                projections.append(f"(SELECT top FROM tops WHERE key = '{key}') AS top{key}")
+        if histograms:
+            # Classes de même largeur entre min et max (dernière classe fermée);
+            # colonne constante: intervalle [v - 0.5, v + 0.5] comme numpy.histogram
+            bins = COLUMN_HISTOGRAM_BINS
+            ctes.append("histograms AS (" + " UNION ALL ".join(
+                f"SELECT '{key}' AS key, least(CAST(floor(({value} - low) / (high - low) * {bins}) AS INTEGER), {bins - 1}) AS bin, "
+                f"count(*) AS freq "
+                f"FROM rows, (SELECT CASE WHEN max{key} > min{key} THEN min{key} ELSE min{key} - 0.5 END AS low, "
+                f"CASE WHEN max{key} > min{key} THEN max{key} ELSE max{key} + 0.5 END AS high FROM stats) "
+                f"WHERE {value} IS NOT NULL GROUP BY bin"
+                for key, value in histograms
+            ) + ")")
+            for key, _ in histograms:
+                projections.append(
+                    f"(SELECT list({{'bin': bin, 'freq': freq}}) FROM histograms WHERE key = '{key}') AS histogram{key}"
+                )
+
+        connection = get_duckdb_connection(self.session)
+        cursor = connection.execute(
+            f"WITH {', '.join(ctes)} SELECT {', '.join(projections)} FROM {', '.join(sources)}",
+            [self.file_id]
+        )
+        names = [description[0] for description in cursor.description]
+        row = dict(zip(names, cursor.fetchone()))
+
+        if approximate and row["sample_rows"]:
+            # Effectifs de l'échantillon extrapolés au fichier
+            scale = row["total_rows"] / row["sample_rows"]
+            row["memory_bytes"] = row["memory_bytes"] * scale
+            for key, name in estimated.items():
+                # Cardinalité sur toutes les lignes: l'échantillon ne voit qu'une
+                # partie des valeurs rares
+                row[f"unique{key}"] = min(self._cardinalities()[name], row["total_rows"])
+                row[f"top{key}"] = [
+                    {'value': entry['value'], 'freq': round(entry['freq'] * scale)}
+                    for entry in row[f"top{key}"] or []
+                ]
+        return row
+
+    def _textores_aggregates(self, approximate: bool = False) -> List[str]:
+        aggregates = [
+            f"count_if(textores_kind = '{kind}') AS {kind}_count"
+            for kind in (KIND_NUMERIC, KIND_CENSORED, KIND_TEXT)
+        ]
+        # Valeurs exactes uniquement: la borne d'un résultat censuré n'est pas sa valeur
+        numbers = f"textores_num) FILTER (WHERE textores_kind = '{KIND_NUMERIC}'"
+        aggregates.extend([
+            f"count({numbers}) AS count_textores",
+            f"avg({numbers}) AS mean_textores",
+            f"stddev_samp({numbers}) AS std_textores",
+            f"min({numbers}) AS min_textores",
+            f"max({numbers}) AS max_textores",
+            (f"reservoir_quantile(textores_num, 0.5, {settings.STATS_SAMPLE_SIZE}) "
+             f"FILTER (WHERE textores_kind = '{KIND_NUMERIC}') AS median_textores"
+             if approximate else f"median({numbers}) AS median_textores"),
+        ])
+        return aggregates
+
+    def _histogram(self, row: Dict[str, Any], index: int) -> Dict[str, List]:
+        """
+        Histogramme calculé dans DuckDB: bornes des classes et effectifs (classes vides comprises)
+        """
+        low, high = float(row[f"min_{index}"]), float(row[f"max_{index}"])
+        if low == high:
+            low, high = low - 0.5, high + 0.5
+        counts = [0] * COLUMN_HISTOGRAM_BINS
+        for entry in row[f"histogram_{index}"] or []:
+            counts[entry['bin']] = entry['freq']
+        return {
+            "bin_edges": np.linspace(low, high, COLUMN_HISTOGRAM_BINS + 1).tolist(),
+            "counts": counts
+        }
+
+    def _memory_expression(self) -> str:
+        # Données + offsets (4 octets) pour les chaînes, largeur fixe sinon
+        parts = []
+        for col in self.columns:
+            if isinstance(Result.__table__.columns[col].type, String):
+                parts.append(f'coalesce(sum(strlen("{col}")), 0) + 4 * count(*)')
+            else:
+                parts.append(f"{4 if col == 'date' else 8} * count(*)")
+        return " + ".join(parts) if parts else "0"
+
+    def _numeric_stats(self, row: Dict[str, Any], index: int, total_rows: int) -> Dict[str, Any]:
+        """Statistiques pour colonnes numériques"""
+        count = row[f"count_{index}"]
+        missing = total_rows - count
+        quantiles = row[f"quantiles_{index}"] or [None, None, None]
+        return {
+            "count": count,
+            "missing": missing,
+            "missing_pct": float(missing / total_rows * 100) if total_rows else None,
+            "mean": _float(row[f"mean_{index}"]) if count > 0 else None,
+            "std": _float(row[f"std_{index}"]) if count > 0 else None,
+            "min": _float(row[f"min_{index}"]) if count > 0 else None,
+            "max": _float(row[f"max_{index}"]) if count > 0 else None,
+            "median": _float(quantiles[1]) if count > 0 else None,
+            "q25": _float(quantiles[0]) if count > 0 else None,
+            "q75": _float(quantiles[2]) if count > 0 else None,
+            "skew": _float(row[f"skew_{index}"]) if count > 2 else None,
+            "kurtosis": _float(row[f"kurtosis_{index}"]) if count > 3 else None
+        }
+
+    def _categorical_stats(self, row: Dict[str, Any], index: int, col: str, total_rows: int) -> Dict[str, Any]:
+        """Statistiques pour colonnes catégorielles"""
+        count = row[f"count_{index}"]
+        missing = total_rows - count
+        top_values = _top_values(row[f"top_{index}"])
+        top_freq = next(iter(top_values.values()), 0)
+
+        stats = {
+            "count": count,
+            "missing": missing,
+            "missing_pct": float(missing / total_rows * 100) if total_rows else None,
+            "unique": row[f"unique_{index}"] or 0,
+            "top_value": next(iter(top_values), None),
+            "top_freq": top_freq,
+            "top_freq_pct": float(top_freq / count * 100) if count > 0 else 0,
+            "distribution": top_values
+        }
+
+        if col == 'textores':
+            stats["qualitative_rates"] = self._textores_qualitative_rates(row, count)
+
+        return stats
+
+    def _textores_qualitative_rates(self, row: Dict[str, Any], total_valid: int) -> Dict[str, Any]:
+        """
+        Taux qualitatifs de textores (mêmes clés que StatsEngine), à partir des
+        colonnes typées calculées à l'ingestion
+        """
+        numeric_count = row[f"{KIND_NUMERIC}_count"]
+        censored_count = row[f"{KIND_CENSORED}_count"]
+        text_count = row[f"{KIND_TEXT}_count"]
+
+        rates = {
+            "numeric_count": numeric_count,
+            "censored_count": censored_count,
+            "text_count": text_count,
+            "numeric_rate": float(numeric_count / total_valid * 100) if total_valid > 0 else 0,
+            "censored_rate": float(censored_count / total_valid * 100) if total_valid > 0 else 0,
+            "text_rate": float(text_count / total_valid * 100) if total_valid > 0 else 0,
+            "mixed_type": bool(numeric_count + censored_count > 0 and text_count > 0)
+        }
+
+        if row["count_textores"]:
+            rates["numeric_stats"] = {
+                "mean": _float(row["mean_textores"]),
+                "std": _float(row["std_textores"]),
+                "min": _float(row["min_textores"]),
+                "max": _float(row["max_textores"]),
+                "median": _float(row["median_textores"])
+            }
+
+        if text_count > 0:
+            rates["text_stats"] = {
+                "unique_text_values": row["unique_text"] or 0,
+                "top_text_values": _top_values(row["top_text"])
+            }
+
+        return convert_numpy_types(rates)
+
+    def _missing_summary(self, row: Dict[str, Any], total_rows: int) -> List[Dict[str, Any]]:
+        """Résumé des valeurs manquantes"""
+        return missing_summary(total_rows, {
+            col: total_rows - row[f"present_{col}"] for col in self.columns if col not in EXCLUDED_COLUMNS
+        })
+
+
+def _numeric_aggregates(expression: str, suffix: str, approximate: bool = False) -> List[str]:
+    # Comme pandas: asymétrie et aplatissement nuls pour une colonne constante
+    # Quantiles approchés: échantillon réservoir (sans tri de toutes les valeurs)
+    quantiles = (f"reservoir_quantile({expression}, [0.25, 0.5, 0.75], {settings.STATS_SAMPLE_SIZE})"
+                 if approximate else f"quantile_cont({expression}, [0.25, 0.5, 0.75])")
+    return [
+        f"avg({expression}) AS mean{suffix}",
+        f"stddev_samp({expression}) AS std{suffix}",
+        f"min({expression}) AS min{suffix}",
+        f"max({expression}) AS max{suffix}",
+        f"{quantiles} AS quantiles{suffix}",
+        f"CASE WHEN var_pop({expression}) = 0 THEN 0 ELSE skewness({expression}) END AS skew{suffix}",
+        f"CASE WHEN var_pop({expression}) = 0 THEN 0 ELSE kurtosis({expression}) END AS kurtosis{suffix}",
+    ]
+
+
+def _moment_aggregates(expression: str, condition: str, suffix: str) -> List[str]:
+    # Sommes des puissances 1 à 4 de l'écart au décalage shift{suffix} (moyenne du
+    # fichier): moments centrés sans compensation catastrophique si |moyenne| >> écart-type
+    centered = f"({expression} - shift{suffix})"
+    aggregates = [f"count({expression}) FILTER (WHERE {condition}) AS count{suffix}"]
+    aggregates += [
+        f"sum({' * '.join([centered] * power)}) FILTER (WHERE {condition}) AS sum{power}{suffix}"
+        for power in range(1, 5)
+    ]
+    aggregates += [
+        f"min({expression}) FILTER (WHERE {condition}) AS min{suffix}",
+        f"max({expression}) FILTER (WHERE {condition}) AS max{suffix}",
+        f"any_value(shift{suffix}) AS offset{suffix}",
+    ]
+    return aggregates
+
+
+def _shift_aggregate(expression: str, condition: str, suffix: str) -> str:
+    return f"coalesce(avg({expression}) FILTER (WHERE {condition}), 0) AS shift{suffix}"
+
+
+def _central_moments(count: int, shift: float, sums: List[float]) -> Dict[str, float]:
+    """
+    Moyenne et sommes des puissances 2 à 4 des écarts à la moyenne, à partir des
+    sommes des puissances des écarts au décalage (proche de la moyenne: stable)
+    """
+    if not count:
+        return {"mean": 0.0, "m2": 0.0, "m3": 0.0, "m4": 0.0}
+    s1, s2, s3, s4 = sums
+    d = s1 / count
+    return {
+        "mean": shift + d,
+        "m2": max(s2 - count * d ** 2, 0.0),
+        "m3": s3 - 3 * d * s2 + 2 * count * d ** 3,
+        "m4": s4 - 4 * d * s3 + 6 * d ** 2 * s2 - 3 * count * d ** 4,
+    }
+
+
+def _top_values(entries: Optional[List[Dict[str, Any]]]) -> Dict[str, int]:
+    return {entry['value']: entry['freq'] for entry in entries or []}
+
+
+def _float(value: Optional[float]) -> Optional[float]:
+    return float(value) if value is not None else None
@@ -0,0 +1,367 @@
+# ============================================================
+# backend/app/services/stats_sketches.py
+# ============================================================
+
+import math
+from typing import Any, Dict, List, Optional
+
+from .stats_engine import (
+    APPROXIMATE_CATEGORICAL_FIELDS, APPROXIMATE_NUMERIC_FIELDS, DISTRIBUTION_SIZE,
+    EXCLUDED_COLUMNS, convert_numpy_types
+)
+from .hyperloglog import estimate_registers, merge_registers
+from .textores_parser import KIND_CENSORED, KIND_NUMERIC, KIND_TEXT
+
+# Esquisse d'un fichier (ou d'un service d'un fichier), calculée par
+# SqlStatsEngine.compute_sketches et conservée dans son profil:
+# - format (SKETCH_FORMAT), total_rows, total_columns, memory_bytes,
+#   present: {colonne: valeurs renseignées}
+# - numeric: {colonne: {count, mean, m2, m3, m4, min, max, bins}}
+#   m2, m3, m4: sommes des puissances des écarts à la moyenne (moments centrés)
+#   bins: histogramme logarithmique (quantiles à erreur relative relative_accuracy)
+# - categorical: {colonne: {unique, top: {valeur: effectif}, other, registers}}
+#   top: SKETCH_TOP_K valeurs les plus fréquentes, other: effectif des autres,
+#   registers: registres HyperLogLog non vides des valeurs (hll_precision)
+# - textores_kinds: effectifs par type de textores; numeric["textores_num"] et
+#   categorical["textores_text"]: valeurs numériques et textuelles de textores
+# Toutes ces grandeurs s'additionnent (les registres par maximum, les moments
+# centrés par les formules de Chan et Pébay): fusionner les esquisses de
+# plusieurs fichiers ne relit aucune ligne
+
+
+def merge_sketches(sketches: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Fusionner des esquisses (mêmes format, relative_accuracy et hll_precision),
+    ou None si la liste est vide
+    """
+    if not sketches:
+        return None
+
+    merged = {
+        "relative_accuracy": sketches[0]["relative_accuracy"],
+        "hll_precision": sketches[0]["hll_precision"],
+        "format": sketches[0].get("format"),
+        "total_rows": 0,
+        "total_columns": sketches[0]["total_columns"],
+        "memory_bytes": 0.0,
+        "present": {},
+        "numeric": {},
+        "categorical": {},
+    }
+    for sketch in sketches:
+        if (sketch["relative_accuracy"] != merged["relative_accuracy"]
+                or sketch["hll_precision"] != merged["hll_precision"]
+                or sketch.get("format") != merged["format"]):
+            raise ValueError("Esquisses calculées avec des précisions différentes")
+        merged["total_rows"] += sketch["total_rows"]
+        merged["memory_bytes"] += sketch["memory_bytes"]
+        for col, count in sketch["present"].items():
+            merged["present"][col] = merged["present"].get(col, 0) + count
+
+        for col, stats in sketch["numeric"].items():
+            target = merged["numeric"].setdefault(col, {
+                "count": 0, "mean": 0.0, "m2": 0.0, "m3": 0.0, "m4": 0.0, "min": None, "max": None, "bins": {}
+            })
+            target.update(_merge_moments(target, stats))
+            target["min"] = _extreme(min, target["min"], stats["min"])
+            target["max"] = _extreme(max, target["max"], stats["max"])
+            for bin_key, freq in stats["bins"].items():
+                target["bins"][bin_key] = target["bins"].get(bin_key, 0) + freq
+
+        for col, stats in sketch["categorical"].items():
+            target = merged["categorical"].setdefault(col, {"unique": 0, "top": {}, "other": 0, "registers": {}})
+            target["other"] += stats["other"]
+            for value, freq in stats["top"].items():
+                target["top"][value] = target["top"].get(value, 0) + freq
+            target["registers"] = merge_registers([target["registers"], stats["registers"]])
+
+        if "textores_kinds" in sketch:
+            kinds = merged.setdefault("textores_kinds", {})
+            for kind, count in sketch["textores_kinds"].items():
+                kinds[kind] = kinds.get(kind, 0) + count
+
+    # Cardinalité d'une fusion: exacte si toutes les distributions sont complètes,
+    # estimée par les registres fusionnés sinon (les valeurs de top sont distinctes)
+    for col, stats in merged["categorical"].items():
+        if stats["other"] == 0:
+            stats["unique"] = len(stats["top"])
+        elif len(sketches) == 1:
+            stats["unique"] = sketches[0]["categorical"][col]["unique"]
+        else:
+            estimated = estimate_registers(stats["registers"], merged["hll_precision"])
+            stats["unique"] = min(max(estimated, len(stats["top"])), len(stats["top"]) + stats["other"])
+    return merged
+
+
+class SketchStatsEngine:
+    """
+    Statistiques descriptives à partir d'une esquisse, éventuellement fusionnée
+    (même réponse que StatsEngine, sans relire les lignes)
+    - exacts: compteurs, valeurs manquantes, moyenne, écart-type, extrêmes,
+      asymétrie et aplatissement
+    - estimés: quantiles (erreur relative bornée), et distributions des colonnes
+      dont une esquisse ne conserve que les valeurs les plus fréquentes
+    """
+
+    def __init__(self, sketch: Dict[str, Any]):
+        self.sketch = sketch
+        alpha = sketch["relative_accuracy"]
+        self.gamma = (1 + alpha) / (1 - alpha)
+
+    def compute_full_summary(self, columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Calculer un résumé complet des statistiques
+        """
+        columns = self._columns(columns)
+        total_rows = self.sketch["total_rows"]
+
+        summary = {
+            "overview": {
+                "total_rows": total_rows,
+                "total_columns": self.sketch["total_columns"],
+                "memory_usage_mb": float(self.sketch["memory_bytes"]) / 1024 / 1024
+            },
+            "numeric_stats": {},
+            "categorical_stats": {},
+            "missing_summary": self._missing_summary(total_rows)
+        }
+
+        for col in columns:
+            if col in self.sketch["numeric"]:
+                summary["numeric_stats"][col] = self._numeric_stats(col, total_rows)
+            else:
+                summary["categorical_stats"][col] = self._categorical_stats(col, total_rows)
+
+        return convert_numpy_types(summary)
+
+    def approximate_fields(self, columns: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """
+        Champs estimés du résumé de compute_full_summary: {colonne: [champs]}
+        """
+        fields = {}
+        for col in self._columns(columns):
+            if col in self.sketch["numeric"]:
+                fields[col] = list(APPROXIMATE_NUMERIC_FIELDS)
+                continue
+            if self._categorical(col)["other"] > 0:
+                fields[col] = list(APPROXIMATE_CATEGORICAL_FIELDS)
+            if col == 'textores':
+                fields.setdefault(col, []).append('qualitative_rates.numeric_stats.median')
+                text = self.sketch["categorical"].get("textores_text")
+                if text is not None and text["other"] > 0:
+                    fields[col] += [
+                        'qualitative_rates.text_stats.unique_text_values',
+                        'qualitative_rates.text_stats.top_text_values',
+                    ]
+        return fields
+
+    def _columns(self, columns: Optional[List[str]]) -> List[str]:
+        available = [col for col in self.sketch["present"] if col not in EXCLUDED_COLUMNS]
+        if columns is None:
+            return available
+        return [col for col in dict.fromkeys(columns) if col in available]
+
+    def _categorical(self, col: str) -> Dict[str, Any]:
+        # Colonne sans valeur renseignée: absente des valeurs les plus fréquentes
+        return self.sketch["categorical"].get(col, {"unique": 0, "top": {}, "other": 0})
+
+    def _numeric_stats(self, col: str, total_rows: int) -> Dict[str, Any]:
+        """Statistiques pour colonnes numériques"""
+        stats = self.sketch["numeric"][col]
+        count = stats["count"]
+        missing = total_rows - count
+        moments = _moments(stats)
+        return {
+            "count": count,
+            "missing": missing,
+            "missing_pct": float(missing / total_rows * 100) if total_rows else None,
+            "mean": moments["mean"],
+            "std": moments["std"],
+            "min": stats["min"],
+            "max": stats["max"],
+            "median": self._quantile(stats, 0.5),
+            "q25": self._quantile(stats, 0.25),
+            "q75": self._quantile(stats, 0.75),
+            "skew": moments["skew"],
+            "kurtosis": moments["kurtosis"]
+        }
+
+    def _categorical_stats(self, col: str, total_rows: int) -> Dict[str, Any]:
+        """Statistiques pour colonnes catégorielles"""
+        stats = self._categorical(col)
+        count = self.sketch["present"][col]
+        missing = total_rows - count
+        top_values = _head(stats["top"], DISTRIBUTION_SIZE)
+        top_freq = next(iter(top_values.values()), 0)
+
+        result = {
+            "count": count,
+            "missing": missing,
+            "missing_pct": float(missing / total_rows * 100) if total_rows else None,
+            "unique": stats["unique"],
+            "top_value": next(iter(top_values), None),
+            "top_freq": top_freq,
+            "top_freq_pct": float(top_freq / count * 100) if count > 0 else 0,
+            "distribution": top_values
+        }
+
+        if col == 'textores' and "textores_kinds" in self.sketch:
+            result["qualitative_rates"] = self._textores_qualitative_rates(count)
+
+        return result
+
+    def _textores_qualitative_rates(self, total_valid: int) -> Dict[str, Any]:
+        """
+        Taux qualitatifs de textores (mêmes clés que StatsEngine)
+        """
+        kinds = self.sketch["textores_kinds"]
+        numeric_count = kinds[KIND_NUMERIC]
+        censored_count = kinds[KIND_CENSORED]
+        text_count = kinds[KIND_TEXT]
+
+        rates = {
+            "numeric_count": numeric_count,
+            "censored_count": censored_count,
+            "text_count": text_count,
+            "numeric_rate": float(numeric_count / total_valid * 100) if total_valid > 0 else 0,
+            "censored_rate": float(censored_count / total_valid * 100) if total_valid > 0 else 0,
+            "text_rate": float(text_count / total_valid * 100) if total_valid > 0 else 0,
+            "mixed_type": bool(numeric_count + censored_count > 0 and text_count > 0)
+        }
+
+        numbers = self.sketch["numeric"].get("textores_num")
+        if numbers is not None and numbers["count"]:
+            moments = _moments(numbers)
+            rates["numeric_stats"] = {
+                "mean": moments["mean"],
+                "std": moments["std"],
+                "min": numbers["min"],
+                "max": numbers["max"],
+                "median": self._quantile(numbers, 0.5)
+            }
+
+        text = self.sketch["categorical"].get("textores_text")
+        if text_count > 0 and text is not None:
+            rates["text_stats"] = {
+                "unique_text_values": text["unique"],
+                "top_text_values": _head(text["top"], DISTRIBUTION_SIZE)
+            }
+
+        return rates
+
+    def _missing_summary(self, total_rows: int) -> List[Dict[str, Any]]:
+        """Résumé des valeurs manquantes"""
+        missing_stats = []
+
+        for col, present in self.sketch["present"].items():
+            missing_count = total_rows - present
+            if missing_count > 0:  # Ne garder que les colonnes avec des valeurs manquantes
+                missing_stats.append({
+                    "column": col,
+                    "missing_count": missing_count,
+                    "missing_pct": float(missing_count / total_rows * 100)
+                })
+
+        # Trier par pourcentage décroissant
+        missing_stats.sort(key=lambda x: x['missing_pct'], reverse=True)
+
+        return missing_stats
+
+    def _quantile(self, stats: Dict[str, Any], q: float) -> Optional[float]:
+        """
+        Quantile d'un histogramme logarithmique: valeur représentative du bin
+        contenant le rang q * (count - 1), bornée par les extrêmes exacts
+        """
+        if not stats["count"]:
+            return None
+        rank = q * (stats["count"] - 1)
+        cumulated = 0
+        for bin_key in sorted(stats["bins"], key=_bin_order):
+            cumulated += stats["bins"][bin_key]
+            if cumulated > rank:
+                value = self._bin_value(bin_key)
+                return float(min(max(value, stats["min"]), stats["max"]))
+        return stats["max"]
+
+    def _bin_value(self, bin_key: str) -> float:
+        # Bin i: valeurs de ]gamma^(i-1), gamma^i], représentées avec une erreur relative <= alpha
+        if bin_key == "0":
+            return 0.0
+        magnitude = 2 * self.gamma ** int(bin_key[1:]) / (self.gamma + 1)
+        return magnitude if bin_key[0] == "+" else -magnitude
+
+
+def _merge_moments(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compteur, moyenne et moments centrés de l'union de deux ensembles de valeurs
+    (formules par paires de Chan et Pébay: pas de compensation entre grandes sommes)
+    """
+    na, nb = a["count"], b["count"]
+    if not nb:
+        return {key: a[key] for key in ("count", "mean", "m2", "m3", "m4")}
+    if not na:
+        return {key: b[key] for key in ("count", "mean", "m2", "m3", "m4")}
+    n = na + nb
+    delta = b["mean"] - a["mean"]
+    return {
+        "count": n,
+        "mean": a["mean"] + delta * nb / n,
+        "m2": a["m2"] + b["m2"] + delta ** 2 * na * nb / n,
+        "m3": (a["m3"] + b["m3"] + delta ** 3 * na * nb * (na - nb) / n ** 2
+               + 3 * delta * (na * b["m2"] - nb * a["m2"]) / n),
+        "m4": (a["m4"] + b["m4"] + delta ** 4 * na * nb * (na ** 2 - na * nb + nb ** 2) / n ** 3
+               + 6 * delta ** 2 * (na ** 2 * b["m2"] + nb ** 2 * a["m2"]) / n ** 2
+               + 4 * delta * (na * b["m3"] - nb * a["m3"]) / n),
+    }
+
+
+def _moments(stats: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """
+    Moyenne, écart-type (n-1), asymétrie et aplatissement (estimateurs de pandas)
+    à partir des moments centrés
+    """
+    n = stats["count"]
+    if not n:
+        return {"mean": None, "std": None, "skew": None, "kurtosis": None}
+    mean = stats["mean"]
+    # Moments centrés
+    m2 = max(stats["m2"] / n, 0.0)
+    m3 = stats["m3"] / n
+    m4 = stats["m4"] / n
+
+    # Comme pandas: asymétrie et aplatissement nuls pour une colonne constante
+    # (écarts à la moyenne réduits aux erreurs d'arrondi de la moyenne)
+    constant = m2 <= 1e-20 * max(mean ** 2, 1.0)
+    skew = None
+    kurtosis = None
+    if n > 2:
+        skew = 0.0 if constant else math.sqrt(n * (n - 1)) / (n - 2) * m3 / m2 ** 1.5
+    if n > 3:
+        kurtosis = 0.0 if constant else (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * (m4 / m2 ** 2 - 3) + 6)
+    return {
+        "mean": mean,
+        "std": math.sqrt(m2 * n / (n - 1)) if n > 1 else None,
+        "skew": skew,
+        "kurtosis": kurtosis,
+    }
+
+
+def _bin_order(bin_key: str):
+    # Valeurs négatives (magnitude décroissante), zéro, puis positives
+    if bin_key == "0":
+        return (1, 0)
+    index = int(bin_key[1:])
+    return (0, -index) if bin_key[0] == "-" else (2, index)
+
+
+def _head(values: Dict[str, int], size: int) -> Dict[str, int]:
+    # Fréquence décroissante, puis valeur (comme SqlStatsEngine)
+    return dict(sorted(values.items(), key=lambda item: (-item[1], item[0]))[:size])
+
+
+def _extreme(function, current: Optional[float], value: Optional[float]) -> Optional[float]:
+    if current is None:
+        return value
+    if value is None:
+        return current
+    return function(current, value)
@@ -0,0 +1,97 @@
+# ============================================================
+# backend/app/services/table_cache.py
+# ============================================================
+
+import threading
+import pyarrow as pa
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+from ..core.config import settings
+
+
+class ArrowTableCache:
+    """
+    Cache mémoire (par processus) des tables Arrow d'un fichier
+    Les requêtes d'une même page (stats, panels, repeats, coorder...) portent sur
+    le même file_id: la table n'est lue qu'une fois dans DuckDB, les requêtes
+    suivantes sont exécutées sur la copie en mémoire
+    - budget en octets (TABLE_CACHE_MAX_BYTES), éviction LRU
+    - clé: (source, file_id), source = table lue ("results", "fact_results")
+    - invalidate() à la suppression ou à la réécriture d'un fichier
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._tables: "OrderedDict[Tuple[str, str], pa.Table]" = OrderedDict()
+        self._bytes = 0
+        # Une lecture commencée avant invalidate() ne doit pas être mise en cache
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, source: str, file_id: str, loader: Callable[[], pa.Table]) -> pa.Table:
+        """
+        Table en cache, ou chargée par loader() puis mise en cache si elle tient dans le budget
+        """
+        if not self.enabled:
+            return loader()
+
+        key = (source, file_id)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                self.hits += 1
+                return table
+            self.misses += 1
+            generation = self._generations.get(file_id, 0)
+
+        table = loader()
+        self._put(key, table, generation)
+        return table
+
+    def invalidate(self, file_id: str):
+        """
+        Retirer toutes les tables d'un fichier
+        """
+        with self._lock:
+            self._generations[file_id] = self._generations.get(file_id, 0) + 1
+            for key in [key for key in self._tables if key[1] == file_id]:
+                self._bytes -= self._tables.pop(key).nbytes
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._tables),
+                "size_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _put(self, key: Tuple[str, str], table: pa.Table, generation: int):
+        size = table.nbytes
+        with self._lock:
+            # Table trop grande pour le budget, déjà chargée par une autre requête ou périmée
+            if size > self.max_bytes or key in self._tables or self._generations.get(key[1], 0) != generation:
+                return
+            self._tables[key] = table
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._tables.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+
+# Instance unique partagée par les routes, les ingestions et les suppressions
+table_cache = ArrowTableCache(settings.TABLE_CACHE_MAX_BYTES)
@@ -0,0 +1,149 @@
+# ============================================================
+# backend/app/services/textores_parser.py
+# ============================================================
+
+import uuid
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Dict, List, Union
+from sqlalchemy.engine import Engine
+
+# Colonnes dérivées de textores, calculées une fois à l'ingestion
+# - textores_num: valeur numérique (borne pour un résultat censuré "<5")
+# - textores_cmp: comparateur ('<', '<=', '>', '>='), nul sinon
+# - textores_kind: 'numeric' | 'censored' | 'text' | 'missing'
+TEXTORES_FIELDS = [
+    pa.field('textores_num', pa.float64()),
+    pa.field('textores_cmp', pa.string()),
+    pa.field('textores_kind', pa.string()),
+]
+TEXTORES_COLUMNS = [field.name for field in TEXTORES_FIELDS]
+
+KIND_NUMERIC = 'numeric'
+KIND_CENSORED = 'censored'
+KIND_TEXT = 'text'
+KIND_MISSING = 'missing'
+
+# Migration ponctuelle des données ingérées avant les colonnes dérivées (schema_migrations)
+TEXTORES_MIGRATION = "textores_columns"
+
+# Comparateur optionnel puis nombre, virgule ou point décimal: "12,3", "<5", ">= 1000", ".5"
+NUMERIC_PATTERN = r'^(?P<cmp><=|>=|<|>)?\s*(?P<num>[+-]?(?:\d+(?:[.,]\d*)?|[.,]\d+))$'
+
+_NULL_STRING = pa.scalar(None, pa.string())
+
+
+def parse_textores(values: Union[pa.Array, pa.ChunkedArray]) -> Dict[str, pa.ChunkedArray]:
+    """
+    Analyser une colonne textores (vectorisé, sans boucle Python)
+    Retourne {textores_num, textores_cmp, textores_kind}
+    """
+    if isinstance(values, pa.Array):
+        values = pa.chunked_array([values], type=values.type)
+    trimmed = pc.utf8_trim_whitespace(pc.cast(values, pa.string()))
+
+    # Ligne sans correspondance -> struct nul (ses champs valent '')
+    match = pc.extract_regex(trimmed, NUMERIC_PATTERN)
+    matched = pc.fill_null(pc.is_valid(match), False)
+    number = pc.replace_substring(pc.struct_field(match, 'num'), ',', '.')
+    comparator = pc.struct_field(match, 'cmp')
+    censored = pc.fill_null(pc.and_(matched, pc.not_equal(comparator, '')), False)
+
+    missing = pc.fill_null(pc.equal(trimmed, ''), True)
+    kind = pc.if_else(censored, KIND_CENSORED, pc.if_else(
+        matched, KIND_NUMERIC, pc.if_else(missing, KIND_MISSING, KIND_TEXT)
+    ))
+
+    return {
+        'textores_num': pc.cast(pc.if_else(matched, number, _NULL_STRING), pa.float64()),
+        'textores_cmp': pc.if_else(censored, comparator, _NULL_STRING),
+        'textores_kind': kind,
+    }
+
+
+def with_textores_columns(table: pa.Table) -> pa.Table:
+    """
+    Ajouter (ou remplacer) les colonnes dérivées de textores
+    """
+    table = table.drop_columns([name for name in TEXTORES_COLUMNS if name in table.column_names])
+    for name, column in parse_textores(table['textores']).items():
+        table = table.append_column(name, column)
+    return table
+
+
+def backfill_textores_columns(bind: Engine):
+    """
+    Compléter les données ingérées avant l'ajout des colonnes dérivées:
+    caches Parquet réécrits une fois, lignes de la table results mises à jour
+    (les lignes de fact_results sont recodées par backfill_fact_tables)
+    Exécutée une seule fois (TEXTORES_MIGRATION): toute ingestion ultérieure
+    écrit déjà ces colonnes
+    """
+    # Imports locaux: parquet_cache et la couche db importent ce module
+    from .parquet_cache import cache_columns, upgrade_cache
+    from ..db.base import migration_applied, record_migration
+    from ..db.results_view import parquet_storage_enabled, refresh_results_view
+
+    if migration_applied(TEXTORES_MIGRATION):
+        return
+
+    with bind.connect() as connection:
+        file_ids = [
+            row[0] for row in connection.exec_driver_sql(
+                "SELECT file_id FROM files WHERE status = 'completed'"
+            ).fetchall()
+        ]
+    upgraded = []
+    for file_id in file_ids:
+        columns = cache_columns(file_id)
+        if columns and 'textores_kind' not in columns:
+            upgrade_cache(file_id)
+            upgraded.append(file_id)
+    if upgraded:
+        print(f"✅ Colonnes textores ajoutées au cache Parquet de {len(upgraded)} fichier(s)")
+
+    file_ids = []
+    if not parquet_storage_enabled():
+        file_ids = _backfill_results(bind)
+        if file_ids:
+            print(f"✅ Colonnes textores renseignées dans results pour {len(file_ids)} fichier(s)")
+
+    # Données réécrites: les profils statistiques de ces fichiers sont périmés
+    rewritten = sorted(set(upgraded) | set(file_ids))
+    if rewritten:
+        with bind.begin() as connection:
+            connection.connection.dbapi_connection.execute(
+                "UPDATE files SET data_version = data_version + 1 WHERE file_id IN (SELECT unnest(?::VARCHAR[]))",
+                [rewritten]
+            )
+
+    # La vue results lit les colonnes textores dans les caches réécrits
+    if upgraded and parquet_storage_enabled():
+        refresh_results_view(bind)
+    record_migration(TEXTORES_MIGRATION)
+
+
+def _backfill_results(bind: Engine) -> List[str]:
+    # Lignes de la table results sans colonnes textores, mises à jour fichier par fichier
+    with bind.begin() as connection:
+        native = connection.connection.dbapi_connection
+        file_ids = [row[0] for row in native.execute(
+            "SELECT DISTINCT file_id FROM results WHERE textores_kind IS NULL"
+        ).fetchall()]
+        for file_id in file_ids:
+            table = native.execute("SELECT id, textores FROM results WHERE file_id = ?", [file_id]).arrow()
+            parsed = pa.table({'id': table['id'], **parse_textores(pc.fill_null(table['textores'], ''))})
+            view_name = f"_textores_{uuid.uuid4().hex}"
+            native.register(view_name, parsed)
+            try:
+                native.execute(f"""
+                    UPDATE results
+                    SET textores_num = v.textores_num,
+                        textores_cmp = v.textores_cmp,
+                        textores_kind = v.textores_kind
+                    FROM {view_name} AS v
+                    WHERE results.id = v.id
+                """)
+            finally:
+                native.unregister(view_name)
+    return file_ids
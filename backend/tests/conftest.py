@@ -0,0 +1,63 @@
+# backend/tests/conftest.py
+"""
+Configuration commune des tests: base DuckDB et caches dans un répertoire
+temporaire, fixés avant le premier import de app (settings est lu à l'import)
+"""
+import io
+import os
+import tempfile
+from pathlib import Path
+
+_DATA_DIR = Path(tempfile.mkdtemp(prefix="lablens-tests-"))
+os.environ["DATA_DIR"] = str(_DATA_DIR)
+os.environ["PARQUET_CACHE_DIR"] = str(_DATA_DIR / "parquet_cache")
+os.environ["ARROW_CACHE_DIR"] = str(_DATA_DIR / "arrow_cache")
+os.environ["DUCKDB_PATH"] = str(_DATA_DIR / "lablens.duckdb")
+
+import pytest
+from sqlmodel import Session
+
+
+@pytest.fixture(scope="session")
+def engine():
+    from app.db.base import engine, init_db
+    init_db()
+    return engine
+
+
+@pytest.fixture
+def session(engine):
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def ingest(session, monkeypatch):
+    """
+    Ingérer un CSV (octets) avec IngestPipeline et retourner son résumé
+    Le profil est calculé par le test qui en a besoin (pas de thread en arrière-plan)
+    """
+    from app.services import ingest_pipeline
+
+    monkeypatch.setattr(ingest_pipeline.file_profiles, "schedule", lambda file_id: None)
+
+    def run(data: bytes, filename: str = "resultats.csv"):
+        return ingest_pipeline.IngestPipeline(session, io.BytesIO(data), "csv", filename).run()
+
+    return run
+
+
+CSV_HEADER = "numorden,sexo,edad,nombre,textores,nombre2,Date\n"
+
+
+@pytest.fixture
+def lab_csv():
+    """
+    Construire un CSV de résultats à partir de tuples
+    (numorden, sexo, edad, nombre, textores, nombre2, Date)
+    """
+    def build(rows, encoding: str = "utf-8") -> bytes:
+        lines = [",".join(f'"{value}"' if "," in value else value for value in row) for row in rows]
+        return (CSV_HEADER + "".join(line + "\n" for line in lines)).encode(encoding)
+
+    return build
@@ -0,0 +1,79 @@
+# backend/tests/test_columnar_validator.py
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from app.services.columnar_validator import ColumnarValidator
+from app.services.ingest_pipeline import REQUIRED_COLUMNS
+from app.services.parquet_cache import SOURCE_SCHEMA
+from app.services.validator import DataValidator
+
+
+def _frame(**overrides) -> pd.DataFrame:
+    data = {
+        'numorden': ['P1', 'P2', ' P3 ', 'P4', 'P5'],
+        'sexo': ['F', 'h', 'M', 'f', 'H'],
+        'edad': ['38', '0.0', ' 45 ', '', '7'],
+        'nombre': ['T4', 'SODIO', 'GLUCOSA ', 'T4', 'UREA'],
+        'textores': ['12,3', '7', '<0.5', None, 'NEGATIVO'],
+        'nombre2': ['PEDIATRIA', 'MEDICINA INTERNA', 'URGENCIAS', 'PEDIATRIA', None],
+        'Date': ['15/01/2024', '07/02/2024', '1/3/2024', '29/02/2024', '31/12/2023'],
+    }
+    data.update(overrides)
+    return pd.DataFrame(data, dtype=object)
+
+
+CASES = {
+    "valid": {},
+    "missing ages": {'edad': [None, 'nan', 'NULL', 'N/A', '12']},
+    "non numeric ages": {'edad': ['38', 'abc', '4x', '', '7']},
+    "negative age": {'edad': ['38', '-1', '45', '', '7']},
+    "invalid dates": {'Date': ['15/01/2024', '31/02/2024', '2024-01-15', '', '01/01/2024']},
+    "future date": {'Date': ['15/01/2024', '07/02/2024', '01/03/2024', '29/02/2024', '01/01/2200']},
+    "non standard sexo": {'sexo': ['F', 'X', None, 'm', '']},
+    "missing numorden": {'numorden': ['P1', None, 'P3', 'P4', 'P5']},
+    "missing nombre": {'nombre': ['T4', None, 'GLUCOSA', None, 'UREA']},
+}
+
+
+def _messages(items):
+    return sorted(item['message'] for item in items)
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_columnar_validator_matches_data_validator(case):
+    expected_validator = DataValidator(_frame(**CASES[case]), REQUIRED_COLUMNS)
+    actual_validator = ColumnarValidator(_frame(**CASES[case]), REQUIRED_COLUMNS)
+
+    expected = expected_validator.validate_all()
+    actual = actual_validator.validate_all()
+
+    assert actual['valid'] == expected['valid']
+    assert _messages(actual['errors']) == _messages(expected['errors'])
+    assert _messages(actual['warnings']) == _messages(expected['warnings'])
+
+    if expected['valid']:
+        expected_table = pa.Table.from_pandas(expected_validator.clean_data(), schema=SOURCE_SCHEMA,
+                                              preserve_index=False)
+        actual_table = actual_validator.clean_table().cast(SOURCE_SCHEMA)
+        assert actual_table.equals(expected_table)
+
+
+def test_columnar_validator_reports_missing_and_extra_columns():
+    frame = _frame().drop(columns=['Date']).assign(commentaire='x')
+    expected = DataValidator(frame.copy(), REQUIRED_COLUMNS).validate_all()
+    actual = ColumnarValidator(frame, REQUIRED_COLUMNS).validate_all()
+
+    assert not actual['valid']
+    assert _messages(actual['errors']) == _messages(expected['errors'])
+    assert _messages(actual['warnings']) == _messages(expected['warnings'])
+
+
+def test_columnar_validator_accepts_arrow_tables():
+    frame = _frame()
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    from_frame = ColumnarValidator(frame, REQUIRED_COLUMNS)
+    from_table = ColumnarValidator(table, REQUIRED_COLUMNS)
+
+    assert from_frame.validate_all() == from_table.validate_all()
+    assert from_frame.clean_table().equals(from_table.clean_table())
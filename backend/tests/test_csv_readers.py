@@ -0,0 +1,50 @@
+# backend/tests/test_csv_readers.py
+import io
+
+import pytest
+
+from app.services.csv_readers import iter_csv_chunks
+
+DATA = (
+    '﻿numorden,"nombre, complet",textores\n'
+    'P1,T4,"12,3"\n'
+    'P2,"SODIO\nSÉRIQUE",\n'
+    'P3,GLUCOSA,"ligne 1\nligne 2"\n'
+    'P4,UREA,7\n'
+)
+
+
+def _rows(reader: str, data: bytes, encoding: str, chunk_rows: int):
+    names = None
+    rows = []
+    for chunk in iter_csv_chunks(reader, io.BytesIO(data), encoding, chunk_rows):
+        if reader == "arrow":
+            names = chunk.column_names
+            rows.extend(tuple(row.values()) for row in chunk.to_pylist())
+        else:
+            names = list(chunk.columns)
+            rows.extend(tuple(None if value != value else value for value in row)
+                        for row in chunk.itertuples(index=False))
+    return names, rows
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 3, 100])
+def test_arrow_reader_matches_pandas_reader(chunk_rows):
+    data = DATA.encode("utf-8")
+    expected = _rows("pandas", data, "utf-8-sig", chunk_rows)
+    actual = _rows("arrow", data, "utf-8-sig", chunk_rows)
+
+    assert actual == expected
+    assert actual[0] == ["numorden", "nombre, complet", "textores"]
+    assert actual[1][1] == ("P2", "SODIO\nSÉRIQUE", None)
+
+
+def test_arrow_reader_reads_the_source_once(monkeypatch):
+    source = io.BytesIO(DATA.encode("cp1252", errors="ignore"))
+    seeks = []
+    original_seek = source.seek
+    monkeypatch.setattr(source, "seek", lambda *args: seeks.append(args) or original_seek(*args))
+
+    list(iter_csv_chunks("arrow", source, "cp1252", 100))
+
+    assert seeks == [(0,)]
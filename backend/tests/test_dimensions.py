@@ -0,0 +1,55 @@
+# backend/tests/test_dimensions.py
+import pyarrow as pa
+
+from app.db.base import get_duckdb_connection
+from app.services.dimensions import (
+    DIMENSIONS, _decoded_cache, _decoded_facts, _frame_from_decoded, encode_dimensions
+)
+
+
+ROWS = [
+    ("P2", "F", "38", "T4", "12,3", "PEDIATRIA", "15/01/2024"),
+    ("P10", "M", "", "SODIO", "140", "MEDICINA INTERNA", "07/02/2024"),
+    ("P1", "F", "38", "ÁCIDO ÚRICO", "<0,5", "", "15/01/2024"),
+    ("P3", "", "61", "T4", "", "URGENCIAS", "01/03/2024"),
+    ("P2", "F", "38", "SODIO", "138", "PEDIATRIA", "16/01/2024"),
+]
+
+
+def test_encode_keeps_one_id_per_label(engine, session):
+    first = encode_dimensions(engine, pa.table({
+        'numorden': ["PX1", "PX2", "PX1"], 'nombre': ["TX", "TX", "TY"], 'nombre2': ["SX", "SX", "SX"],
+    }))
+    second = encode_dimensions(engine, pa.table({
+        'numorden': ["PX2", "PX3"], 'nombre': ["TY", "TZ"], 'nombre2': ["SX", "SY"],
+    }))
+
+    assert first['patient_id'][0] == first['patient_id'][2]
+    assert second['patient_id'][0] == first['patient_id'][1]
+    assert second['test_id'][0] == first['test_id'][2]
+
+    connection = get_duckdb_connection(session)
+    for dimension in DIMENSIONS.values():
+        total, distinct = connection.execute(
+            f"SELECT count(*), count(DISTINCT {dimension.name_column}) FROM {dimension.table}"
+        ).fetchone()
+        assert total == distinct
+
+
+def test_decoded_cache_matches_decoded_facts(ingest, lab_csv, session):
+    file_id = ingest(lab_csv(ROWS))["file_id"]
+
+    from_facts = _decoded_facts(session, file_id)
+    from_cache = _decoded_cache(session, file_id)
+
+    assert from_cache.column_names == from_facts.column_names
+    columns = from_facts.column_names
+    for equals in (None, {"nombre2": "PEDIATRIA"}, {"nombre": "SODIO"}):
+        expected = _frame_from_decoded(from_facts, columns, equals)
+        actual = _frame_from_decoded(from_cache, columns, equals)
+        # Même contenu et mêmes catégories (ordre des lignes propre à chaque source)
+        for column in DIMENSIONS:
+            assert list(actual[column].cat.categories) == list(expected[column].cat.categories)
+        key = ['numorden', 'nombre', 'date']
+        assert (actual.astype(str).sort_values(key).reset_index(drop=True)
+                .equals(expected.astype(str).sort_values(key).reset_index(drop=True)))
@@ -0,0 +1,77 @@
+# backend/tests/test_encoding_sniffer.py
+import io
+
+import pytest
+
+from app.services.csv_readers import iter_csv_chunks
+from app.services.encoding_sniffer import detect_encoding, fallback_encoding, sniff_encoding
+
+HEADER = "numorden,nombre\n"
+
+
+def _late_non_ascii(name: str, encoding: str, ascii_rows: int = 5000) -> bytes:
+    # Échantillon entièrement ASCII, octet non ASCII en toute fin de fichier
+    rows = "".join(f"P{i},GLUCOSE\n" for i in range(ascii_rows))
+    return (HEADER + rows).encode("ascii") + f"P{ascii_rows},{name}\n".encode(encoding)
+
+
+def test_detect_encoding_boms_and_utf8():
+    assert detect_encoding(b"\xef\xbb\xbfa,b\n") == "utf-8-sig"
+    assert detect_encoding(b"\xff\xfea\x00") == "utf-16"
+    assert detect_encoding("CRÉATININE".encode("utf-8")) == "utf-8"
+    # Caractère multi-octets coupé en fin d'échantillon
+    assert detect_encoding("CRÉ".encode("utf-8")[:-1], truncated=True) == "utf-8"
+
+
+def test_detect_encoding_single_byte():
+    assert detect_encoding("CRÉATININE €".encode("cp1252")) == "cp1252"
+    assert detect_encoding(b"CR\xc9ATININE \x81") == "latin1"
+
+
+def test_sniff_encoding_keeps_position_and_only_sees_sample():
+    data = _late_non_ascii("CRÉATININE", "cp1252")
+    source = io.BytesIO(data)
+    assert sniff_encoding(source, sample_size=1024) == "utf-8"
+    assert source.tell() == 0
+
+
+@pytest.mark.parametrize("reader", ["arrow", "pandas"])
+def test_late_non_ascii_byte_is_not_replaced(reader):
+    data = _late_non_ascii("CRÉATININE", "cp1252")
+    with pytest.raises(UnicodeDecodeError) as error:
+        for _ in iter_csv_chunks(reader, io.BytesIO(data), "utf-8", 1000):
+            pass
+
+    encoding = fallback_encoding("utf-8", error.value)
+    assert encoding == "cp1252"
+    names = []
+    for chunk in iter_csv_chunks(reader, io.BytesIO(data), encoding, 1000):
+        names.extend(chunk["nombre"].to_pylist() if reader == "arrow" else chunk["nombre"].tolist())
+    assert names[-1] == "CRÉATININE"
+    assert not any("�" in name for name in names)
+
+
+def test_fallback_encoding():
+    error = UnicodeDecodeError("utf-8", b"CR\xc9 \x81", 2, 3, "invalid")
+    assert fallback_encoding("utf-8", error) == "latin1"
+    assert fallback_encoding("cp1252", error) == "latin1"
+    assert fallback_encoding("latin1", error) is None
+    assert fallback_encoding("utf-16", error) is None
+
+
+def test_ingest_rereads_file_with_fallback_encoding(ingest, monkeypatch):
+    from app.core.config import settings
+    from app.services.file_metadata import FileMetadataService
+
+    monkeypatch.setattr(settings, "ENCODING_SNIFF_BYTES", 1024)
+    header = "numorden,sexo,edad,nombre,textores,nombre2,Date\n"
+    rows = "".join(f'P{i},H,30,GLUCOSE,"1,0",MEDICINA,0{1 + i % 9}/01/2024\n' for i in range(500))
+    data = (header + rows).encode("ascii") + "P500,F,40,CRÉATININE,2,MEDICINA,05/01/2024\n".encode("cp1252")
+
+    result = ingest(data)
+
+    assert result["encoding"] == "cp1252"
+    assert result["row_count"] == 501
+    assert "relu en cp1252" in result["warnings"][0]["message"]
+    names = FileMetadataService(result["file_id"]).preview(limit=1000).column("nombre").to_pylist()
+    assert "CRÉATININE" in names
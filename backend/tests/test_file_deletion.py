@@ -0,0 +1,42 @@
+# backend/tests/test_file_deletion.py
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.panels import get_patient_panels
+from app.api.repeats import get_patient_repeats, get_test_repeat_history
+from app.db.models import File
+from app.services.file_deletion import file_deletions
+from app.services.frame_loader import load_frame
+
+ROWS = [
+    ("P1", "F", "40", "SODIO", "140", "URGENCIAS", "01/02/2024"),
+    ("P1", "F", "40", "SODIO", "138", "URGENCIAS", "03/02/2024"),
+    ("P2", "M", "61", "UREA", "35", "PEDIATRIA", "01/02/2024"),
+]
+
+
+def test_tombstoned_file_is_excluded_before_purge(session, ingest, lab_csv, monkeypatch):
+    file_id = ingest(lab_csv(ROWS))["file_id"]
+    # Tables du fichier chargées (caches mémoire et Arrow IPC remplis)
+    assert len(load_frame(session, file_id, ['numorden', 'nombre'])) == 3
+    assert asyncio.run(get_patient_repeats(file_id, "P1", session=session))["success"]
+
+    # Purge jamais exécutée: seule la suppression logique exclut le fichier
+    monkeypatch.setattr(file_deletions, "schedule", lambda file_id: None)
+    file_deletions.tombstone(session, session.get(File, file_id))
+
+    frame = load_frame(session, file_id, ['numorden', 'nombre'])
+    assert len(frame) == 0
+    assert list(frame.columns) == ['numorden', 'nombre']
+
+    routes = [
+        lambda: get_patient_panels(file_id, "P1", session=session),
+        lambda: get_test_repeat_history(file_id, "SODIO", session=session),
+        lambda: get_patient_repeats(file_id, "P1", session=session),
+    ]
+    for route in routes:
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(route())
+        assert error.value.status_code == 404
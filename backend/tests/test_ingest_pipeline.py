@@ -0,0 +1,83 @@
+# backend/tests/test_ingest_pipeline.py
+import pytest
+
+from app.core.config import settings
+from app.db.base import get_duckdb_connection
+from app.services import ingest_pipeline
+from app.services.file_metadata import FileMetadataService
+from app.services.ingest_pipeline import IngestError
+
+
+ROWS = [
+    ("P1", "F", "38", "T4", "12,3", "PEDIATRIA", "15/01/2024"),
+    ("P2", "M", "52", "SODIO", "140", "MEDICINA INTERNA", "07/02/2024"),
+    ("P1", "F", "38", "T4", "12,5", "PEDIATRIA", "15/01/2024"),  # doublon de la 1re ligne
+    ("P3", "F", "", "GLUCOSA", "0,9", "URGENCIAS", "01/03/2024"),
+    ("P2", "M", "52", "SODIO", "141", "MEDICINA INTERNA", "08/02/2024"),
+    ("P2", "M", "52", "SODIO", "139", "MEDICINA INTERNA", "07/02/2024"),  # doublon de la 2e ligne
+]
+
+
+@pytest.mark.parametrize("chunk_rows", [2, 100])
+def test_duplicates_are_dropped_across_batches_in_file_order(ingest, lab_csv, session, monkeypatch, chunk_rows):
+    monkeypatch.setattr(settings, "INGEST_CHUNK_ROWS", chunk_rows)
+    result = ingest(lab_csv(ROWS))
+
+    assert result["row_count"] == 4
+    assert "2 doublons détectés et supprimés" in [warning["message"] for warning in result["warnings"]]
+    assert result["preview_df"]["textores"].tolist() == ["12,3", "140", "0,9", "141"]
+
+    cached = FileMetadataService(result["file_id"]).preview(limit=10)
+    assert sorted(cached.column("textores").to_pylist()) == ["0,9", "12,3", "140", "141"]
+
+    connection = get_duckdb_connection(session)
+    facts = connection.execute(
+        "SELECT count(*), max(row_number) FROM fact_results WHERE file_id = ?", [result["file_id"]]
+    ).fetchone()
+    assert facts == (4, 3)
+
+
+def _staging_files():
+    return list(settings.PARQUET_CACHE_DIR.glob("*.staging")) + list(settings.PARQUET_CACHE_DIR.glob("*.tmp"))
+
+
+@pytest.mark.parametrize("reader", ["arrow", "pandas"])
+def test_unreadable_file_is_a_read_error(ingest, monkeypatch, reader):
+    monkeypatch.setattr(settings, "INGEST_READER", reader)
+    data = (b"numorden,sexo,edad,nombre,textores,nombre2,Date\nP1,F,38,T4,1,PEDIATRIA,15/01/2024\n"
+            b"P2,F,38,T4,1,PEDIATRIA,15/01/2024,extra,extra\n")
+
+    with pytest.raises(IngestError) as error:
+        ingest(data)
+
+    assert error.value.message == "Erreur de lecture du fichier"
+    assert error.value.status_code == 400
+
+
+def test_parquet_writer_failure_is_a_cache_error(ingest, lab_csv, monkeypatch):
+    def failing_writer(*args, **kwargs):
+        raise OSError("disque plein")
+
+    monkeypatch.setattr(ingest_pipeline.pq, "ParquetWriter", failing_writer)
+
+    with pytest.raises(IngestError) as error:
+        ingest(lab_csv(ROWS))
+
+    assert error.value.message == "Erreur d'écriture du cache Parquet"
+    assert error.value.status_code == 500
+    assert error.value.errors == [{"message": "disque plein"}]
+    assert _staging_files() == []
+
+
+def test_publish_failure_is_a_cache_error(ingest, lab_csv, monkeypatch):
+    def failing_publish(self, row_count):
+        raise OSError("disque plein")
+
+    monkeypatch.setattr(ingest_pipeline.ParquetCacheWriter, "publish", failing_publish)
+
+    with pytest.raises(IngestError) as error:
+        ingest(lab_csv(ROWS))
+
+    assert error.value.message == "Erreur d'écriture du cache Parquet"
+    assert error.value.status_code == 500
+    assert _staging_files() == []
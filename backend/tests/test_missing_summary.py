@@ -0,0 +1,58 @@
+# backend/tests/test_missing_summary.py
+import asyncio
+
+import pytest
+
+from app.api.stats import StatsRequest, compute_summary_stats, get_missing_summary
+from app.core.config import settings
+from app.services.file_metadata import FileMetadataService
+from app.services.stats_engine import MISSING_COLUMNS
+
+from test_stats_engine import lab_rows
+
+# Colonnes du CSV (lab_csv) dans l'ordre de MISSING_COLUMNS
+CSV_INDEXES = {'numorden': 0, 'sexo': 1, 'edad': 2, 'nombre': 3, 'textores': 4, 'nombre2': 5, 'date': 6}
+
+
+def expected_missing(rows):
+    # Lignes publiées: première occurrence de chaque clé (numorden, nombre, Date)
+    published = {}
+    for row in rows:
+        published.setdefault((row[0], row[3], row[6]), row)
+    return {
+        col: sum(1 for row in published.values() if row[index] == "")
+        for col, index in CSV_INDEXES.items()
+    }
+
+
+def missing_endpoint(session, file_id):
+    response = asyncio.run(get_missing_summary(file_id, session=session))
+    return {entry["column"]: entry["missing_count"] for entry in response["missing_summary"]}
+
+
+def summary_endpoint(session, file_id):
+    response = asyncio.run(compute_summary_stats(StatsRequest(file_id=file_id), session=session))
+    return {entry["column"]: entry["missing_count"] for entry in response["summary"]["missing_summary"]}
+
+
+@pytest.mark.parametrize("partition_by", ["", "nombre2"])
+def test_missing_endpoints_report_upload_nulls(session, ingest, lab_csv, monkeypatch, partition_by):
+    monkeypatch.setattr(settings, "PARQUET_PARTITION_BY", partition_by)
+    rows = lab_rows(400, seed=3)
+    file_id = ingest(lab_csv(rows))["file_id"]
+    expected = expected_missing(rows)
+    assert expected["sexo"] > 0 and expected["nombre2"] > 0
+
+    assert missing_endpoint(session, file_id) == expected
+    # Le résumé ne liste que les colonnes avec des valeurs manquantes
+    assert summary_endpoint(session, file_id) == {col: count for col, count in expected.items() if count > 0}
+
+
+def test_missing_counts_scan_cache_without_footer_statistics(session, ingest, lab_csv, monkeypatch):
+    rows = lab_rows(400, seed=4)
+    file_id = ingest(lab_csv(rows))["file_id"]
+    footer = FileMetadataService(file_id).upload_missing_counts(MISSING_COLUMNS)
+
+    monkeypatch.setattr(FileMetadataService, "missing_counts", lambda self, columns: None)
+    assert FileMetadataService(file_id).upload_missing_counts(MISSING_COLUMNS) == footer
+    assert missing_endpoint(session, file_id) == expected_missing(rows)
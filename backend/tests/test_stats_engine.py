@@ -0,0 +1,117 @@
+# backend/tests/test_stats_engine.py
+import math
+import random
+
+import pytest
+
+from app.api.stats import _compute_column_stats
+from app.services.frame_loader import RESULT_COLUMNS, load_frame
+from app.services.stats_engine import SUMMARY_COLUMNS, SqlStatsEngine, StatsEngine
+
+SERVICES = ["PEDIATRIA", "MEDICINA INTERNA", "URGENCIAS", "CARDIOLOGIA", ""]
+TESTS = ["T4", "SODIO", "GLUCOSA", "UREA", "HEMOGRAMA", "PCR"]
+TEXTORES = ["12,3", "7", "<0,5", ">= 1000", "NEGATIVO", "POSITIVO", "", "140", "0,9"]
+
+
+def lab_rows(count: int, seed: int = 7):
+    """
+    Lignes de résultats déterministes avec valeurs manquantes et textores mixtes
+    """
+    rng = random.Random(seed)
+    rows = []
+    for index in range(count):
+        rows.append((
+            f"P{rng.randint(1, count // 3)}",
+            rng.choice(["F", "M", "H", ""]),
+            rng.choice([str(rng.randint(0, 95))] * 9 + [""]),
+            rng.choice(TESTS),
+            rng.choice(TEXTORES),
+            rng.choice(SERVICES),
+            f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2024",
+        ))
+    return rows
+
+
+@pytest.fixture
+def file_id(ingest, lab_csv):
+    return ingest(lab_csv(lab_rows(600)))["file_id"]
+
+
+# Distributions tronquées: à effectif égal, SqlStatsEngine trie par valeur,
+# pandas garde l'ordre des lignes; seules les valeurs au-dessus du dernier
+# effectif retenu sont forcément les mêmes
+DISTRIBUTION_KEYS = ("distribution", "top_text_values")
+
+
+def _distribution(values):
+    frequencies = {str(value): freq for value, freq in values.items()}
+    cutoff = min(frequencies.values(), default=0)
+    return sorted(frequencies.values()), {value for value, freq in frequencies.items() if freq > cutoff}
+
+
+def assert_close(actual, expected, path="", skip=()):
+    if path in skip:
+        return
+    if path.endswith(DISTRIBUTION_KEYS):
+        assert _distribution(actual) == _distribution(expected), path
+        return
+    if path.endswith((".top_value", ".top")):
+        # Ex aequo en tête: n'importe laquelle des valeurs les plus fréquentes
+        return
+    if isinstance(expected, dict):
+        assert isinstance(actual, dict), path
+        assert set(map(str, actual)) == set(map(str, expected)), path
+        actual = {str(key): value for key, value in actual.items()}
+        expected = {str(key): value for key, value in expected.items()}
+        for key in expected:
+            assert_close(actual[key], expected[key], f"{path}.{key}", skip)
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected), path
+        for index, (left, right) in enumerate(zip(actual, expected)):
+            assert_close(left, right, f"{path}[{index}]", skip)
+    elif isinstance(expected, float) and not isinstance(actual, str):
+        if math.isnan(expected):
+            assert actual is None or math.isnan(actual), path
+        else:
+            assert actual == pytest.approx(expected, rel=1e-9, abs=1e-9), path
+    else:
+        assert actual == expected, path
+
+
+def test_sql_summary_matches_pandas_summary(session, file_id):
+    expected = StatsEngine(load_frame(session, file_id, SUMMARY_COLUMNS)).compute_full_summary()
+    actual = SqlStatsEngine(session, file_id, SUMMARY_COLUMNS).compute_full_summary()
+
+    # Taille mémoire: format Arrow d'un côté, objets pandas de l'autre
+    assert_close(actual, expected, skip={".overview.memory_usage_mb"})
+
+
+@pytest.mark.parametrize("column", [col for col in RESULT_COLUMNS if col not in ('id', 'file_id', 'created_at')])
+def test_sql_column_stats_match_pandas_column_stats(session, file_id, column):
+    expected = _compute_column_stats(load_frame(session, file_id, [column])[column])
+    actual = SqlStatsEngine(session, file_id, RESULT_COLUMNS).compute_column_stats([column])[column]
+
+    assert_close(actual, expected)
+
+
+def test_approximate_summary_counts_high_cardinality_columns_on_all_rows(session, ingest, lab_csv, monkeypatch):
+    from app.core.config import settings
+
+    file_id = ingest(lab_csv(lab_rows(6000)))["file_id"]
+    monkeypatch.setattr(settings, "STATS_SAMPLE_SIZE", 500)
+    monkeypatch.setattr(settings, "STATS_EXACT_CARDINALITY", 100)
+
+    exact = SqlStatsEngine(session, file_id, SUMMARY_COLUMNS).compute_full_summary()
+    engine = SqlStatsEngine(session, file_id, SUMMARY_COLUMNS, accuracy="approximate")
+    fields = engine.approximate_fields()
+    approximate = engine.compute_full_summary()
+
+    # numorden (≈ 2000 patients): cardinalité HyperLogLog sur toutes les lignes
+    assert "unique" in fields["numorden"]
+    expected_unique = exact["categorical_stats"]["numorden"]["unique"]
+    assert approximate["categorical_stats"]["numorden"]["unique"] == pytest.approx(expected_unique, rel=0.05)
+
+    # Colonnes de faible cardinalité: distributions exactes, non signalées comme estimées
+    for column in ("sexo", "nombre", "nombre2"):
+        assert column not in fields
+        assert approximate["categorical_stats"][column] == exact["categorical_stats"][column]
@@ -0,0 +1,89 @@
+# backend/tests/test_stats_sketches.py
+import random
+
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.services.stats_engine import SUMMARY_COLUMNS, SqlStatsEngine
+from app.services.stats_sketches import SketchStatsEngine, merge_sketches
+
+from test_stats_engine import lab_rows
+
+
+@pytest.fixture
+def sketches(session, ingest, lab_csv, monkeypatch):
+    # Peu de valeurs conservées: les distributions des esquisses sont incomplètes
+    monkeypatch.setattr(settings, "SKETCH_TOP_K", 20)
+    first = lab_rows(900, seed=1)
+    # Doublons (numorden, nombre, Date) entre les deux fichiers: exclus de la concaténation
+    keys = {(row[0], row[3], row[6]) for row in first}
+    second = [row for row in lab_rows(900, seed=2) if (row[0], row[3], row[6]) not in keys]
+    file_ids = [ingest(lab_csv(rows))["file_id"] for rows in (first, second, first + second)]
+    return [SqlStatsEngine(session, file_id, SUMMARY_COLUMNS).compute_sketches() for file_id in file_ids]
+
+
+def test_merged_sketches_match_concatenated_file(sketches):
+    first, second, concatenated = sketches
+    merged = merge_sketches([first["all"], second["all"]])
+    expected = concatenated["all"]
+
+    assert merged["total_rows"] == expected["total_rows"]
+    assert merged["present"] == expected["present"]
+    for col, stats in expected["categorical"].items():
+        if stats["other"] == 0:
+            assert merged["categorical"][col]["unique"] == stats["unique"], col
+        else:
+            # Patients et dates communs aux deux fichiers: comptés une fois
+            assert merged["categorical"][col]["unique"] == pytest.approx(stats["unique"], rel=0.05), col
+            assert merged["categorical"][col]["unique"] < sum(
+                sketch["all"]["categorical"][col]["unique"] for sketch in (first, second)
+            ), col
+
+    summary = SketchStatsEngine(merged).compute_full_summary()
+    expected_summary = SketchStatsEngine(expected).compute_full_summary()
+    assert summary["overview"] == expected_summary["overview"]
+    assert summary["numeric_stats"]["edad"]["mean"] == pytest.approx(expected_summary["numeric_stats"]["edad"]["mean"])
+
+
+def test_merged_service_sketches_match_concatenated_file(sketches):
+    first, second, concatenated = sketches
+    for service, expected in concatenated["services"].items():
+        merged = merge_sketches([first["services"][service], second["services"][service]])
+        assert merged["total_rows"] == expected["total_rows"], service
+        assert merged["categorical"]["numorden"]["unique"] == pytest.approx(
+            expected["categorical"]["numorden"]["unique"], rel=0.05
+        ), service
+
+
+def test_merge_rejects_different_register_precisions(sketches):
+    first, second, _ = sketches
+    other = dict(second["all"], hll_precision=first["all"]["hll_precision"] + 1)
+    with pytest.raises(ValueError):
+        merge_sketches([first["all"], other])
+
+
+def offset_rows(count, offset, seed):
+    rng = random.Random(seed)
+    return [
+        (f"P{index}", "F", str(offset + int(rng.gauss(0, 1400))), "SODIO", "140", "URGENCIAS", "01/02/2024")
+        for index in range(count)
+    ]
+
+
+@pytest.mark.parametrize("offset", [20_000_000, 100_000_000])
+def test_sketch_moments_stable_with_large_offset(session, ingest, lab_csv, offset):
+    # |moyenne| >> écart-type: les sommes de puissances brutes se compensent
+    first, second = offset_rows(3000, offset, seed=1), offset_rows(2000, offset + 500, seed=2)
+    sketches = []
+    for rows in (first, second):
+        file_id = ingest(lab_csv(rows))["file_id"]
+        sketches.append(SqlStatsEngine(session, file_id, SUMMARY_COLUMNS).compute_sketches()["all"])
+
+    for sketch, rows in [(sketches[0], first), (merge_sketches(sketches), first + second)]:
+        edad = pd.Series([int(row[2]) for row in rows])
+        stats = SketchStatsEngine(sketch).compute_full_summary(["edad"])["numeric_stats"]["edad"]
+        assert stats["mean"] == pytest.approx(edad.mean(), rel=1e-12)
+        assert stats["std"] == pytest.approx(edad.std(), rel=1e-6)
+        assert stats["skew"] == pytest.approx(edad.skew(), abs=1e-6)
+        assert stats["kurtosis"] == pytest.approx(edad.kurt(), abs=1e-6)
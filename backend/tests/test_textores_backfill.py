@@ -0,0 +1,42 @@
+# backend/tests/test_textores_backfill.py
+import pyarrow.parquet as pq
+
+from app.db.base import get_duckdb_connection, migration_applied
+from app.services import parquet_cache
+from app.services.parquet_cache import SOURCE_SCHEMA, cache_columns, cache_path
+from app.services.textores_parser import TEXTORES_MIGRATION, backfill_textores_columns
+
+
+ROWS = [
+    ("P1", "F", "38", "T4", "12,3", "PEDIATRIA", "15/01/2024"),
+    ("P2", "M", "52", "SODIO", "<5", "MEDICINA INTERNA", "07/02/2024"),
+]
+
+
+def _forget_migration(session):
+    get_duckdb_connection(session).execute("DELETE FROM schema_migrations WHERE name = ?", [TEXTORES_MIGRATION])
+    session.commit()
+
+
+def test_backfill_upgrades_old_caches_once(engine, session, ingest, lab_csv, monkeypatch):
+    file_id = ingest(lab_csv(ROWS))["file_id"]
+    # Cache écrit avant l'ajout des colonnes dérivées
+    path = cache_path(file_id)
+    pq.write_table(pq.read_table(path, columns=SOURCE_SCHEMA.names), path)
+    _forget_migration(session)
+
+    backfill_textores_columns(engine)
+
+    assert 'textores_kind' in cache_columns(file_id)
+    assert migration_applied(TEXTORES_MIGRATION)
+    version = get_duckdb_connection(session).execute(
+        "SELECT data_version FROM files WHERE file_id = ?", [file_id]
+    ).fetchone()[0]
+    assert version == 2
+
+    # Migration enregistrée: aucun cache n'est relu aux démarrages suivants
+    def unexpected_scan(file_id):
+        raise AssertionError("cache relu")
+
+    monkeypatch.setattr(parquet_cache, "cache_columns", unexpected_scan)
+    backfill_textores_columns(engine)
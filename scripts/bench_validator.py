@@ -0,0 +1,68 @@
+"""
+Benchmark: DataValidator (pandas) vs ColumnarValidator (Arrow compute)
+
+Usage: python scripts/bench_validator.py [nombre_de_lignes]
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+from app.services.validator import DataValidator
+from app.services.columnar_validator import ColumnarValidator
+from app.services.ingest_pipeline import REQUIRED_COLUMNS
+
+N_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+
+def make_frame(n: int) -> pd.DataFrame:
+    """Générer n lignes brutes (toutes les colonnes en texte, comme read_csv(dtype=str))"""
+    rng = np.random.default_rng(42)
+    days = rng.integers(1, 29, n)
+    months = rng.integers(1, 13, n)
+    years = rng.integers(2018, 2025, n)
+    return pd.DataFrame({
+        "numorden": pd.Series(rng.integers(1, n // 5 + 2, n)).map("P{}".format),
+        "sexo": rng.choice(["M", "F", "h", "f", "X"], n),
+        "edad": rng.integers(0, 100, n).astype(str),
+        "nombre": rng.choice(["GLUCOSA", "CREATININA", "HEMOGLOBINA", "UREA"], n),
+        "textores": rng.normal(5, 2, n).round(1).astype(str),
+        "nombre2": rng.choice(["URGENCIAS", "PEDIATRIA", "CONSULTA"], n),
+        "Date": [f"{d:02d}/{m:02d}/{y}" for d, m, y in zip(days, months, years)],
+    })
+
+
+def bench(label: str, validator_cls, df: pd.DataFrame):
+    # DataValidator convertit les colonnes en place: chaque validateur reçoit sa copie
+    df = df.copy()
+    start = time.perf_counter()
+    validator = validator_cls(df, REQUIRED_COLUMNS)
+    result = validator.validate_all()
+    validated = time.perf_counter()
+    if isinstance(validator, ColumnarValidator):
+        rows = validator.clean_table().num_rows
+    else:
+        rows = len(validator.clean_data())
+    done = time.perf_counter()
+    print(f"{label:<18} validation {validated - start:6.2f}s | nettoyage {done - validated:6.2f}s "
+          f"| total {done - start:6.2f}s | {rows} lignes")
+    return result
+
+
+if __name__ == "__main__":
+    print(f"📊 Génération de {N_ROWS} lignes...")
+    df = make_frame(N_ROWS)
+
+    pandas_result = bench("DataValidator", DataValidator, df)
+    arrow_result = bench("ColumnarValidator", ColumnarValidator, df)
+
+    same = (pandas_result['valid'] == arrow_result['valid']
+            and pandas_result['errors'] == arrow_result['errors']
+            and pandas_result['warnings'] == arrow_result['warnings'])
+    print("✅ Résultats identiques" if same else "⚠️ Résultats différents")
+    if not same:
+        print("pandas:", pandas_result)
+        print("arrow: ", arrow_result)